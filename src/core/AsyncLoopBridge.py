@@ -0,0 +1,150 @@
+"""
+asyncio事件循环桥接模块，让Qt界面可以驱动协程任务。
+
+此模块在一个独立的后台线程中运行单一的asyncio事件循环，界面线程提交协程后立即返回，
+协程完成时通过与 AsyncTaskExecutor 相同签名的Qt信号通知主线程。
+所有协程共享这一个线程，等待网络响应或 asyncio.sleep 期间不会占用线程池中的工作线程。
+
+依赖项:
+- asyncio, threading: 后台事件循环
+- PySide6.QtCore: 提供Qt信号槽机制
+- src.utils.logger: 提供日志记录功能
+
+使用示例:
+```python
+from src.core.AsyncLoopBridge import AsyncLoopBridge
+from src.core.AsyncNetworkManager import asyncnetworkmanager
+
+bridge = AsyncLoopBridge()
+# 与 AsyncTaskExecutor.finished 的签名一致，可直接复用同一个槽函数
+bridge.finished.connect(window.handle_general_finished)
+
+# 提交协程，完成后触发 finished(success, result, "keep_alive_check", {})
+bridge.submit(asyncnetworkmanager.check_network(), "keep_alive_check")
+
+# 程序退出前关闭事件循环
+bridge.shutdown()
+```
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Coroutine
+
+from PySide6.QtCore import QObject, Signal
+
+from src.utils.logger import logger
+
+
+class AsyncLoopBridge(QObject):
+    """
+    Qt与asyncio之间的桥接器。
+
+    信号:
+        finished: 协程完成信号，参数为(success: bool, message: object, op_type: str, extra_data: dict)，
+                 与 AsyncTaskExecutor.finished 保持一致
+
+    属性:
+        loop: 后台线程中运行的asyncio事件循环
+        active_tasks: 活跃任务字典，键为任务ID，值为 concurrent.futures.Future 对象；
+                      界面线程提交、事件循环线程完成时都会修改，访问时需持有 _lock
+        task_counter: 任务计数器，用于生成唯一任务ID
+    """
+    finished = Signal(bool, object, str, dict)
+
+    def __init__(self):
+        """
+        初始化桥接器，创建事件循环并在名为 "AsyncLoop" 的守护线程中运行。
+        """
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        self.active_tasks = {}
+        self.task_counter = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run_loop, name="AsyncLoop", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        """在后台线程中运行事件循环，直到 shutdown 被调用。"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine, op_type: str = "unknown", extra_data: dict = None) -> str:
+        """
+        提交协程到后台事件循环执行。
+
+        参数:
+            coro: 要执行的协程对象
+            op_type: 操作类型标识（如"keep_alive_check"、"login"等）
+            extra_data: 额外数据，会传递到完成信号
+
+        返回:
+            str: 任务ID，可用于后续取消任务
+        """
+        extra_data = extra_data or {}
+        with self._lock:
+            task_id = f"{op_type}_{self.task_counter}"
+            self.task_counter += 1
+            # 登记之后才添加完成回调，协程即使已经完成也能从 active_tasks 中正确移除
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            self.active_tasks[task_id] = future
+        future.add_done_callback(
+            lambda f, tid=task_id, op=op_type, ed=extra_data: self._handle_future_result(f, tid, op, ed))
+        return task_id
+
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        取消指定ID的协程任务。与线程池不同，正在等待网络或休眠的协程也可以被取消。
+
+        参数:
+            task_id: 要取消的任务ID
+
+        返回:
+            bool: 取消请求是否已发出
+        """
+        with self._lock:
+            future = self.active_tasks.get(task_id)
+        if future is None:
+            return False
+        return future.cancel()
+
+    def _handle_future_result(self, future: Future, task_id: str, op_type: str, extra_data: dict) -> None:
+        """
+        协程完成回调（在事件循环线程中执行），通过Qt信号把结果排队送回主线程。
+
+        参数:
+            future: 协程对应的Future对象
+            task_id: 任务ID
+            op_type: 操作类型标识
+            extra_data: 额外数据
+        """
+        with self._lock:
+            self.active_tasks.pop(task_id, None)
+        if future.cancelled():
+            logger.info(f"[协程 {task_id}] 已取消")
+            return
+        exception = future.exception()
+        if exception is None:
+            self.finished.emit(True, future.result(), op_type, extra_data)
+        elif isinstance(exception, ConnectionError):
+            logger.error(f"[协程执行] 连接错误: {task_id}, 错误: {str(exception)}")
+            self.finished.emit(False, f"网络连接错误: {str(exception)}", op_type, extra_data)
+        elif isinstance(exception, TimeoutError):
+            logger.error(f"[协程执行] 超时: {task_id}, 错误: {str(exception)}")
+            self.finished.emit(False, f"操作超时: {str(exception)}", op_type, extra_data)
+        else:
+            logger.error(f"[协程执行] 失败: {task_id}, 错误: {str(exception)}")
+            self.finished.emit(False, f"任务执行失败: {str(exception)}", op_type, extra_data)
+
+    def shutdown(self) -> None:
+        """
+        取消所有未完成的协程并停止事件循环。
+        """
+        with self._lock:
+            futures = list(self.active_tasks.values())
+        for future in futures:
+            future.cancel()
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+        logger.info("asyncio事件循环桥接器已关闭")
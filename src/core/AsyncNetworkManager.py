@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+基于asyncio的校园网网络管理模块
+
+此模块提供与 NetworkManager 相同接口（check_network、get_auth_urls、login、dislogin、keep_alive）的协程版本，
+供 asyncio 代码与 Qt 界面（通过 src.core.AsyncLoopBridge）非阻塞地调用。
+每个协程都把调用交给共享的 NetworkManager 单例在专用线程中执行，因此与同步接口共用同一套流程：
+- 连接池化会话与认证参数缓存
+- 退避与熔断策略（BackoffPolicy）
+- 连通性状态机（包括"登录中"状态）与状态迁移通知
+- 检测/登录订阅者（连通性历史记录、运行指标）与登录调用链
+同步接口的任何修改都会自动作用于协程版本，两者不会出现行为差异。
+
+依赖项：
+- asyncio, concurrent.futures: 在专用线程池中执行阻塞调用并以协程等待结果
+- src.core.NetworkManager: 共享的网络管理器单例
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+import asyncio
+from src.core.AsyncNetworkManager import asyncnetworkmanager
+
+async def main():
+    is_connected = await asyncnetworkmanager.check_network()
+    if not is_connected:
+        await asyncnetworkmanager.login()
+
+asyncio.run(main())
+```
+
+注意事项：
+- 协程被取消时，已经开始的登录/登出请求仍会在线程中执行完毕（结果照常记录到状态机和订阅者），
+  只是调用方不再等待结果
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.logger import logger
+from src.core.NetworkManager import networkmanager
+
+
+class AsyncNetworkManager:
+    """
+    NetworkManager 的协程接口。
+
+    属性:
+        manager (NetworkManager): 实际执行请求的网络管理器
+        MAX_WORKERS (int): 执行阻塞调用的线程数（登录、登出与检测可同时进行）
+    """
+    MAX_WORKERS = 4
+
+    def __init__(self, manager=None):
+        """
+        参数:
+            manager (NetworkManager, optional): 网络管理器，默认为全局单例
+        """
+        self.manager = manager or networkmanager
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="AsyncNetwork")
+
+    async def _call(self, func, *args, **kwargs):
+        """在专用线程池中执行 func 并等待结果"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def check_network(self, hedged=False):
+        """
+        检查网络连接状态，参数与返回值同 NetworkManager.check_network。
+
+        返回:
+            bool: 网络连接成功且不在认证页返回 True
+        """
+        return await self._call(self.manager.check_network, hedged=hedged)
+
+    async def get_auth_urls(self, use_cache=True):
+        """
+        获取认证相关的 URL（优先使用认证参数缓存），参数与返回值同 NetworkManager.get_auth_urls。
+
+        返回:
+            dict or None: 认证 URL 字典，获取失败时返回 None
+        """
+        return await self._call(self.manager.get_auth_urls, use_cache=use_cache)
+
+    async def login(self, username=None, password=None, preprobe=True):
+        """
+        登录校园网，参数与返回值同 NetworkManager.login。
+
+        返回:
+            bool: 登录成功返回 True
+        """
+        return await self._call(self.manager.login, username, password, preprobe=preprobe)
+
+    async def dislogin(self, username=None, auth_urls=None, verify=True):
+        """
+        登出校园网，参数与返回值同 NetworkManager.dislogin。
+
+        返回:
+            bool: 登出成功返回 True
+        """
+        return await self._call(self.manager.dislogin, username, auth_urls=auth_urls, verify=verify)
+
+    async def keep_alive(self, username=None, password=None, relogin=True):
+        """
+        执行一次保活流水线，参数与返回值同 NetworkManager.keep_alive。
+
+        返回:
+            dict: 保活状态字典
+        """
+        return await self._call(self.manager.keep_alive, username=username, password=password, relogin=relogin)
+
+    def shutdown(self):
+        """关闭线程池，不等待仍在进行的调用"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.debug("异步网络管理器已关闭")
+
+
+# 创建AsyncNetworkManager的全局单例实例
+# 使用方式：from src.core.AsyncNetworkManager import asyncnetworkmanager
+asyncnetworkmanager = AsyncNetworkManager()
@@ -8,6 +8,7 @@
 - concurrent.futures: 提供线程池和异步任务支持
 - PySide6.QtCore: 提供Qt信号槽机制
 - src.utils.logger: 提供日志记录功能
+- src.core.Metrics: 队列长度、任务等待与执行耗时等运行指标
 
 使用示例:
 ```python
@@ -33,6 +34,10 @@ def login_task(username, password):
 # 提交任务并获取任务ID
 task_id = executor.execute_task(lambda: login_task("user123", "pass456"), "login")
 
+# 单飞任务：同类型任务仍在执行时，新提交会合并到正在执行的任务上
+task_id = executor.execute_task(check_network, "keep_alive_check", single_flight=True)
+print(executor.coalesced_counts)  # {'keep_alive_check': 被合并的提交次数}
+
 # （可选）取消任务
 if need_to_cancel:
     executor.cancel_task(task_id)
@@ -42,12 +47,24 @@ if need_to_cancel_all:
     executor.cancel_all_tasks()
 ```
 """
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, Future
 from src.utils.logger import logger
+from src.core.Metrics import metrics
 from typing import Callable, Dict
 from PySide6.QtCore import QObject, Signal
 
 
+QUEUE_DEPTH = metrics.gauge('campus_executor_queue_depth', '已提交但尚未开始执行的异步任务数')
+RUNNING_TASKS = metrics.gauge('campus_executor_running_tasks', '正在执行的异步任务数')
+TASK_WAIT = metrics.histogram('campus_executor_task_wait_seconds', '异步任务在队列中等待的时间(秒)', ['op_type'])
+TASK_DURATION = metrics.histogram('campus_executor_task_seconds', '异步任务的执行耗时(秒)', ['op_type'],
+                                  buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+TASKS = metrics.counter('campus_executor_tasks_total', '执行完成的异步任务数', ['op_type', 'result'])
+COALESCED = metrics.counter('campus_executor_coalesced_total', '被合并到正在执行任务上的单飞提交次数', ['op_type'])
+
+
 class AsyncTaskExecutor(QObject):
     """
     异步任务执行器类，提供健壮的异步任务执行框架。
@@ -70,6 +87,8 @@ class AsyncTaskExecutor(QObject):
         thread_pool: 线程池对象
         active_tasks: 活跃任务字典，键为任务ID，值为Future对象
         task_counter: 任务计数器，用于生成唯一任务ID
+        inflight_tasks: 单飞任务字典，键为操作类型，值为正在执行的任务ID
+        coalesced_counts: 各操作类型被合并（未实际提交）的次数
     """
     # 任务完成信号：参数(success, message, operation_type, extra_data)
     finished = Signal(bool, object, str, dict)  # 正确实例化信号
@@ -87,8 +106,15 @@ class AsyncTaskExecutor(QObject):
         self.active_tasks: Dict[str, Future] = {}
         # 记录任务ID，用于区分不同任务
         self.task_counter = 0
+        # 单飞任务追踪：同一操作类型同时只有一个任务在执行
+        self.inflight_tasks: Dict[str, str] = {}
+        # 被合并的提交次数，按操作类型统计
+        self.coalesced_counts: Dict[str, int] = {}
+        # 完成回调在工作线程中执行，访问任务字典时需要加锁
+        self._lock = threading.Lock()
 
-    def execute_task(self, func: Callable, op_type: str = "unknown", extra_data: dict = None) -> str:
+    def execute_task(self, func: Callable, op_type: str = "unknown", extra_data: dict = None,
+                     single_flight: bool = False) -> str:
         """
         执行异步任务，提交到线程池并返回任务ID。
         
@@ -96,22 +122,40 @@ class AsyncTaskExecutor(QObject):
             func: 要执行的任务函数或已绑定参数的函数
             op_type: 操作类型标识（如"login", "dislogin"等）
             extra_data: 额外数据，会传递到完成信号
+            single_flight: 是否按操作类型单飞执行。为True时，若同类型任务仍在执行，
+                           本次提交不会进入线程池，而是合并到正在执行的任务上（只触发一次完成信号，
+                           本次的extra_data被忽略），并计入coalesced_counts
         
         返回:
-            str: 任务ID，可用于后续取消任务
+            str: 任务ID，可用于后续取消任务；合并时返回正在执行的任务ID
         
         示例:
             >>> task_id = executor.execute_task(lambda: networkmanager.login(username, password), "login")
         """
-        # 生成唯一任务ID
-        task_id = f"{op_type}_{self.task_counter}"
-        self.task_counter += 1
+        with self._lock:
+            if single_flight:
+                inflight_id = self.inflight_tasks.get(op_type)
+                if inflight_id is not None and inflight_id in self.active_tasks:
+                    self.coalesced_counts[op_type] = self.coalesced_counts.get(op_type, 0) + 1
+                    COALESCED.labels(op_type).inc()
+                    return inflight_id
+            # 生成唯一任务ID
+            task_id = f"{op_type}_{self.task_counter}"
+            self.task_counter += 1
         
         try:
-            # 提交任务到线程池
-            future = self.thread_pool.submit(self._run_task, func, op_type)
-            # 存储任务引用以便追踪和取消
-            self.active_tasks[task_id] = future
+            with self._lock:
+                # 提交任务到线程池，提交前计入队列长度，避免任务立即开始时队列长度短暂为负
+                QUEUE_DEPTH.inc()
+                try:
+                    future = self.thread_pool.submit(self._run_task, func, op_type, time.perf_counter())
+                except Exception:
+                    QUEUE_DEPTH.dec()
+                    raise
+                # 存储任务引用以便追踪和取消
+                self.active_tasks[task_id] = future
+                if single_flight:
+                    self.inflight_tasks[op_type] = task_id
             # 添加回调处理结果，传递extra_data
             future.add_done_callback(lambda f, tid=task_id, ed=extra_data: self._handle_future_result(f, tid, ed))
             return task_id
@@ -134,12 +178,15 @@ class AsyncTaskExecutor(QObject):
             任务取消成功仅表示尝试取消的操作成功，不保证任务一定能被取消。
             如果任务已经开始执行，则无法取消。
         """
-        if task_id in self.active_tasks:
+        with self._lock:
+            future = self.active_tasks.get(task_id)
+        if future is not None:
             # 尝试取消任务
-            cancelled = self.active_tasks[task_id].cancel()
+            cancelled = future.cancel()
             if cancelled:
+                QUEUE_DEPTH.dec()
                 logger.info(f"[任务 {task_id}] 已取消")
-                del self.active_tasks[task_id]  # 从活动任务列表中移除
+                self._forget_task(task_id)  # 从活动任务列表中移除
             return cancelled
         return False
 
@@ -149,18 +196,21 @@ class AsyncTaskExecutor(QObject):
         
         该方法会尝试取消所有已提交但尚未开始执行的任务，并记录剩余活跃任务数。
         """
-        for task_id in list(self.active_tasks.keys()):
+        with self._lock:
+            task_ids = list(self.active_tasks.keys())
+        for task_id in task_ids:
             self.cancel_task(task_id)
         logger.info(f"已尝试取消所有任务，剩余活跃任务数: {len(self.active_tasks)}")
 
     @staticmethod
-    def _run_task(func: Callable, op_type: str) -> tuple:
+    def _run_task(func: Callable, op_type: str, submitted_at: float = None) -> tuple:
         """
-        在线程池中运行任务的内部方法。
+        在线程池中运行任务的内部方法，并记录任务的等待时间、执行耗时与结果指标。
         
         参数:
             func: 要执行的任务函数
             op_type: 操作类型标识
+            submitted_at: 提交时间（perf_counter），用于统计排队时间
         
         返回:
             tuple: (success: bool, message: str, op_type: str)
@@ -173,10 +223,17 @@ class AsyncTaskExecutor(QObject):
         # 转义可能导致loguru颜色解析错误的字符
         task_name = task_name.replace('<', '\<').replace('>', '\>')
         # logger.info(f"[任务执行] 开始执行: {task_name}, 操作类型: {op_type}")
-        
+        started_at = time.perf_counter()
+        if submitted_at is not None:
+            QUEUE_DEPTH.dec()
+            TASK_WAIT.labels(op_type).observe(started_at - submitted_at)
+        RUNNING_TASKS.inc()
+        result = 'failure'
         try:
             # 包装成(success, message, op_type)格式
-            return True, func(), op_type
+            message = func()
+            result = 'success'
+            return True, message, op_type
         except ConnectionError as e:
             logger.error(f"[任务执行] 连接错误: {task_name}, 错误: {str(e)}")
             return False, f"网络连接错误: {str(e)}", op_type
@@ -186,6 +243,23 @@ class AsyncTaskExecutor(QObject):
         except Exception as e:
             logger.error(f"[任务执行] 失败: {task_name}, 错误: {str(e)}", exc_info=True)
             return False, f"任务执行失败: {str(e)}", op_type
+        finally:
+            RUNNING_TASKS.dec()
+            TASK_DURATION.labels(op_type).observe(time.perf_counter() - started_at)
+            TASKS.labels(op_type, result).inc()
+
+    def _forget_task(self, task_id: str) -> None:
+        """
+        从活跃任务和单飞任务字典中移除指定任务。
+        
+        参数:
+            task_id: 任务ID
+        """
+        with self._lock:
+            self.active_tasks.pop(task_id, None)
+            for op_type, inflight_id in list(self.inflight_tasks.items()):
+                if inflight_id == task_id:
+                    del self.inflight_tasks[op_type]
 
     def _handle_future_result(self, future: Future, task_id: str, extra_data: dict = None) -> None:
         """
@@ -203,8 +277,7 @@ class AsyncTaskExecutor(QObject):
         """
         try:
             # 从活动任务列表中移除已完成的任务
-            if task_id in self.active_tasks:
-                del self.active_tasks[task_id]
+            self._forget_task(task_id)
             # 获取任务结果
             success, message, op_type = future.result()
             # 发射完成信号
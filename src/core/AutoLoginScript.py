@@ -2,52 +2,99 @@
 # -*- coding: utf-8 -*-
 """
 自动登录脚本，用于无人值守环境下自动登录校园网
-该脚本会尝试多次登录操作，直到成功或达到最大尝试次数
+默认模式下会尝试多次登录操作，直到成功或达到最大尝试次数；
+使用 --daemon 参数时以无界面守护进程方式常驻运行，持续检测网络并在断线时自动重新登录
+
+命令行用法：
+    AutoLoginScript.exe                               # 单次登录
+    AutoLoginScript.exe --daemon                      # 常驻保活
+    AutoLoginScript.exe --daemon --interval 300 --offline-interval 5 --status-file C:\\status.json
 """
+import argparse
 import os
 import sys
 import time
 
 # 设置项目根目录路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # 导入网络管理模块
 from src.core.NetworkManager import networkmanager
 
-if __name__ == "__main__":
+
+def parse_args():
     """
-    主程序入口，实现校园网自动登录功能
-    
-    功能说明：
-    1. 导入必要的模块和网络管理器实例
-    2. 尝试执行登录操作，最多尝试5次
-    3. 每次尝试间隔1秒
-    4. 登录成功后立即退出循环
-    
-    注意事项：
-    - 该脚本需要配合已保存的凭证使用
-    - 通常作为计划任务或开机启动项运行
-    - 如需修改尝试次数和间隔时间，可以调整下方代码中的参数
+    解析命令行参数
+
+    返回:
+        argparse.Namespace: 命令行参数
+    """
+    parser = argparse.ArgumentParser(description="广西科师校园网自动登录脚本")
+    parser.add_argument('--daemon', action='store_true', help="以守护进程方式常驻运行，断线时自动重新登录")
+    parser.add_argument('--interval', type=float, default=None, help="守护模式下网络稳定在线时的最大检测间隔(秒)，默认300")
+    parser.add_argument('--offline-interval', type=float, default=None, help="守护模式下网络离线或状态变化后的检测间隔(秒)，默认5")
+    parser.add_argument('--status-file', default=None, help="守护模式下的状态文件路径")
+    parser.add_argument('--history-file', default=None, help="守护模式下的历史数据库路径，传入空字符串则不记录历史")
+    parser.add_argument('--metrics-port', type=int, default=None, help="守护模式下在本机此端口提供 /metrics 指标端点")
+    parser.add_argument('--metrics-file', default=None, help="守护模式下每次检测后把指标写入此文件（.prom）")
+    parser.add_argument('--trace-file', default=None, help="守护模式下每次自动重新登录后把登录调用链写入此文件（Chrome 追踪格式）")
+    return parser.parse_args()
+
+
+def run_once(max_attempts=5, attempt_interval=1):
+    """
+    执行单次自动登录，失败时重试
+
+    参数:
+        max_attempts (int): 最大尝试登录次数
+        attempt_interval (float): 尝试间隔时间(秒)
+
+    返回:
+        bool: 登录成功返回 True，否则返回 False
     """
-    # 最大尝试登录次数
-    max_attempts = 5
-    # 尝试间隔时间（秒）
-    attempt_interval = 1
-    
     for i in range(max_attempts):
         try:
             # 执行登录操作
             # 注意：这里使用的是默认凭证，需要提前通过主程序保存
-            login_result = networkmanager.login()
-            
-            # 检查登录是否成功
-            if isinstance(login_result, tuple) and login_result[0]:
+            # 检查登录是否成功，login 返回布尔值
+            if networkmanager.login():
                 # 登录成功，退出循环
-                break
+                return True
         except Exception as e:
             # 捕获异常，继续下一次尝试
             pass
-        
+
         # 如果不是最后一次尝试，则等待一段时间后再试
         if i < max_attempts - 1:
             time.sleep(attempt_interval)
+    return False
+
+
+if __name__ == "__main__":
+    """
+    主程序入口，实现校园网自动登录功能
+
+    功能说明：
+    1. 导入必要的模块和网络管理器实例
+    2. 默认模式：尝试执行登录操作，最多尝试5次，每次尝试间隔1秒，登录成功后立即退出
+    3. 守护模式（--daemon）：常驻运行，按自适应间隔检测网络，断线时自动重新登录，并持续更新状态文件
+
+    注意事项：
+    - 该脚本需要配合已保存的凭证使用
+    - 通常作为计划任务或开机启动项运行，守护模式只需开机启动一次
+    - 如需修改尝试次数和间隔时间，可以调整 run_once 的参数或守护模式的命令行参数
+    """
+    args = parse_args()
+    if args.daemon:
+        from src.core.KeepAliveDaemon import KeepAliveDaemon
+        KeepAliveDaemon(
+            interval=args.interval,
+            offline_interval=args.offline_interval,
+            status_file=args.status_file,
+            history_file=args.history_file,
+            metrics_port=args.metrics_port,
+            metrics_file=args.metrics_file,
+            trace_file=args.trace_file,
+        ).run_forever()
+    else:
+        sys.exit(0 if run_once() else 1)
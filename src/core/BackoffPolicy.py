@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+退避与熔断策略模块
+
+认证服务器故障恢复时，所有客户端会以相同的固定间隔同时重试登录，形成"惊群"，
+刚恢复的服务器再次被压垮。此模块提供一个由登录、登出和保活循环共享的退避策略：
+- 去相关抖动退避（decorrelated jitter）：每次延迟在 [base, 上次延迟×3] 之间随机取值，并受上限约束，
+  不同客户端的重试时间自然错开
+- 熔断器：认证服务器连续返回错误（超时、连接失败、5xx）达到阈值后熔断，熔断期间直接放弃请求；
+  熔断时长带随机抖动，到期后只放行一个试探请求
+- 保活重新登录节流：重新登录失败后按退避延迟推迟下一次自动重新登录
+- 统计被避免的请求数和被推迟的重新登录次数
+
+依赖项：
+- random, threading, time: 抖动、线程安全与计时
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.BackoffPolicy import BackoffPolicy
+
+policy = BackoffPolicy(base=1.0, cap=300.0, failure_threshold=3, recovery_timeout=30.0)
+
+delays = policy.retry_delays()
+for attempt in range(4):
+    if not policy.allow_request():
+        break  # 熔断中，不再发送请求
+    try:
+        send_request()
+        policy.record_success()
+        break
+    except TimeoutError:
+        policy.record_failure()
+        time.sleep(delays.next())
+
+print(policy.stats())
+```
+"""
+import random
+import threading
+import time
+
+from src.utils.logger import logger
+
+
+class DecorrelatedJitter:
+    """
+    去相关抖动退避延迟序列。
+
+    第 n 次延迟 = min(cap, uniform(base, 第 n-1 次延迟 × 3))，首次以 base 作为上次延迟。
+    """
+
+    def __init__(self, base, cap, rng=None):
+        """
+        参数:
+            base (float): 最小延迟(秒)
+            cap (float): 最大延迟(秒)
+            rng (random.Random, optional): 随机数生成器
+        """
+        self.base = base
+        self.cap = cap
+        self._rng = rng or random.Random()
+        self._previous = base
+
+    def next(self):
+        """
+        返回:
+            float: 下一次延迟(秒)
+        """
+        self._previous = min(self.cap, self._rng.uniform(self.base, self._previous * 3))
+        return self._previous
+
+    def reset(self):
+        """重新从 base 开始计算延迟"""
+        self._previous = self.base
+
+
+class CircuitBreaker:
+    """
+    熔断器（线程安全）。
+
+    状态:
+        closed: 正常放行
+        open: 熔断中，拒绝所有请求，直到熔断时长结束
+        half_open: 熔断结束后只放行一个试探请求，成功则恢复，失败则再次熔断
+
+    属性:
+        failure_threshold (int): 连续失败多少次后熔断
+        recovery_timeout (float): 熔断时长(秒)，实际时长在其 0.5~1.5 倍之间随机取值
+        state (str): 当前状态
+        opened_count (int): 累计熔断次数
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, recovery_timeout=30.0, rng=None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.opened_count = 0
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        判断是否放行一个请求。
+
+        返回:
+            bool: 放行返回 True，熔断中返回 False
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() < self._open_until:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # 半开状态只放行一个试探请求
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def blocked(self):
+        """
+        判断熔断器现在是否会拒绝请求，不改变状态、不占用半开状态的试探名额。
+
+        返回:
+            bool: 熔断中或半开状态的试探请求尚未结束时返回 True
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() < self._open_until
+            return self.state == self.HALF_OPEN and self._trial_in_flight
+
+    def record_success(self):
+        """记录一次成功，熔断器恢复正常"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("认证服务器已恢复，熔断解除")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """记录一次失败，连续失败达到阈值或试探失败时熔断"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                duration = self.recovery_timeout * self._rng.uniform(0.5, 1.5)
+                self._open_until = time.monotonic() + duration
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                    logger.warning(f"认证服务器连续 {self._failures} 次出错，暂停请求 {duration:.1f} 秒")
+                self.state = self.OPEN
+
+
+class BackoffPolicy:
+    """
+    登录、登出与保活循环共享的退避策略。
+
+    属性:
+        breaker (CircuitBreaker): 认证服务器熔断器
+        retry_base (float): 单次登录/登出内重试延迟的最小值(秒)
+        retry_cap (float): 单次登录/登出内重试延迟的最大值(秒)
+        avoided_requests (int): 因熔断而未发送的请求数
+        deferred_relogins (int): 因退避而推迟的自动重新登录次数
+    """
+
+    def __init__(self, base=1.0, cap=300.0, retry_base=0.2, retry_cap=5.0, failure_threshold=3,
+                 recovery_timeout=30.0, seed=None):
+        """
+        参数:
+            base (float): 自动重新登录失败后推迟时间的最小值(秒)
+            cap (float): 自动重新登录失败后推迟时间的最大值(秒)
+            retry_base (float): 单次登录/登出内重试延迟的最小值(秒)
+            retry_cap (float): 单次登录/登出内重试延迟的最大值(秒)
+            failure_threshold (int): 连续失败多少次后熔断
+            recovery_timeout (float): 熔断时长(秒)
+            seed (int, optional): 随机数种子
+        """
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout, self._rng)
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self._relogin_backoff = DecorrelatedJitter(base, cap, self._rng)
+        self._next_relogin_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.avoided_requests = 0
+        self.deferred_relogins = 0
+
+    def allow_request(self):
+        """
+        发送请求前调用，熔断中时计入被避免的请求。
+
+        返回:
+            bool: 可以发送返回 True
+        """
+        allowed = self.breaker.allow()
+        with self._lock:
+            if allowed:
+                self.requests += 1
+            else:
+                self.avoided_requests += 1
+        return allowed
+
+    def blocked(self):
+        """
+        开始登录等多请求流程前调用，熔断中时整个流程都不应访问认证服务器，计入被避免的请求。
+        与 allow_request 不同，不会占用半开状态的试探名额（试探由流程中的第一个登录请求进行）。
+
+        返回:
+            bool: 熔断中返回 True
+        """
+        blocked = self.breaker.blocked()
+        if blocked:
+            with self._lock:
+                self.avoided_requests += 1
+        return blocked
+
+    def record_success(self):
+        """认证服务器正常响应后调用"""
+        self.breaker.record_success()
+
+    def record_failure(self):
+        """认证服务器出错（超时、连接失败、5xx）后调用"""
+        with self._lock:
+            self.failures += 1
+        self.breaker.record_failure()
+
+    def retry_delays(self):
+        """
+        为一次登录/登出创建重试延迟序列。
+
+        返回:
+            DecorrelatedJitter: 调用 next() 获取下一次重试前的延迟
+        """
+        return DecorrelatedJitter(self.retry_base, self.retry_cap, self._rng)
+
+    def allow_relogin(self):
+        """
+        保活循环检测到离线时调用，判断现在是否应该自动重新登录。
+
+        返回:
+            bool: 可以重新登录返回 True，仍在退避期内返回 False
+        """
+        with self._lock:
+            if time.monotonic() >= self._next_relogin_at:
+                return True
+            self.deferred_relogins += 1
+            return False
+
+    def record_relogin(self, success):
+        """
+        记录自动重新登录的结果，失败时按退避延迟推迟下一次重新登录。
+
+        参数:
+            success (bool): 重新登录是否成功
+        """
+        with self._lock:
+            if success:
+                self._relogin_backoff.reset()
+                self._next_relogin_at = 0.0
+                return
+            delay = self._relogin_backoff.next()
+            self._next_relogin_at = time.monotonic() + delay
+        logger.info(f"自动重新登录失败，{delay:.1f} 秒后再试")
+
+    def reset_relogin(self):
+        """网络恢复在线后调用，清除重新登录的退避状态"""
+        with self._lock:
+            self._relogin_backoff.reset()
+            self._next_relogin_at = 0.0
+
+    def stats(self):
+        """
+        返回:
+            dict: 包含 'state'、'requests'、'failures'、'avoided_requests'、'deferred_relogins'、
+                  'breaker_opened'、'next_relogin_in' 的统计字典
+        """
+        with self._lock:
+            return {
+                'state': self.breaker.state,
+                'requests': self.requests,
+                'failures': self.failures,
+                'avoided_requests': self.avoided_requests,
+                'deferred_relogins': self.deferred_relogins,
+                'breaker_opened': self.breaker.opened_count,
+                'next_relogin_in': max(0.0, self._next_relogin_at - time.monotonic()),
+            }
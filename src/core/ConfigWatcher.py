@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+配置文件监视模块
+
+此模块在后台线程中定期检查配置文件（config/local_credentials.json）是否被外部修改，
+修改后调用 CredentialManager.reload() 只重新加载变化的配置项，并由凭证管理器通知订阅者
+（NetworkManager 会立即应用新的网络参数，主界面会更新对应的控件），修改 MAX_RETRY、TEST_URL 等配置无需重启。
+主要功能包括：
+- 每次检查只执行一次 os.stat，比较修改时间和大小，文件未变化时不读取、不解析
+- 程序自身写入的配置不会被当作外部修改
+- 短时间内的连续保存（编辑器先截断再写入）在文件稳定后只重新加载一次
+
+依赖项：
+- threading: 后台线程
+- src.core.Credentials: 凭证管理器（重新加载与变化通知）
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.Credentials import credentials
+from src.core.ConfigWatcher import ConfigWatcher
+
+unsubscribe = credentials.subscribe(lambda changes: print("配置已修改:", changes))
+watcher = ConfigWatcher()
+watcher.start()
+...
+watcher.stop()
+```
+"""
+import threading
+
+from src.utils.logger import logger
+from src.core.Credentials import credentials
+
+
+class ConfigWatcher:
+    """
+    配置文件监视器，在后台守护线程中运行。
+
+    属性:
+        manager (CredentialManager): 被监视的凭证管理器
+        interval (float): 检查间隔(秒)
+        reloads (int): 发现配置变化并重新加载的次数
+    """
+    DEFAULT_INTERVAL = 1.0
+
+    def __init__(self, manager=None, interval=None):
+        """
+        参数:
+            manager (CredentialManager, optional): 凭证管理器，默认为全局单例
+            interval (float, optional): 检查间隔(秒)，默认为 DEFAULT_INTERVAL
+        """
+        self.manager = manager or credentials
+        self.interval = interval or self.DEFAULT_INTERVAL
+        self.reloads = 0
+        self._pending = None  # 已发现但尚未稳定的文件版本
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """启动监视线程，重复调用不会启动多个线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+        logger.debug(f"配置文件监视已启动，检查间隔 {self.interval} 秒")
+
+    def stop(self):
+        """停止监视线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def check(self):
+        """
+        检查一次配置文件，被外部修改时重新加载。
+
+        返回:
+            dict: 变化的配置项到新值的映射，没有变化时为空字典
+        """
+        # 文件刚被修改时可能还没有写完，等到修改时间在一个检查间隔内不再变化后再加载
+        signature = self.manager.file_signature()
+        if signature is None or signature == self.manager.loaded_signature:
+            self._pending = None
+            return {}
+        if signature != self._pending:
+            self._pending = signature
+            return {}
+        self._pending = None
+        changes = self.manager.reload()
+        if changes:
+            self.reloads += 1
+        return changes
+
+    def _run(self):
+        """监视循环"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"检查配置文件失败: {str(e)}")
@@ -0,0 +1,517 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网络连通性探测模块
+
+此模块实现一个可插拔的探测引擎：同时发起多个轻量级探测（HTTP 204 接口、HEAD 请求、
+TCP 直连、认证页面重定向检查），以最先得出明确结论的探测结果作为在线/离线判断，
+不再需要下载完整的网页，一次往返即可完成判断。
+主要功能包括：
+- 多种探测器：HttpProbe、TcpConnectProbe、PortalRedirectProbe
+- 并发竞速的探测引擎 ProbeEngine，支持注册/移除探测器
+- 每个探测器的耗时与结论统计
+- HTTP探测只读取响应头（HEAD 或流式 GET 后立即关闭），并统计探测消耗的流量
+
+依赖项：
+- concurrent.futures: 并发执行探测
+- socket: TCP直连探测
+- requests: HTTP探测（通过 src.core.HttpSession 的共享连接池）
+- urllib.parse: 解析重定向目标
+- src.core.Metrics: 探测耗时直方图
+
+使用示例：
+```python
+from src.core.ConnectivityProbe import ProbeEngine, HttpProbe, TcpConnectProbe
+
+engine = ProbeEngine([
+    HttpProbe("miui_204", session, "http://connect.rom.miui.com/generate_204", auth_domain="auth.gxstnu.edu.cn"),
+    TcpConnectProbe("alidns_tcp", "223.5.5.5", 53),
+])
+outcome = engine.check(timeout=1.5)
+print(outcome.online, outcome.winner.name, outcome.winner.latency)
+print(engine.stats())
+print(engine.traffic_stats()["bytes_per_hour"])
+```
+"""
+import errno
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from src.core.Metrics import metrics
+
+
+PROBE_LATENCY = metrics.histogram('campus_probe_latency_seconds', '单个连通性探测器的耗时(秒)', ['probe', 'result'])
+
+
+@dataclass
+class ProbeResult:
+    """
+    单次探测的结果。
+
+    属性:
+        name (str): 探测器名称
+        online (bool or None): True 表示确认在线，False 表示确认离线（如被重定向到认证页），
+                               None 表示该探测无法得出结论
+        latency (float): 探测耗时(秒)
+        detail (str): 结果说明，便于日志排查
+        reachable (bool or None): 探测目标是否可达（收到任何响应即为可达），None 表示未知（如超时）
+    """
+    name: str
+    online: Optional[bool]
+    latency: float
+    detail: str = ""
+    reachable: Optional[bool] = None
+
+
+@dataclass
+class ProbeOutcome:
+    """
+    一次竞速探测的总体结果。
+
+    属性:
+        online (bool): 最终的在线判断，没有任何明确结论时为 False
+        conclusive (bool): 是否有探测器给出了明确结论
+        winner (ProbeResult or None): 最先给出明确结论的探测结果
+        results (list): 在返回前已完成的全部探测结果
+    """
+    online: bool
+    conclusive: bool
+    winner: Optional[ProbeResult] = None
+    results: List[ProbeResult] = field(default_factory=list)
+
+
+class Probe:
+    """
+    探测器基类，子类实现 _probe 方法返回 (online, detail, reachable)。
+
+    属性:
+        name (str): 探测器名称，在引擎中唯一
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def run(self, timeout):
+        """
+        执行一次探测并计时，探测过程中的任何异常都视为无结论。
+
+        参数:
+            timeout (float): 超时时间(秒)
+
+        返回:
+            ProbeResult: 探测结果
+        """
+        start = time.perf_counter()
+        try:
+            online, detail, reachable = self._probe(timeout)
+        except Exception as e:
+            online, detail, reachable = None, f"{type(e).__name__}: {str(e)}", None
+        return ProbeResult(self.name, online, time.perf_counter() - start, detail, reachable)
+
+    def _probe(self, timeout):
+        """子类实现具体探测逻辑，返回 (online, detail, reachable)。"""
+        raise NotImplementedError
+
+
+class TrafficCounter:
+    """
+    探测流量计数器（线程安全），统计探测请求在应用层收发的字节数。
+
+    字节数按请求行、请求头、请求体以及状态行、响应头和实际读取的响应体估算，
+    不含TCP/IP协议开销，用于评估保活循环每小时消耗的流量。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record_response(self, response, body_bytes=0):
+        """
+        记录一次HTTP请求/响应的流量。
+
+        参数:
+            response (requests.Response): 响应对象（其 request 属性为实际发送的请求）
+            body_bytes (int): 实际读取的响应体字节数
+        """
+        request = response.request
+        sent = len(f"{request.method} {request.path_url} HTTP/1.1\r\n") + 2
+        sent += sum(len(name) + len(value) + 4 for name, value in request.headers.items())
+        if request.body:
+            sent += len(request.body)
+        received = len(f"HTTP/1.1 {response.status_code} {response.reason}\r\n") + 2
+        received += sum(len(name) + len(value) + 4 for name, value in response.headers.items())
+        received += body_bytes
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    def snapshot(self):
+        """
+        返回流量统计快照。
+
+        返回:
+            dict: 包含 'requests'、'bytes_sent'、'bytes_received'、'bytes_total'、
+                  'elapsed'（统计时长，秒）和 'bytes_per_hour'
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at
+            total = self.bytes_sent + self.bytes_received
+            return {
+                'requests': self.requests,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'bytes_total': total,
+                'elapsed': elapsed,
+                'bytes_per_hour': total * 3600 / elapsed if elapsed > 0 else 0.0,
+            }
+
+
+class HttpProbe(Probe):
+    """
+    HTTP探测器，不跟随重定向，只根据状态码和重定向目标判断，从不下载响应体。
+
+    - 状态码在 expected_status 中：在线
+    - 重定向到认证域名：离线（处于认证页）
+    - 期望 204 却收到 200：离线（认证网关劫持并返回了页面）
+    - 其他重定向：再跟随一跳，跳转到认证页为离线；同一主机上的跳转（如 http 跳转 https）成功为在线；
+      跳到其他主机或 IP（认证网关可能先经过中间地址再到认证页）无结论
+    - 连接失败、超时或其他状态码：无结论
+
+    探测模式:
+    - "head": 发送 HEAD 请求；服务器不支持（405/501）时自动改用 "stream"
+    - "stream": 发送流式 GET 请求，读到响应头后立即关闭，不读取响应体
+    """
+    MODES = ('head', 'stream')
+
+    def __init__(self, name, session, url, auth_domain, mode='stream', expected_status=(204,), traffic=None):
+        """
+        参数:
+            name (str): 探测器名称
+            session (PooledSession): 共享的HTTP会话
+            url (str): 探测URL
+            auth_domain (str): 认证服务器域名，重定向到该域名视为处于认证页
+            mode (str): 探测模式，"head" 或 "stream"
+            expected_status (tuple): 视为在线的状态码
+            traffic (TrafficCounter, optional): 流量计数器
+        """
+        super().__init__(name)
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的探测模式: {mode}")
+        self.session = session
+        self.url = url
+        self.auth_domain = auth_domain
+        self.mode = mode
+        self.expected_status = tuple(expected_status)
+        self.traffic = traffic
+
+    def _request(self, mode, timeout, url=None):
+        """按指定模式发送请求（默认请求探测URL），只读取状态行和响应头。"""
+        url = url or self.url
+        if mode == 'head':
+            response = self.session.request('HEAD', url, timeout=timeout, allow_redirects=False)
+        else:
+            response = self.session.request('GET', url, timeout=timeout, allow_redirects=False, stream=True)
+        # 不读取响应体直接关闭；无响应体（如 204、HEAD）时连接仍会归还连接池
+        response.close()
+        if self.traffic is not None:
+            self.traffic.record_response(response)
+        return response
+
+    def _probe(self, timeout):
+        try:
+            response = self._request(self.mode, timeout)
+            if self.mode == 'head' and response.status_code in (405, 501):
+                response = self._request('stream', timeout)
+        except requests.exceptions.Timeout as e:
+            return None, f"{type(e).__name__}", None
+        except requests.exceptions.RequestException as e:
+            return None, f"{type(e).__name__}", False
+        status = response.status_code
+        location = response.headers.get('Location', '')
+        if self.auth_domain and self.auth_domain in location:
+            return False, f"{status} 重定向到认证页", True
+        if status in self.expected_status:
+            return True, f"{status}", True
+        if 204 in self.expected_status and status == 200:
+            return False, "200 被认证网关劫持", True
+        if 300 <= status < 400 and location:
+            return self._follow_redirect(status, urljoin(self.url, location), timeout)
+        return None, f"{status}", True
+
+    def _follow_redirect(self, status, location, timeout):
+        """跟随一跳非认证页的重定向后再判断，返回值同 _probe"""
+        try:
+            response = self._request(self.mode, timeout, location)
+        except requests.exceptions.RequestException as e:
+            return None, f"{status} -> {location}: {type(e).__name__}", True
+        next_location = response.headers.get('Location', '')
+        if self.auth_domain and (self.auth_domain in location or self.auth_domain in next_location):
+            return False, f"{status} -> {location} 重定向到认证页", True
+        if urlparse(location).hostname == urlparse(self.url).hostname and 200 <= response.status_code < 300:
+            return True, f"{status} -> {location}", True
+        return None, f"{status} -> {location} -> {response.status_code}", True
+
+
+class TcpConnectProbe(Probe):
+    """
+    TCP直连探测器。
+
+    认证网关通常会放行或劫持部分端口，因此连接成功不能证明已经在线，只记为无结论；
+    但"网络不可达/主机不可达"说明本机没有可用链路或路由，可以明确判定离线。
+    """
+    UNREACHABLE_ERRNOS = {errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ENETDOWN}
+
+    def __init__(self, name, host, port):
+        """
+        参数:
+            name (str): 探测器名称
+            host (str): 目标主机（建议使用IP，避免DNS解析耗时）
+            port (int): 目标端口
+        """
+        super().__init__(name)
+        self.host = host
+        self.port = port
+
+    def _probe(self, timeout):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=timeout):
+                return None, "链路可用", True
+        except socket.timeout:
+            return None, "连接超时", None
+        except OSError as e:
+            if e.errno in self.UNREACHABLE_ERRNOS:
+                return False, f"网络不可达: {e.strerror}", False
+            return None, f"{type(e).__name__}: {e.strerror or str(e)}", False
+
+
+class PortalRedirectProbe(Probe):
+    """
+    认证页重定向探测器：以流式 GET 访问 BASE_URL，只读取响应头，检查认证网关是否可达。
+
+    校园网在已登录状态下访问 BASE_URL 同样会被重定向到认证页（登出流程正依赖这一点），
+    因此该探测只反映认证网关的可达性，不对在线状态下结论。
+    """
+
+    def __init__(self, name, session, base_url, auth_domain, traffic=None):
+        """
+        参数:
+            name (str): 探测器名称
+            session (PooledSession): 共享的HTTP会话
+            base_url (str): 校园网认证的基础URL
+            auth_domain (str): 认证服务器域名
+            traffic (TrafficCounter, optional): 流量计数器
+        """
+        super().__init__(name)
+        self.session = session
+        self.base_url = base_url
+        self.auth_domain = auth_domain
+        self.traffic = traffic
+
+    def _probe(self, timeout):
+        try:
+            response = self.session.request('GET', self.base_url, timeout=timeout,
+                                            allow_redirects=False, stream=True)
+        except requests.exceptions.Timeout as e:
+            return None, f"{type(e).__name__}", None
+        except requests.exceptions.RequestException as e:
+            return None, f"{type(e).__name__}", False
+        response.close()
+        if self.traffic is not None:
+            self.traffic.record_response(response)
+        location = response.headers.get('Location', '')
+        if self.auth_domain in location:
+            return None, "认证网关可达", True
+        return None, f"{response.status_code} 未重定向到认证页", False
+
+
+class ProbeStats:
+    """
+    单个探测器的累计统计信息（线程安全）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.conclusive = 0
+        self.wins = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.last_detail = ""
+
+    def record(self, result, won=False):
+        """记录一次探测结果。"""
+        with self._lock:
+            self.runs += 1
+            self.total_latency += result.latency
+            self.last_latency = result.latency
+            self.last_detail = result.detail
+            if result.online is not None:
+                self.conclusive += 1
+            if won:
+                self.wins += 1
+
+    def snapshot(self):
+        """返回统计信息的字典快照。"""
+        with self._lock:
+            return {
+                'runs': self.runs,
+                'conclusive': self.conclusive,
+                'wins': self.wins,
+                'avg_latency': self.total_latency / self.runs if self.runs else 0.0,
+                'last_latency': self.last_latency,
+                'last_detail': self.last_detail,
+            }
+
+
+class ProbeEngine:
+    """
+    并发竞速的探测引擎：所有探测器同时发起（或按顺序对冲发起），返回最先给出明确结论的结果。
+
+    未被采用的探测会在后台继续完成，其耗时同样计入统计。
+
+    属性:
+        probes (list): 已注册的探测器列表
+        traffic (TrafficCounter): 探测流量计数器，HTTP探测器可共享使用
+    """
+
+    def __init__(self, probes=None, max_workers=8):
+        """
+        初始化探测引擎。
+
+        参数:
+            probes (list, optional): 初始探测器列表
+            max_workers (int): 探测线程池大小，应不少于探测器数量的两倍，
+                               以免上一轮尚未结束的慢探测占满线程
+        """
+        self._lock = threading.Lock()
+        self.probes = []
+        self._stats = {}
+        self.traffic = TrafficCounter()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Probe")
+        for probe in probes or []:
+            self.register(probe)
+
+    def register(self, probe):
+        """
+        注册探测器，同名探测器会被替换。
+
+        参数:
+            probe (Probe): 探测器实例
+        """
+        with self._lock:
+            self.probes = [p for p in self.probes if p.name != probe.name] + [probe]
+            self._stats.setdefault(probe.name, ProbeStats())
+
+    def unregister(self, name):
+        """
+        移除指定名称的探测器。
+
+        参数:
+            name (str): 探测器名称
+        """
+        with self._lock:
+            self.probes = [p for p in self.probes if p.name != name]
+
+    def check(self, timeout, hedge_delay=None):
+        """
+        执行探测器，返回最先得出的明确结论。
+
+        默认所有探测器同时发起。给出 hedge_delay 时按注册顺序逐个发起：前一个探测无结论，
+        或 hedge_delay 秒内没有返回时才发起下一个，得出结论后不再发起其余探测，
+        网络正常时只需一个请求（用于登录前后等只关心是否在线的检测）。
+
+        参数:
+            timeout (float): 单个探测的超时时间，也是整体等待的上限(秒)
+            hedge_delay (float, optional): 逐个发起时等待前一个探测的时间(秒)
+
+        返回:
+            ProbeOutcome: 探测结果
+        """
+        with self._lock:
+            probes = list(self.probes)
+        if hedge_delay is None:
+            futures = {self._executor.submit(probe.run, timeout): probe for probe in probes}
+            probes = []
+        else:
+            futures = {}
+        results = []
+        # 留出少量余量，让恰好在超时边界返回的探测也能被统计
+        deadline = time.monotonic() + timeout + 0.5
+        while futures or probes:
+            if probes:
+                probe = probes.pop(0)
+                futures[self._executor.submit(probe.run, timeout)] = probe
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(futures, timeout=min(hedge_delay, remaining) if probes else remaining,
+                           return_when=FIRST_COMPLETED)
+            if not done and not probes:
+                break
+            for future in done:
+                del futures[future]
+                result = future.result()
+                results.append(result)
+                if result.online is not None:
+                    self._record(result, won=True)
+                    self._record_pending(futures)
+                    return ProbeOutcome(result.online, True, result, results)
+                self._record(result)
+        self._record_pending(futures)
+        return ProbeOutcome(False, False, None, results)
+
+    def _record_pending(self, futures):
+        """尚未完成的探测在后台完成后再记录统计。"""
+        for future in futures:
+            future.add_done_callback(self._record_late)
+
+    def _record_late(self, future):
+        """记录在结论给出之后才完成的探测。"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._record(future.result())
+
+    def _record(self, result, won=False):
+        """记录一次探测结果到统计与耗时直方图（探测器已被移除时忽略）。"""
+        stats = self._stats.get(result.name)
+        if stats is None:
+            return
+        stats.record(result, won)
+        outcome = 'inconclusive' if result.online is None else ('online' if result.online else 'offline')
+        PROBE_LATENCY.labels(result.name, outcome).observe(result.latency)
+
+    def stats(self):
+        """
+        获取所有探测器的统计信息。
+
+        返回:
+            dict: 探测器名称到统计字典的映射，统计字典包含 'runs'、'conclusive'、'wins'、
+                  'avg_latency'、'last_latency'、'last_detail'
+        """
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def traffic_stats(self):
+        """
+        获取探测流量统计，用于评估保活循环每小时消耗的流量。
+
+        返回:
+            dict: TrafficCounter.snapshot() 的结果
+        """
+        return self.traffic.snapshot()
+
+    def shutdown(self):
+        """关闭探测线程池，不等待仍在进行的探测。"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+网络连通性状态机模块
+
+此模块用一个状态机代替"是否在线"的布尔值：每次网络检测只更新状态，
+只有状态真正变化时才向订阅者推送带时间戳的状态迁移事件。
+界面、日志和守护进程订阅迁移事件后，只需在状态变化时工作，而不是每次检测都处理一遍。
+
+状态：
+- ONLINE: 已登录，可以访问外网
+- CAPTIVE: 链路正常但未登录（访问外网被重定向到认证页）
+- NO_LINK: 没有可用链路或路由（网线断开、WiFi 未连接等）
+- PORTAL_DOWN: 链路正常但认证服务器不可达，此时无法登录
+- LOGGING_IN: 正在登录
+- UNKNOWN: 尚未检测（初始状态）
+
+依赖项：
+- threading, time: 线程安全与时间戳
+- src.utils.logger: 记录订阅者回调中的异常
+
+使用示例：
+```python
+from src.core.ConnectivityState import ConnectivityState, ConnectivityStateMachine
+
+machine = ConnectivityStateMachine()
+unsubscribe = machine.subscribe(lambda t: print(t.previous, "->", t.current, t.timestamp))
+machine.update(ConnectivityState.CAPTIVE, "重定向到认证页")   # 触发一次迁移事件
+machine.update(ConnectivityState.CAPTIVE, "重定向到认证页")   # 状态未变化，不触发
+unsubscribe()
+```
+"""
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+from src.utils.logger import logger
+
+
+class ConnectivityState(Enum):
+    """网络连通性状态"""
+    UNKNOWN = 'unknown'
+    ONLINE = 'online'
+    CAPTIVE = 'captive'
+    NO_LINK = 'no_link'
+    PORTAL_DOWN = 'portal_down'
+    LOGGING_IN = 'logging_in'
+
+    @property
+    def label(self):
+        """状态的中文名称，用于日志与界面显示"""
+        return STATE_LABELS[self]
+
+
+STATE_LABELS = {
+    ConnectivityState.UNKNOWN: '未知',
+    ConnectivityState.ONLINE: '在线',
+    ConnectivityState.CAPTIVE: '未登录',
+    ConnectivityState.NO_LINK: '无网络连接',
+    ConnectivityState.PORTAL_DOWN: '认证服务器不可达',
+    ConnectivityState.LOGGING_IN: '登录中',
+}
+
+
+@dataclass(frozen=True)
+class StateTransition:
+    """
+    一次状态迁移事件。
+
+    属性:
+        previous (ConnectivityState): 迁移前的状态
+        current (ConnectivityState): 迁移后的状态
+        timestamp (float): 迁移发生的时间（time.time()，Unix 时间戳）
+        duration (float): 在迁移前状态停留的时长(秒)
+        detail (str): 迁移原因说明，如获胜探测器的结论
+    """
+    previous: ConnectivityState
+    current: ConnectivityState
+    timestamp: float
+    duration: float
+    detail: str = ""
+
+
+class ConnectivityStateMachine:
+    """
+    线程安全的连通性状态机。
+
+    订阅者回调在调用 update 的线程中同步执行（不持有锁），
+    需要在界面线程处理的订阅者应自行转发（如通过Qt信号）。
+
+    属性:
+        state (ConnectivityState): 当前状态
+        since (float): 进入当前状态的时间（time.time()）
+        transitions (int): 累计迁移次数
+    """
+
+    def __init__(self):
+        self.state = ConnectivityState.UNKNOWN
+        self.since = time.time()
+        self.transitions = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """
+        订阅状态迁移事件。
+
+        参数:
+            callback (callable): 回调函数，参数为 StateTransition
+
+        返回:
+            callable: 调用即可取消订阅
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def update(self, state, detail=""):
+        """
+        更新当前状态，状态变化时通知所有订阅者。
+
+        参数:
+            state (ConnectivityState): 新状态
+            detail (str, optional): 迁移原因说明
+
+        返回:
+            StateTransition or None: 发生迁移时返回迁移事件，状态未变化时返回 None
+        """
+        with self._lock:
+            if state == self.state:
+                return None
+            now = time.time()
+            transition = StateTransition(self.state, state, now, now - self.since, detail)
+            self.state = state
+            self.since = now
+            self.transitions += 1
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(transition)
+            except Exception as e:
+                logger.error(f"连通性状态订阅者处理失败: {str(e)}")
+        return transition
+
+    @property
+    def is_online(self):
+        return self.state == ConnectivityState.ONLINE
+
+    def snapshot(self):
+        """
+        返回:
+            dict: 包含 'state'、'label'、'since'、'duration'、'transitions' 的状态快照
+        """
+        with self._lock:
+            return {
+                'state': self.state.value,
+                'label': self.state.label,
+                'since': self.since,
+                'duration': time.time() - self.since,
+                'transitions': self.transitions,
+            }
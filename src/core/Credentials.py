@@ -4,16 +4,23 @@
 
 该模块提供了安全的凭证存储与管理功能，支持密码的加密存储和解密访问。
 主要功能：
-- AES ECB模式对称加密，确保敏感信息安全存储
-- 配置文件自动创建和持久化功能
+- AES ECB模式对称加密，确保敏感信息安全存储；每个密钥只准备一次加密器，解密失败的结果会被缓存
+- 批量加解密（CredentialCipher.encrypt_many/decrypt_many），一次调用处理整个账号名册的密码
+- 多账号库（credentials.accounts）：按用户名索引，密码按需解密，记录各账号的登录健康状况并选出最适合登录的账号
+- 配置文件（JSON，只解析不执行代码）自动创建和持久化功能，首次启动时自动迁移旧版 local_credentials.py
 - 凭证缓存机制，提高频繁访问性能
+- 批量修改（credentials.batch()）与延迟合并写入：连续多次修改只写一次文件
+- 原子写入：先写临时文件并 fsync，再替换原文件，写入中途崩溃不会留下半截配置
+- 热重载：reload() 只在配置文件被外部修改后才重新解析，只更新变化的配置项并通知订阅者（见 src.core.ConfigWatcher）
 - 全局单例模式设计，确保系统中凭证管理的一致性
 
 依赖项：
 - Crypto (pycryptodome)：提供AES加密算法支持
 - base64：用于编码解码二进制数据
-- importlib：支持动态导入配置模块
-- os, re：文件操作和正则表达式处理
+- collections：解密结果缓存（LRU）
+- ast, json：配置文件为 JSON 格式，只解析不执行；旧版 Python 格式配置文件通过语法树解析后迁移
+- os, time：文件操作；账号登录时间记录
+- atexit, threading, contextlib, copy：延迟写入的后台定时器、退出前写入、批量修改上下文与已保存配置的快照
 - src.utils.logger：日志记录
 - src.core.TaskScheduler：任务调度器，用于获取配置文件路径
 
@@ -26,18 +33,39 @@ from src.core.Credentials import credentials
 username = credentials.get("username")
 password = credentials.get("password")  # 自动解密
 
-# 设置凭证
+# 设置凭证（修改后约 FLUSH_DELAY 秒在后台写入文件，连续修改合并为一次写入）
 credentials.set("username", "new_username")
 credentials.set("password", "new_password")  # 自动加密存储
 
-# 保存配置（通常不需要手动调用，set方法会自动触发）
-credentials.save_to_file()
+# 批量修改：退出 with 块时只写一次文件
+with credentials.batch():
+    credentials.set("username", "new_username")
+    credentials.set("password", "new_password")
+
+# 立即写入尚未保存的修改（通常不需要手动调用，程序退出前也会自动写入）
+credentials.flush()
+
+# 订阅配置文件被外部修改的事件，回调参数为 {配置项: 新值}（密码等敏感配置项的值为 SECRET_MASK）
+unsubscribe = credentials.subscribe(lambda changes: print(changes))
+credentials.reload()  # 文件未变化时只执行一次 os.stat
+
+# 多账号库：添加账号、选出最适合登录的账号、记录登录结果
+credentials.accounts.add("user001", "pass001", bound_mac="00-11-22-33-44-55")
+username = credentials.accounts.pick_healthiest(mac="00:11:22:33:44:55")
+password = credentials.accounts.password(username)  # 首次使用时解密
+credentials.accounts.record_result(username, success=True)
 ```
 """
+import ast
+import atexit
+import copy
+import json
 import os
-import re
 import base64
-import importlib.util
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from Crypto.Random import get_random_bytes
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad, pad
@@ -48,6 +76,405 @@ from src.core.TaskScheduler import TaskScheduler
 # 全局CREDENTIALS变量，用于存储所有凭证信息
 CREDENTIALS = {}
 
+# 新建配置文件时写入的默认配置
+DEFAULT_CREDENTIALS = {
+    'ENCRYPTED_KEY': '',           # 加密后的AES密钥(Base64编码)，用于密码加密
+    'ENCRYPTED_PASSWORD': '',      # 加密后的用户密码
+    'USERNAME': '',                # 登录用户名(明文)
+    'BASE_URL': 'http://1.1.1.1',  # 校园网基础URL
+    'AUTH_DOMAIN': 'auth.gxstnu.edu.cn',  # 认证服务器域名
+    'AUTH_SCHEME': 'https',        # 认证服务器协议，连接本地模拟认证服务器调试时改为http
+    'MAX_RETRY': 4,                # 网络请求最大重试次数
+    'RETRY_INTERVAL': 1.5,         # 重试间隔时间(秒)
+    'TEST_URL': 'http://www.bilibili.com',  # 网络连通性测试URL
+    'MAIN_LOCK': True,             # 主界面是否锁定
+    'UPDATE_ON_START': True,       # 启动时是否检查更新
+    'AUTH_CACHE_TTL': 300,         # 认证参数(IP/MAC)缓存有效期(秒)，0表示不缓存
+    # 网络连通性探测使用的HTTP 204接口列表
+    'PROBE_204_URLS': ['http://connect.rom.miui.com/generate_204', 'http://wifi.vivo.com.cn/generate_204'],
+    'PROBE_MODE': 'head',          # TEST_URL探测模式，head(HEAD请求)或stream(读到响应头即关闭的GET请求)
+    'METRICS_PORT': 0,             # 主程序在本机此端口提供 /metrics 运行指标端点(Prometheus格式)，0表示不启用
+    'ACCOUNTS': [],                # 多账号库（见 AccountVault），密码加密保存
+}
+
+# 敏感配置项：配置变化事件中只给出 SECRET_MASK，需要新值的订阅者通过 credentials.get_credentials() 等接口读取
+SECRET_KEYS = frozenset({'ENCRYPTED_KEY', 'ENCRYPTED_PASSWORD', 'PASSWORD', 'ACCOUNTS'})
+SECRET_MASK = '******'
+
+class CredentialCipher:
+    """
+    AES ECB 加解密器（PKCS#7 填充，密文以 Base64 文本保存）。
+
+    每个密钥只创建一次加密器、之后反复使用（界面、任务线程与配置监视线程共享，调用加密器时持有锁）；解密结果（包括失败）按密文缓存，
+    同一个错误的密文不会被反复解码和解密。批量接口把所有数据拼接后只调用一次 AES，适合大量账号的密码。
+
+    属性:
+        key (bytes): AES密钥
+        CACHE_SIZE (int): 解密结果缓存的最大条目数
+    """
+    CACHE_SIZE = 4096
+
+    def __init__(self, key):
+        """
+        参数:
+            key (bytes): 16、24 或 32 字节的AES密钥
+        """
+        self.key = key
+        self._cipher = AES.new(key, AES.MODE_ECB)
+        # pycryptodome 的加密器对象不保证线程安全，所有 encrypt/decrypt 调用都在此锁内进行
+        self._cipher_lock = threading.Lock()
+        # 密文 -> 明文，解密失败时为 None
+        self._plain_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encrypt(self, data):
+        """
+        加密字符串。
+
+        参数:
+            data (str): 待加密的原始字符串
+
+        返回:
+            str: Base64编码的加密结果
+        """
+        # ✅ 确保加密时使用 pad
+        padded = pad(data.encode('utf-8'), AES.block_size)
+        with self._cipher_lock:
+            encrypted_raw = self._cipher.encrypt(padded)
+        return base64.b64encode(encrypted_raw).decode()
+
+    def decrypt(self, encrypted_data):
+        """
+        解密字符串，结果（包括失败）会被缓存。
+
+        参数:
+            encrypted_data (str): Base64编码的加密数据
+
+        返回:
+            str: 解密后的原始字符串
+
+        异常:
+            ValueError: 密文无法解码、长度不正确或填充错误（密钥不匹配）
+        """
+        with self._lock:
+            if encrypted_data in self._plain_cache:
+                self._plain_cache.move_to_end(encrypted_data)
+                plain = self._plain_cache[encrypted_data]
+                if plain is None:
+                    raise ValueError("Invalid data padding")
+                return plain
+        try:
+            plain = self._decrypt_raw(base64.b64decode(encrypted_data))
+        except ValueError:
+            plain = None
+        self._remember(encrypted_data, plain)
+        if plain is None:
+            # 🛠️ 明确处理填充错误
+            raise ValueError("Invalid data padding")
+        return plain
+
+    def _decrypt_raw(self, raw):
+        with self._cipher_lock:
+            decrypted = self._cipher.decrypt(raw)
+        return unpad(decrypted, AES.block_size).decode('utf-8')
+
+    def _remember(self, encrypted_data, plain):
+        with self._lock:
+            self._plain_cache[encrypted_data] = plain
+            if len(self._plain_cache) > self.CACHE_SIZE:
+                self._plain_cache.popitem(last=False)
+
+    def encrypt_many(self, values):
+        """
+        批量加密，所有数据只调用一次 AES。
+
+        参数:
+            values (iterable): 待加密的原始字符串
+
+        返回:
+            list: 与输入顺序一致的 Base64 加密结果
+        """
+        padded = [pad(value.encode('utf-8'), AES.block_size) for value in values]
+        with self._cipher_lock:
+            encrypted = self._cipher.encrypt(b''.join(padded))
+        results = []
+        offset = 0
+        for block in padded:
+            results.append(base64.b64encode(encrypted[offset:offset + len(block)]).decode())
+            offset += len(block)
+        return results
+
+    def decrypt_many(self, values, default=None):
+        """
+        批量解密，未缓存的密文拼接后只调用一次 AES；单个密文解密失败不影响其他密文。
+
+        参数:
+            values (iterable): Base64编码的加密数据
+            default (Any, optional): 解密失败时的返回值
+
+        返回:
+            list: 与输入顺序一致的解密结果
+        """
+        values = list(values)
+        results = [default] * len(values)
+        pending = []  # (下标, 密文, 原始字节)
+        with self._lock:
+            cache = self._plain_cache
+            for index, value in enumerate(values):
+                if value in cache:
+                    plain = cache[value]
+                    if plain is not None:
+                        results[index] = plain
+                    continue
+                pending.append((index, value))
+        raws = []
+        for index, value in pending:
+            try:
+                raw = base64.b64decode(value)
+            except ValueError:
+                raw = b''
+            # 长度不是分组大小整数倍的密文无法解密，不参与拼接
+            raws.append(raw if raw and len(raw) % AES.block_size == 0 else None)
+        joined = b''.join(raw for raw in raws if raw is not None)
+        with self._cipher_lock:
+            decrypted = self._cipher.decrypt(joined)
+        offset = 0
+        for (index, value), raw in zip(pending, raws):
+            plain = None
+            if raw is not None:
+                try:
+                    plain = unpad(decrypted[offset:offset + len(raw)], AES.block_size).decode('utf-8')
+                except ValueError:
+                    pass
+                offset += len(raw)
+            self._remember(value, plain)
+            if plain is not None:
+                results[index] = plain
+        return results
+
+
+class AccountVault:
+    """
+    多账号库：在配置文件的 ACCOUNTS 列表中保存多个账号（密码加密）及其健康状况，供轮换使用。
+
+    每个账号是一个字典：
+        username (str): 用户名
+        encrypted_password (str): 加密后的密码
+        bound_mac (str): 绑定的本机 MAC 地址，为空表示可在任意机器上使用
+        successes / failures (int): 累计登录成功、失败次数
+        consecutive_failures (int): 连续失败次数，成功后清零
+        last_success / last_failure (float or None): 最近一次成功、失败的时间戳
+
+    按用户名建立内存索引，查找为 O(1)；密码在第一次使用时才解密（解密结果由 CredentialCipher 缓存）。
+    配置文件被外部修改（热重载）后索引会自动重建。修改通过 CredentialManager 的延迟写入持久化。
+
+    属性:
+        FAILURE_THRESHOLD (int): 连续失败多少次后进入冷却期
+        FAILURE_COOLDOWN (float): 冷却期(秒)，期间只有在没有其他可用账号时才会被选中
+    """
+    FAILURE_THRESHOLD = 3
+    FAILURE_COOLDOWN = 600
+
+    def __init__(self, manager):
+        """
+        参数:
+            manager (CredentialManager): 保存账号库的凭证管理器
+        """
+        self._manager = manager
+        self._index = {}
+        self._source = None
+
+    def _entries(self):
+        """返回当前的 ACCOUNTS 列表，列表被替换（如热重载）时重建用户名索引，调用方需持有管理器的锁"""
+        entries = CREDENTIALS.get('ACCOUNTS')
+        if entries is None:
+            entries = CREDENTIALS['ACCOUNTS'] = []
+        if entries is not self._source:
+            self._index = {entry['username']: entry for entry in entries}
+            self._source = entries
+        return entries
+
+    def _entry(self, username):
+        self._entries()
+        return self._index.get(username)
+
+    def __len__(self):
+        with self._manager._lock:
+            return len(self._entries())
+
+    def __contains__(self, username):
+        with self._manager._lock:
+            return self._entry(username) is not None
+
+    def usernames(self):
+        """
+        返回:
+            list: 账号库中的全部用户名
+        """
+        with self._manager._lock:
+            return [entry['username'] for entry in self._entries()]
+
+    def get(self, username):
+        """
+        获取账号的元数据（不含密码）。
+
+        参数:
+            username (str): 用户名
+
+        返回:
+            dict or None: 账号元数据的副本，账号不存在时返回 None
+        """
+        with self._manager._lock:
+            entry = self._entry(username)
+            if entry is None:
+                return None
+            return {key: value for key, value in entry.items() if key != 'encrypted_password'}
+
+    def password(self, username):
+        """
+        获取账号的密码（首次使用时解密）。
+
+        参数:
+            username (str): 用户名
+
+        返回:
+            str or None: 密码，账号不存在或解密失败时返回 None
+        """
+        with self._manager._lock:
+            entry = self._entry(username)
+            encrypted = entry.get('encrypted_password') if entry else None
+        if not encrypted:
+            return None
+        try:
+            return self._manager.cipher.decrypt(encrypted)
+        except ValueError:
+            logger.error(f"账号 {username} 的密码解密失败")
+            return None
+
+    def add(self, username, password, bound_mac=''):
+        """
+        添加账号，已存在时更新密码和绑定的 MAC 地址（保留健康状况）。
+
+        参数:
+            username (str): 用户名
+            password (str): 密码
+            bound_mac (str, optional): 绑定的本机 MAC 地址
+        """
+        self.add_many([(username, password, bound_mac)])
+
+    def add_many(self, accounts):
+        """
+        批量添加账号，所有密码只调用一次加密。
+
+        参数:
+            accounts (iterable): (用户名, 密码) 或 (用户名, 密码, 绑定MAC) 元组
+        """
+        accounts = [tuple(account) + ('',) * (3 - len(account)) for account in accounts]
+        encrypted = self._manager.cipher.encrypt_many(password for _, password, _ in accounts)
+        with self._manager._lock:
+            entries = self._entries()
+            for (username, _, bound_mac), encrypted_password in zip(accounts, encrypted):
+                entry = self._index.get(username)
+                if entry is None:
+                    entry = {'username': username, 'successes': 0, 'failures': 0, 'consecutive_failures': 0,
+                             'last_success': None, 'last_failure': None}
+                    entries.append(entry)
+                    self._index[username] = entry
+                entry['encrypted_password'] = encrypted_password
+                entry['bound_mac'] = bound_mac or ''
+            self._manager._mark_dirty()
+
+    def remove(self, username):
+        """
+        删除账号。
+
+        参数:
+            username (str): 用户名
+
+        返回:
+            bool: 账号存在并已删除时返回 True
+        """
+        with self._manager._lock:
+            entry = self._entry(username)
+            if entry is None:
+                return False
+            self._entries().remove(entry)
+            del self._index[username]
+            self._manager._mark_dirty()
+            return True
+
+    def record_result(self, username, success, timestamp=None):
+        """
+        记录一次登录结果，更新账号的健康状况。不在账号库中的用户名被忽略。
+
+        参数:
+            username (str): 用户名
+            success (bool): 登录是否成功
+            timestamp (float, optional): 登录时间，默认为当前时间
+
+        返回:
+            bool: 是否记录（账号在账号库中）
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._manager._lock:
+            entry = self._entry(username)
+            if entry is None:
+                return False
+            if success:
+                entry['successes'] = entry.get('successes', 0) + 1
+                entry['consecutive_failures'] = 0
+                entry['last_success'] = timestamp
+            else:
+                entry['failures'] = entry.get('failures', 0) + 1
+                entry['consecutive_failures'] = entry.get('consecutive_failures', 0) + 1
+                entry['last_failure'] = timestamp
+            self._manager._mark_dirty()
+            return True
+
+    @staticmethod
+    def _normalize_mac(mac):
+        return ''.join(char for char in (mac or '').lower() if char in '0123456789abcdef')
+
+    def pick_healthiest(self, mac=None, exclude=(), now=None):
+        """
+        选出当前最适合登录的账号。
+
+        候选账号为未绑定 MAC 的账号，以及绑定到 mac 的账号（mac 未知时只在没有未绑定账号时才考虑已绑定的账号）。
+        排序依次为：不在冷却期优先、连续失败次数少优先、最近成功时间晚优先、累计失败率低优先。
+
+        参数:
+            mac (str, optional): 本机 MAC 地址（任意分隔符格式）
+            exclude (iterable): 不参与选择的用户名（如本轮已尝试过的账号）
+            now (float, optional): 当前时间，默认为 time.time()
+
+        返回:
+            str or None: 用户名，没有可用账号时返回 None
+        """
+        now = time.time() if now is None else now
+        mac = self._normalize_mac(mac)
+        exclude = set(exclude)
+        with self._manager._lock:
+            candidates = [entry for entry in self._entries() if entry['username'] not in exclude]
+            unbound = [entry for entry in candidates if not entry.get('bound_mac')]
+            if mac:
+                candidates = unbound + [entry for entry in candidates
+                                        if entry.get('bound_mac') and self._normalize_mac(entry['bound_mac']) == mac]
+            elif unbound:
+                candidates = unbound
+            if not candidates:
+                return None
+
+            def health(entry):
+                consecutive = entry.get('consecutive_failures', 0)
+                cooling = (consecutive >= self.FAILURE_THRESHOLD
+                           and now - (entry.get('last_failure') or 0) < self.FAILURE_COOLDOWN)
+                attempts = entry.get('successes', 0) + entry.get('failures', 0)
+                failure_rate = entry.get('failures', 0) / attempts if attempts else 0.0
+                return cooling, consecutive, -(entry.get('last_success') or 0), failure_rate
+
+            return min(candidates, key=health)['username']
+
+
 class CredentialManager:
     """
     凭证管理类，用于处理敏感信息的加密存储与访问
@@ -65,20 +492,39 @@ class CredentialManager:
         >>> credentials.set("password", "new_pass")  # 自动加密存储
         >>> credentials.set("custom_key", "value")  # 设置自定义键值对
 
-    4. 保存配置：
-       >>> credentials.save_to_file()  # 持久化到本地配置文件
+    4. 批量修改（退出时只写一次文件）：
+       >>> with credentials.batch():
+       >>>     credentials.set("username", "new_user")
+       >>>     credentials.set("password", "new_pass")
+
+    5. 保存配置：
+       >>> credentials.flush()  # 立即写入尚未保存的修改
+
+    6. 重新加载被外部修改的配置文件：
+       >>> credentials.subscribe(lambda changes: print(changes))
+       >>> credentials.reload()  # 返回并通知变化的配置项
 
     注意事项：
-    - 首次运行时会自动创建 config/local_credentials.py 配置文件
+    - 首次运行时会自动创建 config/local_credentials.json 配置文件（JSON 格式，各配置项见 DEFAULT_CREDENTIALS）；
+      若存在旧版 config/local_credentials.py，则只解析（不执行）其中的 CREDENTIALS 并转换为 JSON
     - 密码会自动加密存储，明文仅存在于内存中
-    - 修改凭证后自动调用 save_to_file() 持久化
+    - 修改凭证后 FLUSH_DELAY 秒内的其他修改会合并，然后在后台线程中写入一次；程序退出前会写入未保存的修改
+    - 写入时先写临时文件并 fsync，再替换原文件
+    - reload() 以文件的修改时间和大小判断是否被外部修改，只有变化的配置项会更新并清除对应缓存；
+      内存中尚未写入的修改不会被覆盖（除非外部修改了同一配置项）
     
     属性：
     - _cache: 内部缓存字典，用于存储已解密的凭证值，提高访问效率
     - KEY: AES加密密钥（二进制格式），用于加解密敏感数据
+    - cipher: 使用 KEY 的 CredentialCipher，可用于批量加解密
+    - accounts: 多账号库 AccountVault
     - task_folder: 任务文件夹路径，从TaskScheduler获取
     - CREDENTIALS_file_path: 凭证配置文件的完整路径
+    - FLUSH_DELAY: 修改后延迟写入的时间(秒)，期间的修改合并为一次写入
+    - writes: 实际写入文件的次数
+    - loaded_signature: 最近一次读取或写入时配置文件的 (修改时间, 大小)
     """
+    FLUSH_DELAY = 0.5
 
     def __init__(self):
         """
@@ -89,36 +535,41 @@ class CredentialManager:
         """
         self._cache = {}  # 凭证缓存字典，存储解密后的凭证值
         self.KEY = None   # AES加密密钥
+        self.cipher = None  # 使用 KEY 的加解密器
+        self.accounts = AccountVault(self)  # 多账号库
+        self.writes = 0   # 实际写入文件的次数
+        # 延迟写入状态：是否有未保存的修改、批量修改的嵌套层数、后台写入定时器
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_timer = None
+        # 热重载状态：最近一次读取或写入时文件的 (修改时间, 大小) 与内容快照，以及配置变化的订阅者
+        self.loaded_signature = None
+        self._persisted = {}
+        self._subscribers = []
         self.task_folder = TaskScheduler().task_folder  # 任务文件夹路径
         self.CREDENTIALS_file_path = self._get_config_path()  # 配置文件路径
         self._load_credentials()  # 加载凭证配置
         self._load_key()  # 加载加密密钥
+        atexit.register(self.flush)  # 退出前写入尚未保存的修改
     
     def _load_credentials(self):
         """
-        从配置文件中动态加载CREDENTIALS配置
-        通过importlib模块动态导入配置文件，避免硬编码路径依赖
-        若配置文件不存在或格式错误，会记录日志并抛出异常
+        从 JSON 配置文件中加载CREDENTIALS配置（只解析数据，不执行代码）
+        配置文件不存在时，优先迁移旧版 Python 格式配置文件，否则创建默认配置
+        若配置文件格式错误，会记录日志并抛出异常
         """
         global CREDENTIALS
-        
-        # 检查配置文件是否存在
-        if not os.path.exists(self.CREDENTIALS_file_path):
-            logger.info("未找到配置文件，正在创建默认配置...")
-            self.create_local_credentials_file()
-        
-        # 使用importlib动态导入模块
+
         try:
-            spec = importlib.util.spec_from_file_location("local_credentials", self.CREDENTIALS_file_path)
-            local_credentials = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(local_credentials)
+            # 检查配置文件是否存在
+            if not os.path.exists(self.CREDENTIALS_file_path) and not self.migrate_legacy_file():
+                logger.info("未找到配置文件，正在创建默认配置...")
+                self.create_local_credentials_file()
             # 更新全局CREDENTIALS变量
-            if hasattr(local_credentials, 'CREDENTIALS'):
-                CREDENTIALS = local_credentials.CREDENTIALS
-            else:
-                logger.error("配置文件中未找到CREDENTIALS变量")
-                # 如果没有找到，创建空的CREDENTIALS
-                raise ValueError("配置文件中未找到CREDENTIALS变量")
+            self.loaded_signature = self.file_signature()
+            CREDENTIALS = self.read_config_file(self.CREDENTIALS_file_path)
+            self._persisted = copy.deepcopy(CREDENTIALS)
         except Exception as e:
             logger.error(f"加载配置文件失败: {str(e)}")
             raise ValueError(f"加载配置文件失败: {str(e)}")
@@ -137,9 +588,14 @@ class CredentialManager:
             CREDENTIALS['ENCRYPTED_KEY'] = key_b64
             self.save_to_file()
             logger.info("✅ 密钥已生成并写入配置文件")
-            self.KEY = base64.b64decode(key_b64)
+            self._set_key(base64.b64decode(key_b64))
         else:
-            self.KEY = base64.b64decode(encrypted_key)
+            self._set_key(base64.b64decode(encrypted_key))
+
+    def _set_key(self, key):
+        """设置AES密钥并准备对应的加解密器"""
+        self.KEY = key
+        self.cipher = CredentialCipher(key)
 
     def _get_config_path(self):
         """
@@ -149,6 +605,13 @@ class CredentialManager:
             str: 配置文件的完整路径
         """
         
+        return os.path.join(self.task_folder, 'config', 'local_credentials.json')
+
+    def _get_legacy_config_path(self):
+        """
+        返回:
+            str: 旧版 Python 格式配置文件的完整路径
+        """
         return os.path.join(self.task_folder, 'config', 'local_credentials.py')
 
     def _encrypt(self, data):
@@ -161,11 +624,7 @@ class CredentialManager:
         返回:
             str: Base64编码的加密结果
         """
-        cipher = AES.new(self.KEY, AES.MODE_ECB)
-        # ✅ 确保加密时使用 pad
-        encrypted_raw = cipher.encrypt(pad(data.encode('utf-8'), AES.block_size))
-        encrypted_data = base64.b64encode(encrypted_raw).decode()
-        return encrypted_data
+        return self.cipher.encrypt(data)
 
     def _decrypt(self, encrypted_data):
         """
@@ -176,15 +635,11 @@ class CredentialManager:
 
         返回:
             str: 解密后的原始字符串数据
+
+        异常:
+            ValueError: 密文无效或与密钥不匹配（失败结果会被缓存，再次解密同一密文时立即失败）
         """
-        try:
-            cipher = AES.new(self.KEY, AES.MODE_ECB)
-            decrypted_padded = cipher.decrypt(base64.b64decode(encrypted_data))
-            decrypted_data = unpad(decrypted_padded, AES.block_size)
-            return decrypted_data.decode('utf-8')
-        except ValueError as e:
-            # 🛠️ 明确处理填充错误
-            raise ValueError("Invalid data padding") from e
+        return self.cipher.decrypt(encrypted_data)
 
     def get(self, key:str, default=None):
         """
@@ -222,6 +677,15 @@ class CredentialManager:
             logger.error(f"获取凭证失败，key={key}: {str(e)}")
             return default
 
+    def get_credentials(self):
+        """
+        获取当前登录账号的用户名和密码（密码自动解密）
+
+        返回:
+            tuple: (用户名, 密码)，未配置时对应项为 None
+        """
+        return self.get('USERNAME'), self.get('PASSWORD')
+
     def set(self, key:str, value:any):
         """
         设置凭证项的值（敏感数据自动处理加密存储）
@@ -232,103 +696,274 @@ class CredentialManager:
         """
         try:
             key_upper = key.upper()
-            if key_upper == 'PASSWORD':
-                CREDENTIALS['ENCRYPTED_PASSWORD'] = self._encrypt(value)
-            else:
-                CREDENTIALS[key_upper] = value
-            self.save_to_file()
-            self._cache[key_upper] = value
+            with self._lock:
+                if key_upper == 'PASSWORD':
+                    CREDENTIALS['ENCRYPTED_PASSWORD'] = self._encrypt(value)
+                else:
+                    CREDENTIALS[key_upper] = value
+                self._cache[key_upper] = value
+                self._mark_dirty()
         except Exception as e:
             logger.error(f"设置凭证失败，key={key}: {str(e)}")
             raise ValueError(f"设置凭证失败，key={key}: {str(e)}")
 
+    @contextmanager
+    def batch(self):
+        """
+        批量修改凭证：with 块内的 set() 只修改内存，退出最外层 with 块时写入一次文件。
+        块内抛出异常时同样会写入已完成的修改。
+
+        示例:
+            >>> with credentials.batch():
+            >>>     credentials.set("username", "user123")
+            >>>     credentials.set("password", "pass123")
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush()
+
+    def _mark_dirty(self):
+        """记录有未保存的修改；不在批量修改中时安排 FLUSH_DELAY 秒后在后台写入"""
+        with self._lock:
+            self._dirty = True
+            if self._batch_depth or self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """
+        立即写入尚未保存的修改，没有修改时不做任何事。
+
+        返回:
+            bool: 是否写入了文件
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return False
+            try:
+                self.save_to_file()
+            except Exception as e:
+                logger.error(f"保存配置文件失败: {str(e)}")
+                return False
+            return True
+
     def save_to_file(self):
         """
-        将当前配置持久化到文件（保持原有文件结构）
-        保留文件中的注释和格式，仅更新CREDENTIALS字典中的键值对
+        将当前配置以 JSON 格式持久化到文件。
+        先写入同目录的临时文件并 fsync，再原子地替换原文件。
         """
-        # 确保配置目录存在
-        os.makedirs(os.path.dirname(self.CREDENTIALS_file_path), exist_ok=True)
-        with open(self.CREDENTIALS_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        keys_to_save = set(CREDENTIALS.keys())
-        new_lines = []
-        inside_credentials = False
-
-        for line in lines:
-            if line.strip().startswith('CREDENTIALS = {'):
-                inside_credentials = True
-                new_lines.append(line)
-                continue
-            elif inside_credentials and ':' in line:
-                # 更新已有键值对
-                match = re.match(r"\s*'([^']+)'\s*:", line)  # 捕获组 ([^']+) 提取单引号内的键名内容
-                if match and match.group(1) in CREDENTIALS:
-                    key = match.group(1)
-                    val = CREDENTIALS[key]
-                    new_lines.append(f"    '{key}': '{val}',\n" if isinstance(val, str) else f"    '{key}': {val},\n")
-                    keys_to_save.discard(key)
+        with self._lock:
+            self._write_atomic(self._dump(CREDENTIALS))
+            self._persisted = copy.deepcopy(CREDENTIALS)
+            self.loaded_signature = self.file_signature()
+            self._dirty = False
+            self.writes += 1
+
+    def file_signature(self):
+        """
+        返回:
+            tuple or None: 配置文件的 (修改时间(纳秒), 大小)，文件不存在时返回 None
+        """
+        try:
+            stat = os.stat(self.CREDENTIALS_file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force=False):
+        """
+        重新加载被外部修改（如手工编辑）的配置文件，只更新变化的配置项并通知订阅者。
+
+        文件的修改时间和大小与最近一次读取或写入时相同则不解析文件，可以高频调用。
+        只有与上次读取或写入的内容相比发生变化的配置项才会更新并清除对应缓存，
+        内存中其他尚未写入的修改保持不变。密码或密钥变化时，变化事件中包含 'PASSWORD'。
+        SECRET_KEYS 中的配置项（密码、密钥、多账号库）在返回值和变化事件中的值为 SECRET_MASK，
+        需要新密码的订阅者应调用 get_credentials()。
+
+        参数:
+            force (bool): 为 True 时即使文件看起来没有变化也重新解析
+
+        返回:
+            dict: 变化的配置项到新值的映射（被删除的配置项值为 None，敏感配置项值为 SECRET_MASK），没有变化时为空字典
+        """
+        with self._lock:
+            signature = self.file_signature()
+            if signature is None or (not force and signature == self.loaded_signature):
+                return {}
+            # 无论解析是否成功都记录此版本，格式错误的文件只报告一次，再次修改后才重新解析
+            self.loaded_signature = signature
+            try:
+                loaded = self.read_config_file(self.CREDENTIALS_file_path)
+            except Exception as e:
+                logger.error(f"重新加载配置文件失败，保留当前配置: {str(e)}")
+                return {}
+            missing = object()
+            changes = {}
+            for key in set(loaded) | set(self._persisted):
+                value = loaded.get(key, missing)
+                if value == self._persisted.get(key, missing):
+                    continue
+                if value is missing:
+                    CREDENTIALS.pop(key, None)
+                    value = None
                 else:
-                    new_lines.append(line)
-            elif inside_credentials and line.strip() == '}':
-                # 插入剩余的新键值对并闭合字典
-                for key in sorted(keys_to_save):
-                    val = CREDENTIALS[key]
-                    new_lines.append(f"    '{key}': '{val}',\n" if isinstance(val, str) else f"    '{key}': {val},\n")
-                new_lines.append(line)
-                inside_credentials = False
-            else:
-                new_lines.append(line)
+                    CREDENTIALS[key] = value
+                self._cache.pop(key, None)
+                changes[key] = value
+            self._persisted = copy.deepcopy(loaded)
+            if 'ENCRYPTED_KEY' in changes and changes['ENCRYPTED_KEY']:
+                self._set_key(base64.b64decode(changes['ENCRYPTED_KEY']))
+            if 'ENCRYPTED_KEY' in changes or 'ENCRYPTED_PASSWORD' in changes:
+                self._cache.pop('PASSWORD', None)
+                changes['PASSWORD'] = SECRET_MASK
+            for key in SECRET_KEYS.intersection(changes):
+                changes[key] = SECRET_MASK
+        if changes:
+            logger.info(f"配置文件已修改，重新加载: {', '.join(sorted(key for key in changes if 'ENCRYPTED' not in key))}")
+            self._publish(changes)
+        return changes
+
+    def subscribe(self, callback):
+        """
+        订阅配置变化事件，reload() 发现配置项变化时调用。
 
-        with open(self.CREDENTIALS_file_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
+        参数:
+            callback (callable): 回调函数，参数为 {配置项: 新值} 字典，在调用 reload() 的线程中执行；
+                SECRET_KEYS 中的配置项值为 SECRET_MASK，需要新密码时调用 get_credentials()
 
-    def create_local_credentials_file(self):
+        返回:
+            callable: 调用即可取消订阅
         """
-        创建默认配置文件（仅当文件不存在时）
-        包含初始密钥、空凭证和默认配置参数
-        创建的文件包含详细注释，说明各配置项的用途
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _publish(self, changes):
+        """通知所有订阅者，单个订阅者的异常只记录日志"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(dict(changes))
+            except Exception as e:
+                logger.error(f"处理配置变化事件失败: {str(e)}")
+
+    def _write_atomic(self, content):
+        """
+        原子地写入配置文件：写入临时文件并 fsync 后替换原文件，替换前的任何时刻崩溃都只会留下完整的旧文件。
+
+        参数:
+            content (str): 文件内容
         """
         # 确保配置目录存在
         os.makedirs(os.path.dirname(self.CREDENTIALS_file_path), exist_ok=True)
+        temp_path = f"{self.CREDENTIALS_file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.CREDENTIALS_file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
-        default_content = '''
-"""
-系统配置说明：
-1. ENCRYPTED_KEY: 加密后的AES密钥(Base64编码)，用于密码加密
-2. ENCRYPTED_PASSWORD: 加密后的用户密码
-3. USERNAME: 登录用户名(明文)
-4. BASE_URL: 校园网基础URL
-5. AUTH_DOMAIN: 认证服务器域名
-6. MAX_RETRY: 网络请求最大重试次数
-7. RETRY_INTERVAL: 重试间隔时间(秒)
-8. TEST_URL: 网络连通性测试URL
-9. MAIN_LOCK: 主界面是否锁定
-10.UPDATE_ON_START：启动时是否检查更新
-"""
-CREDENTIALS = {
-    # 加密后的密钥（Base64 编码）
-    'ENCRYPTED_KEY': '',
-    'ENCRYPTED_PASSWORD': '',
-    'USERNAME': '',
-
-    # 其他非敏感配置
-    'BASE_URL': 'http://1.1.1.1',
-    'AUTH_DOMAIN': 'auth.gxstnu.edu.cn',
-    'MAX_RETRY': 4,
-    'RETRY_INTERVAL': 1.5,
-    'TEST_URL': 'http://www.bilibili.com',
-    'MAIN_LOCK': True,
-    'UPDATE_ON_START': True,
-}
-
-        '''
+    def create_local_credentials_file(self):
+        """
+        创建默认配置文件（仅当文件不存在时）
+        包含初始密钥、空凭证和默认配置参数（见 DEFAULT_CREDENTIALS）
+        """
         if not os.path.exists(self.CREDENTIALS_file_path):
-            with open(self.CREDENTIALS_file_path, 'w', encoding='utf-8') as f:
-                f.write(default_content)
+            self._write_atomic(self._dump(DEFAULT_CREDENTIALS))
             logger.info(f"已创建 {self.CREDENTIALS_file_path} 并写入默认配置")
 
+    def migrate_legacy_file(self):
+        """
+        把旧版 Python 格式的配置文件（local_credentials.py）转换为 JSON 配置文件。
+
+        旧文件只做语法解析、不执行，转换后重命名为 local_credentials.py.migrated 保留备份，
+        之后启动不再读取。
+
+        返回:
+            bool: 成功转换返回 True，旧文件不存在时返回 False
+        """
+        legacy_path = self._get_legacy_config_path()
+        if not os.path.exists(legacy_path):
+            return False
+        legacy_credentials = self.parse_legacy_file(legacy_path)
+        self._write_atomic(self._dump(legacy_credentials))
+        os.replace(legacy_path, f"{legacy_path}.migrated")
+        logger.info(f"已将旧版配置文件 {legacy_path} 转换为 {self.CREDENTIALS_file_path}")
+        return True
+
+    @staticmethod
+    def parse_legacy_file(path):
+        """
+        解析旧版 Python 格式配置文件中的 CREDENTIALS 字典，只解析语法树、不执行任何代码。
+
+        参数:
+            path (str): 旧版配置文件路径
+
+        返回:
+            dict: CREDENTIALS 字典
+
+        异常:
+            ValueError: 文件中没有 CREDENTIALS 字典，或其值不是字面量
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == 'CREDENTIALS' for target in node.targets):
+                value = ast.literal_eval(node.value)
+                if not isinstance(value, dict):
+                    raise ValueError("CREDENTIALS 不是字典")
+                return value
+        raise ValueError("配置文件中未找到CREDENTIALS变量")
+
+    @staticmethod
+    def read_config_file(path):
+        """
+        读取 JSON 配置文件，只解析数据、不执行任何代码。
+
+        参数:
+            path (str): 配置文件路径
+
+        返回:
+            dict: CREDENTIALS 字典
+
+        异常:
+            ValueError: 文件格式错误或内容不是 JSON 对象
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        if not isinstance(value, dict):
+            raise ValueError("配置文件内容不是 JSON 对象")
+        return value
+
+    @staticmethod
+    def _dump(values):
+        """把配置字典序列化为 JSON 文本（保留中文、按键缩进，便于手工编辑）"""
+        return json.dumps(values, ensure_ascii=False, indent=4) + '\n'
+
 
 # 全局单例实例，供系统其他模块直接调用
 # 使用方式：from src.core.Credentials import credentials
@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量登录调度模块
+
+机房断电恢复或认证服务器重启后，所有机器会同时登录，瞬间的并发请求会压垮认证服务器，
+导致大量登录失败后再次同时重试。此模块按名册（账号 + 主机 IP/MAC）统一调度批量登录，
+限制同时进行的登录数与每秒发起的登录数，并为每个登录加入随机抖动，把请求摊平。
+主要功能包括：
+- 从 CSV/JSON 文件加载登录名册
+- 有界并发（线程池）+ 令牌桶限速 + 随机启动抖动
+- 每个成员失败后按 MAX_RETRY 重试，重试前按去相关抖动退避（与单机登录相同），每次重试都重新申请令牌
+- 统计吞吐量（登录数/秒）、成功率和尾延迟（p50/p95/p99）
+
+依赖项：
+- src.core.NetworkManager: 复用其 login_host（构造登录请求并确认拨号结果）与重试退避参数
+- src.core.BackoffPolicy: 重试退避延迟序列
+- src.core.HttpSession: 按并发数设置连接池大小的独立会话
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.FleetOrchestrator import FleetOrchestrator, load_roster
+
+roster = load_roster("roster.csv")  # 列: username,password,ip,mac[,name]
+orchestrator = FleetOrchestrator(concurrency=16, rate=5, jitter=2.0)
+report = orchestrator.run(roster)
+print(report.summary())
+```
+"""
+import csv
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+import requests
+
+from src.utils.logger import logger
+from src.core.BackoffPolicy import DecorrelatedJitter
+from src.core.HttpSession import PooledSession
+from src.core.NetworkManager import networkmanager
+
+
+@dataclass
+class FleetMember:
+    """
+    名册中的一个成员：一台主机及其使用的账号。
+
+    属性:
+        username (str): 登录用户名
+        password (str): 登录密码
+        ip (str): 主机的 IP（wlanuserip）
+        mac (str): 主机的 MAC 地址
+        name (str): 成员名称，用于日志和报告，默认为 "用户名@IP"
+    """
+    username: str
+    password: str
+    ip: str
+    mac: str
+    name: str = ""
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = f"{self.username}@{self.ip}"
+
+
+@dataclass
+class FleetResult:
+    """
+    单个成员的登录结果。
+
+    属性:
+        name (str): 成员名称
+        success (bool): 是否登录成功
+        latency (float): 从开始调度（含抖动与排队）到结束的耗时(秒)
+        attempts (int): 登录尝试次数
+        error (str): 最后一次失败的原因
+    """
+    name: str
+    success: bool
+    latency: float
+    attempts: int
+    error: str = ""
+
+
+@dataclass
+class FleetReport:
+    """
+    一次批量登录的汇总报告。
+
+    属性:
+        results (list): 每个成员的 FleetResult
+        duration (float): 批量登录总耗时(秒)
+    """
+    results: List[FleetResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self):
+        return sum(1 for result in self.results if result.success)
+
+    @property
+    def success_rate(self):
+        return self.succeeded / len(self.results) if self.results else 0.0
+
+    @property
+    def throughput(self):
+        """成功登录数/秒"""
+        return self.succeeded / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def attempts(self):
+        return sum(result.attempts for result in self.results)
+
+    def latency_percentile(self, pct):
+        """
+        成功登录耗时的百分位数（线性插值）。
+
+        参数:
+            pct (float): 百分位，0-100
+
+        返回:
+            float: 百分位数(秒)，没有成功登录时返回 0.0
+        """
+        ordered = sorted(result.latency for result in self.results if result.success)
+        if not ordered:
+            return 0.0
+        rank = (len(ordered) - 1) * pct / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    def summary(self):
+        """
+        返回报告摘要。
+
+        返回:
+            dict: 包含 'members'、'succeeded'、'success_rate'、'duration'、'throughput'、'attempts'、
+                  'p50'、'p95'、'p99' 的字典
+        """
+        return {
+            'members': len(self.results),
+            'succeeded': self.succeeded,
+            'success_rate': self.success_rate,
+            'duration': self.duration,
+            'throughput': self.throughput,
+            'attempts': self.attempts,
+            'p50': self.latency_percentile(50),
+            'p95': self.latency_percentile(95),
+            'p99': self.latency_percentile(99),
+        }
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限速器。
+
+    属性:
+        rate (float): 每秒补充的令牌数，0 或负数表示不限速
+        capacity (float): 桶容量，即允许的突发数量
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        参数:
+            rate (float): 每秒补充的令牌数
+            capacity (float, optional): 桶容量，默认等于 max(rate, 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop_event=None):
+        """
+        阻塞直到取得一个令牌。
+
+        参数:
+            stop_event (threading.Event, optional): 被设置时放弃等待
+
+        返回:
+            bool: 取得令牌返回 True，因 stop_event 放弃时返回 False
+        """
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if stop_event is not None:
+                if stop_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class FleetOrchestrator:
+    """
+    批量登录调度器。
+
+    属性:
+        manager (NetworkManager): 网络管理器，提供请求构造与拨号确认
+        concurrency (int): 同时进行的登录数上限
+        rate (float): 每秒最多发起的登录请求数（含重试），0 表示不限速
+        jitter (float): 每个成员开始前的随机延迟上限(秒)
+        max_retry (int): 每个成员的最大尝试次数，默认为 manager.MAX_RETRY
+        retry_base (float): 成员重试前退避延迟的最小值(秒)，默认与单机登录相同（manager.backoff.retry_base）
+        retry_cap (float): 成员重试前退避延迟的最大值(秒)，默认为 manager.backoff.retry_cap
+    """
+
+    def __init__(self, manager=None, concurrency=8, rate=5.0, burst=None, jitter=1.0, max_retry=None, seed=None,
+                 retry_base=None, retry_cap=None):
+        """
+        参数:
+            manager (NetworkManager, optional): 网络管理器，默认为全局单例
+            concurrency (int): 同时进行的登录数上限
+            rate (float): 每秒最多发起的登录请求数，0 表示不限速
+            burst (float, optional): 令牌桶容量（允许的突发数），默认等于 rate
+            jitter (float): 每个成员开始前的随机延迟上限(秒)
+            max_retry (int, optional): 每个成员的最大尝试次数
+            seed (int, optional): 抖动的随机数种子
+            retry_base (float, optional): 重试退避延迟的最小值(秒)
+            retry_cap (float, optional): 重试退避延迟的最大值(秒)
+        """
+        self.manager = manager or networkmanager
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.jitter = jitter
+        self.max_retry = max_retry or self.manager.MAX_RETRY
+        self.retry_base = self.manager.backoff.retry_base if retry_base is None else retry_base
+        self.retry_cap = self.manager.backoff.retry_cap if retry_cap is None else retry_cap
+        self.bucket = TokenBucket(rate, burst)
+        self._random = random.Random(seed)
+        self._stop_event = threading.Event()
+
+    def run(self, roster):
+        """
+        对名册中的所有成员执行批量登录，阻塞直到全部完成。
+
+        参数:
+            roster (list): FleetMember 列表
+
+        返回:
+            FleetReport: 汇总报告
+        """
+        self._stop_event.clear()
+        # 独立的会话，连接池大小与并发数一致，避免超出后反复新建连接
+        session = PooledSession(
+            host_pool_sizes={f"{self.manager.AUTH_SCHEME}://{self.manager.AUTH_DOMAIN}": self.concurrency},
+            default_pool_size=self.concurrency,
+        )
+        delays = [self._random.uniform(0, self.jitter) if self.jitter > 0 else 0.0 for _ in roster]
+        logger.info(f"开始批量登录 {len(roster)} 个成员，并发 {self.concurrency}，"
+                    f"限速 {self.rate or '不限'} 次/秒，抖动 {self.jitter} 秒")
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="FleetLogin") as executor:
+                futures = [executor.submit(self._login_member, member, delay, session, start)
+                           for member, delay in zip(roster, delays)]
+                results = [future.result() for future in futures]
+        finally:
+            session.close()
+        report = FleetReport(results=results, duration=time.perf_counter() - start)
+        summary = report.summary()
+        logger.info(f"批量登录完成: 成功 {summary['succeeded']}/{summary['members']}，"
+                    f"耗时 {summary['duration']:.2f} 秒，吞吐 {summary['throughput']:.2f} 次/秒，"
+                    f"p95 {summary['p95']:.2f} 秒")
+        return report
+
+    def stop(self):
+        """请求停止调度，尚未开始的成员与等待令牌的重试会被放弃。"""
+        self._stop_event.set()
+
+    def _login_member(self, member, delay, session, start):
+        """
+        登录单个成员（在工作线程中执行）。
+
+        参数:
+            member (FleetMember): 名册成员
+            delay (float): 开始前的随机延迟(秒)
+            session (PooledSession): 发送请求使用的会话
+            start (float): 批量登录的开始时间（perf_counter）
+
+        返回:
+            FleetResult: 登录结果
+        """
+        # 抖动从批量开始时计时，线程池排队的时间也计入其中
+        remaining = delay - (time.perf_counter() - start)
+        if remaining > 0 and self._stop_event.wait(remaining):
+            return FleetResult(member.name, False, time.perf_counter() - start, 0, "已取消")
+
+        error = ""
+        attempts = 0
+        # 每个成员独立的退避序列：认证服务器持续出错时各成员的重试间隔逐渐拉长且互相错开，
+        # 而不是只受令牌桶限制、以限速上限持续重试
+        retry_delays = DecorrelatedJitter(self.retry_base, self.retry_cap, self._random)
+        for attempts in range(1, self.max_retry + 1):
+            if attempts > 1 and self._stop_event.wait(retry_delays.next()):
+                error = "已取消"
+                break
+            if not self.bucket.acquire(self._stop_event):
+                error = "已取消"
+                break
+            try:
+                if self.manager.login_host(member.ip, member.mac, member.username, member.password, session=session):
+                    return FleetResult(member.name, True, time.perf_counter() - start, attempts)
+                error = "未确认拨号成功"
+            except requests.exceptions.Timeout:
+                error = "请求超时"
+            except requests.exceptions.ConnectionError:
+                error = "连接失败"
+            except Exception as e:
+                error = str(e)
+            logger.debug(f"{member.name} 第 {attempts} 次登录失败: {error}")
+        logger.warning(f"{member.name} 登录失败: {error}")
+        return FleetResult(member.name, False, time.perf_counter() - start, attempts, error)
+
+
+def load_roster(path):
+    """
+    从文件加载登录名册。
+
+    支持两种格式：
+    - CSV：首行为表头，包含 username、password、ip、mac 列，可选 name 列
+    - JSON：对象数组，键与 CSV 列名相同
+
+    参数:
+        path (str): 名册文件路径，按扩展名判断格式
+
+    返回:
+        list: FleetMember 列表
+
+    异常:
+        ValueError: 缺少必需字段时抛出
+    """
+    if str(path).lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    roster = []
+    for index, row in enumerate(rows, start=1):
+        missing = [key for key in ('username', 'password', 'ip', 'mac') if not row.get(key)]
+        if missing:
+            raise ValueError(f"名册第 {index} 项缺少字段: {', '.join(missing)}")
+        roster.append(FleetMember(row['username'], row['password'], row['ip'], row['mac'], row.get('name') or ""))
+    return roster
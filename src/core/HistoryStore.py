@@ -0,0 +1,442 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+连通性历史记录模块
+
+此模块把每一次网络检测、每一次连通性状态迁移和每一次登录持久化到本地 SQLite 数据库，
+并提供在线率、平均恢复时间（MTTR）与断网时长分布等统计查询。
+为了在数月的 5 秒级检测下保持数据库体积很小，检测结果按游程编码存储：
+连续相同状态的检测只占一行（起止时间、次数、耗时合计/最大值），只有状态变化时才新增一行。
+- probes: 检测结果游程（state, start, end, count, latency_total, latency_max）
+- transitions: 状态迁移（timestamp, previous, current, duration, detail）
+- logins: 登录记录（timestamp, username, success, total, attempts, timings）
+
+依赖项：
+- sqlite3, json, os, threading, time: 存储与线程安全
+- src.core.ConnectivityState: 连通性状态
+- src.core.TaskScheduler: 获取默认的数据库目录
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.HistoryStore import HistoryStore
+from src.core.NetworkManager import networkmanager
+
+history = HistoryStore("history.db")
+detach = history.attach(networkmanager)  # 订阅检测、状态迁移与登录事件
+...
+print(history.uptime(days=7))            # 最近7天在线率
+print(history.mttr(days=7))              # 平均恢复时间(秒)
+print(history.outage_histogram(days=7))  # 断网时长分布
+detach()
+history.close()
+```
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.utils.logger import logger
+from src.core.ConnectivityState import ConnectivityState
+from src.core.TaskScheduler import TaskScheduler
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    count INTEGER NOT NULL,
+    latency_total REAL NOT NULL,
+    latency_max REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS probes_end ON probes(end);
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    previous TEXT NOT NULL,
+    current TEXT NOT NULL,
+    duration REAL NOT NULL,
+    detail TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS transitions_timestamp ON transitions(timestamp);
+CREATE TABLE IF NOT EXISTS logins (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    username TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    total REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    timings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logins_timestamp ON logins(timestamp);
+"""
+
+# 断网时长分布的默认分段上界(秒)
+DEFAULT_OUTAGE_BUCKETS = (10, 60, 300, 1800, 3600)
+
+
+class HistoryStore:
+    """
+    连通性历史记录（线程安全，订阅者回调可以在任意线程中调用）。
+
+    属性:
+        path (str): 数据库文件路径，':memory:' 表示仅保存在内存中
+        flush_interval (float): 当前检测游程写入数据库的最长间隔(秒)，进程异常退出最多丢失这段时间的检测计数
+    """
+    FLUSH_INTERVAL = 60
+
+    def __init__(self, path, flush_interval=None):
+        """
+        参数:
+            path (str): 数据库文件路径，不存在时自动创建
+            flush_interval (float, optional): 当前检测游程写入数据库的最长间隔(秒)
+        """
+        self.path = str(path)
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # 当前检测游程：[行id, 状态, 开始, 结束, 次数, 耗时合计, 最大耗时]，行id 为 None 表示尚未写入
+        self._run = None
+        self._run_flushed_at = 0.0
+
+    @classmethod
+    def default_path(cls):
+        """
+        返回:
+            str: 默认数据库路径，与保活状态文件位于同一目录（任务文件夹/status/history.db）
+        """
+        folder = os.path.join(TaskScheduler().task_folder, 'status')
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, 'history.db')
+
+    # ---------------- 写入 ----------------
+
+    def attach(self, manager):
+        """
+        订阅网络管理器的检测、状态迁移与登录事件，自动记录历史。
+
+        参数:
+            manager (NetworkManager): 网络管理器
+
+        返回:
+            callable: 调用即可取消全部订阅
+        """
+        unsubscribes = [
+            manager.subscribe_checks(self.record_check),
+            manager.connectivity.subscribe(self.record_transition),
+            manager.subscribe_logins(self.record_login),
+        ]
+
+        def detach():
+            for unsubscribe in unsubscribes:
+                unsubscribe()
+        return detach
+
+    def record_check(self, state, latency, detail="", timestamp=None):
+        """
+        记录一次网络检测，与上一次检测状态相同时只累加到当前游程。
+
+        参数:
+            state (ConnectivityState): 检测得到的状态
+            latency (float): 检测耗时(秒)
+            detail (str, optional): 检测说明（不存储，保留参数以便直接作为 subscribe_checks 的回调）
+            timestamp (float, optional): 检测时间，默认为当前时间
+        """
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            run = self._run
+            if run is not None and run[1] == state.value:
+                run[3] = now
+                run[4] += 1
+                run[5] += latency
+                run[6] = max(run[6], latency)
+                if now - self._run_flushed_at >= self.flush_interval:
+                    self._flush_run()
+                return
+            # 状态变化：先写入上一个游程，再开始新游程并立即写入，保证每个游程至少有一行
+            if run is not None:
+                self._flush_run()
+            self._run = [None, state.value, now, now, 1, latency, latency]
+            self._flush_run()
+
+    def _flush_run(self):
+        """把当前游程写入数据库（需持有锁）"""
+        run = self._run
+        try:
+            with self._conn:
+                if run[0] is None:
+                    cursor = self._conn.execute(
+                        "INSERT INTO probes (state, start, end, count, latency_total, latency_max) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", run[1:])
+                    run[0] = cursor.lastrowid
+                else:
+                    self._conn.execute(
+                        "UPDATE probes SET end = ?, count = ?, latency_total = ?, latency_max = ? WHERE id = ?",
+                        (run[3], run[4], run[5], run[6], run[0]))
+        except sqlite3.Error as e:
+            logger.error(f"写入检测历史失败: {str(e)}")
+        self._run_flushed_at = time.time()
+
+    def record_transition(self, transition):
+        """
+        记录一次连通性状态迁移。
+
+        参数:
+            transition (StateTransition): 状态迁移事件
+        """
+        self._execute("INSERT INTO transitions (timestamp, previous, current, duration, detail) VALUES (?, ?, ?, ?, ?)",
+                      (transition.timestamp, transition.previous.value, transition.current.value,
+                       transition.duration, transition.detail or ""))
+
+    def record_login(self, username, success, timings, timestamp=None):
+        """
+        记录一次登录。
+
+        参数:
+            username (str): 登录用户名
+            success (bool): 是否登录成功
+            timings (dict): 各阶段耗时（NetworkManager.last_login_timings 格式）
+            timestamp (float, optional): 登录结束时间，默认为当前时间
+        """
+        self._execute("INSERT INTO logins (timestamp, username, success, total, attempts, timings) "
+                      "VALUES (?, ?, ?, ?, ?, ?)",
+                      (time.time() if timestamp is None else timestamp, username, int(bool(success)),
+                       timings.get('total', 0.0), timings.get('attempts', 0), json.dumps(timings)))
+
+    def _execute(self, sql, params):
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(sql, params)
+            except sqlite3.Error as e:
+                logger.error(f"写入连通性历史失败: {str(e)}")
+
+    def close(self):
+        """
+        写入当前检测游程并关闭数据库。
+
+        关闭时额外记录一次迁移到 UNKNOWN，程序未运行的时间段不计入在线率与断网统计。
+        """
+        with self._lock:
+            if self._run is not None:
+                self._flush_run()
+                self._run = None
+            try:
+                with self._conn:
+                    last = self._conn.execute(
+                        "SELECT timestamp, current FROM transitions ORDER BY timestamp DESC, id DESC LIMIT 1").fetchone()
+                    if last is not None and last[1] != ConnectivityState.UNKNOWN.value:
+                        now = time.time()
+                        self._conn.execute(
+                            "INSERT INTO transitions (timestamp, previous, current, duration, detail) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (now, last[1], ConnectivityState.UNKNOWN.value, now - last[0], "记录结束"))
+            except sqlite3.Error as e:
+                logger.error(f"写入连通性历史失败: {str(e)}")
+            self._conn.close()
+
+    def prune(self, days):
+        """
+        删除指定天数之前的历史记录并回收空间。
+
+        参数:
+            days (float): 保留最近多少天的记录
+
+        返回:
+            int: 删除的行数
+        """
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            with self._conn:
+                deleted = sum(self._conn.execute(sql, (cutoff,)).rowcount for sql in (
+                    "DELETE FROM probes WHERE end < ?",
+                    "DELETE FROM transitions WHERE timestamp < ?",
+                    "DELETE FROM logins WHERE timestamp < ?",
+                ))
+            self._conn.execute("VACUUM")
+        return deleted
+
+    # ---------------- 查询 ----------------
+
+    @staticmethod
+    def _range(days=None, start=None, end=None):
+        """把 days 或 start/end 参数换算为 (start, end) 时间戳"""
+        end = time.time() if end is None else end
+        if start is None:
+            start = end - days * 86400 if days is not None else 0.0
+        return start, end
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def state_periods(self, days=None, start=None, end=None):
+        """
+        按状态迁移还原时间段内的状态序列。
+
+        参数:
+            days (float, optional): 最近多少天，与 start 二选一
+            start (float, optional): 开始时间戳
+            end (float, optional): 结束时间戳，默认为当前时间
+
+        返回:
+            list: [(状态值, 开始时间, 结束时间), ...]，按时间排序
+        """
+        start, end = self._range(days, start, end)
+        # 范围开始时的状态取之前最后一次迁移的结果
+        before = self._query("SELECT current FROM transitions WHERE timestamp <= ? "
+                             "ORDER BY timestamp DESC, id DESC LIMIT 1", (start,))
+        rows = self._query("SELECT timestamp, current FROM transitions WHERE timestamp > ? AND timestamp < ? "
+                           "ORDER BY timestamp, id", (start, end))
+        periods = []
+        state, since = (before[0][0] if before else ConnectivityState.UNKNOWN.value), start
+        for timestamp, current in rows:
+            if timestamp > since:
+                periods.append((state, since, timestamp))
+            state, since = current, timestamp
+        if end > since:
+            periods.append((state, since, end))
+        return periods
+
+    def state_durations(self, days=None, start=None, end=None):
+        """
+        返回:
+            dict: 状态值到累计时长(秒)的映射
+        """
+        durations = {}
+        for state, period_start, period_end in self.state_periods(days, start, end):
+            durations[state] = durations.get(state, 0.0) + period_end - period_start
+        return durations
+
+    def uptime(self, days=None, start=None, end=None):
+        """
+        在线率：在线时长占有记录时长（不含 UNKNOWN，即程序未运行的时间）的比例。
+
+        返回:
+            float or None: 0~1 之间的在线率，没有记录时返回 None
+        """
+        durations = self.state_durations(days, start, end)
+        durations.pop(ConnectivityState.UNKNOWN.value, None)
+        known = sum(durations.values())
+        if known <= 0:
+            return None
+        return durations.get(ConnectivityState.ONLINE.value, 0.0) / known
+
+    def outages(self, days=None, start=None, end=None):
+        """
+        断网记录：从进入离线状态（未登录、无网络连接、认证服务器不可达）到重新在线的时间段，
+        期间的各种离线状态与登录中状态合并为一次断网。在线时的正常重新登录（在线 → 登录中 → 在线）
+        没有离线，不计为断网。断网期间程序退出（进入 UNKNOWN）时无法得知恢复时间，该次断网不计入。
+
+        返回:
+            list: [{'start', 'end', 'duration', 'resolved', 'states'}, ...]，
+                  'resolved' 为 False 表示在查询范围结束时仍未恢复
+        """
+        outages = []
+        current = None
+        for state, period_start, period_end in self.state_periods(days, start, end):
+            if state == ConnectivityState.ONLINE.value or state == ConnectivityState.UNKNOWN.value:
+                if current is not None and state == ConnectivityState.ONLINE.value:
+                    current['end'] = period_start
+                    current['duration'] = period_start - current['start']
+                    current['resolved'] = True
+                    outages.append(current)
+                current = None
+                continue
+            if current is None:
+                # 登录中本身不是断网，只有之前已经离线时才并入该次断网
+                if state == ConnectivityState.LOGGING_IN.value:
+                    continue
+                current = {'start': period_start, 'end': period_end, 'duration': 0.0, 'resolved': False, 'states': []}
+            current['end'] = period_end
+            if state not in current['states']:
+                current['states'].append(state)
+        if current is not None:
+            current['duration'] = current['end'] - current['start']
+            outages.append(current)
+        return outages
+
+    def mttr(self, days=None, start=None, end=None):
+        """
+        平均恢复时间（Mean Time To Recovery）：已恢复的断网的平均时长。
+
+        返回:
+            float or None: 平均恢复时间(秒)，没有已恢复的断网时返回 None
+        """
+        durations = [outage['duration'] for outage in self.outages(days, start, end) if outage['resolved']]
+        return sum(durations) / len(durations) if durations else None
+
+    def outage_histogram(self, days=None, start=None, end=None, buckets=DEFAULT_OUTAGE_BUCKETS):
+        """
+        断网时长分布。
+
+        参数:
+            buckets (tuple): 各分段的上界(秒)，最后自动追加一个无上界的分段
+
+        返回:
+            list: [(分段标签, 次数), ...]，如 [('<10s', 3), ('<60s', 1), ..., ('>=3600s', 0)]
+        """
+        counts = [0] * (len(buckets) + 1)
+        for outage in self.outages(days, start, end):
+            index = next((i for i, bound in enumerate(buckets) if outage['duration'] < bound), len(buckets))
+            counts[index] += 1
+        labels = [f"<{bound}s" for bound in buckets] + [f">={buckets[-1]}s"]
+        return list(zip(labels, counts))
+
+    def login_stats(self, days=None, start=None, end=None):
+        """
+        登录统计。
+
+        返回:
+            dict: 包含 'logins'、'succeeded'、'success_rate'、'mean_total'、'max_total'、'mean_attempts' 的字典，
+                  耗时只统计成功的登录
+        """
+        start, end = self._range(days, start, end)
+        rows = self._query("SELECT success, total, attempts FROM logins WHERE timestamp >= ? AND timestamp <= ?",
+                           (start, end))
+        totals = [total for success, total, _ in rows if success]
+        return {
+            'logins': len(rows),
+            'succeeded': len(totals),
+            'success_rate': len(totals) / len(rows) if rows else None,
+            'mean_total': sum(totals) / len(totals) if totals else None,
+            'max_total': max(totals) if totals else None,
+            'mean_attempts': sum(attempts for _, _, attempts in rows) / len(rows) if rows else None,
+        }
+
+    def probe_stats(self, days=None, start=None, end=None):
+        """
+        检测统计。
+
+        返回:
+            dict: 状态值到 {'checks', 'mean_latency', 'max_latency'} 的映射
+        """
+        start, end = self._range(days, start, end)
+        with self._lock:
+            if self._run is not None:
+                self._flush_run()
+        rows = self._query("SELECT state, SUM(count), SUM(latency_total), MAX(latency_max) FROM probes "
+                           "WHERE end >= ? AND start <= ? GROUP BY state", (start, end))
+        return {state: {'checks': count, 'mean_latency': total / count if count else 0.0, 'max_latency': latency_max}
+                for state, count, total, latency_max in rows}
+
+    def summary(self, days=None, start=None, end=None):
+        """
+        返回:
+            dict: 包含 'uptime'、'mttr'、'outages'、'outage_histogram'、'logins'、'probes' 的汇总
+        """
+        return {
+            'uptime': self.uptime(days, start, end),
+            'mttr': self.mttr(days, start, end),
+            'outages': len(self.outages(days, start, end)),
+            'outage_histogram': self.outage_histogram(days, start, end),
+            'logins': self.login_stats(days, start, end),
+            'probes': self.probe_stats(days, start, end),
+        }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+连接池化HTTP会话模块
+
+此模块为网络管理器提供一个共享的、带连接池的HTTP会话层，避免每次探测或重试都重新进行
+TCP（以及HTTPS下的TLS）握手。
+主要功能包括：
+- 基于 requests.Session 的长连接（keep-alive）复用
+- 按主机配置连接池大小
+- 连接阶段的自动重试（urllib3 Retry）
+- 连接池命中/未命中计数统计
+
+依赖项：
+- requests / urllib3: HTTP请求与连接池
+
+使用示例：
+```python
+from src.core.HttpSession import PooledSession
+
+session = PooledSession(host_pool_sizes={"https://auth.gxstnu.edu.cn": 8})
+response = session.get("http://www.bilibili.com", timeout=1.5)
+print(session.stats())  # {'requests': 1, 'pool_hits': 0, 'pool_misses': 1, ...}
+```
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PooledSession:
+    """
+    线程安全的连接池化HTTP会话，供网络管理器的所有请求共享。
+
+    会话不保存任何Cookie，与原先每次调用 requests.get/post 的无状态行为保持一致，
+    同时也避免了多线程并发修改Cookie的问题。
+
+    属性:
+        DEFAULT_POOL_SIZE (int): 未单独配置的主机使用的连接池大小
+        DEFAULT_HEADERS (dict): 所有请求默认携带的请求头
+    """
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, host_pool_sizes=None, default_pool_size=None, connect_retries=1, backoff_factor=0.2):
+        """
+        初始化连接池化会话。
+
+        参数:
+            host_pool_sizes (dict, optional): 主机前缀到连接池大小的映射，如 {"https://auth.gxstnu.edu.cn": 8}
+            default_pool_size (int, optional): 其他主机使用的连接池大小，默认为 DEFAULT_POOL_SIZE
+            connect_retries (int): 建立连接失败时的自动重试次数（不会重复发送已送达的请求）
+            backoff_factor (float): 连接重试之间的退避系数
+        """
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._adapters = []
+        self._connect_retries = connect_retries
+        self._backoff_factor = backoff_factor
+        self._session = requests.Session()
+        self._session.headers.update(self.DEFAULT_HEADERS)
+        # 屏蔽所有Cookie，保持请求之间相互独立
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        default_pool_size = default_pool_size or self.DEFAULT_POOL_SIZE
+        self._mount('http://', default_pool_size)
+        self._mount('https://', default_pool_size)
+        # requests 按最长前缀匹配适配器，因此按主机挂载即可实现独立的连接池大小
+        for prefix, pool_size in (host_pool_sizes or {}).items():
+            self._mount(prefix, pool_size)
+
+    def _mount(self, prefix, pool_size):
+        """
+        为指定URL前缀挂载一个带连接池和重试策略的适配器。
+
+        参数:
+            prefix (str): URL前缀，如 "https://" 或 "https://auth.gxstnu.edu.cn"
+            pool_size (int): 每个主机保持的最大空闲连接数
+        """
+        retry = Retry(
+            total=self._connect_retries,
+            connect=self._connect_retries,
+            read=0,
+            status=0,
+            redirect=None,
+            backoff_factor=self._backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self._session.mount(prefix, adapter)
+        self._adapters.append(adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        通过共享连接池发送HTTP请求，参数与 requests.Session.request 相同。
+
+        返回:
+            requests.Response: 响应对象
+        """
+        with self._lock:
+            self._request_count += 1
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """发送GET请求，参数与 requests.get 相同。"""
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """发送POST请求，参数与 requests.post 相同。"""
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """发送HEAD请求，参数与 requests.head 相同。"""
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self):
+        """
+        获取连接池统计信息。
+
+        命中表示请求复用了已有的长连接，未命中表示为请求新建了连接（需要重新握手）。
+
+        返回:
+            dict: 包含 'requests'、'pool_hits'、'pool_misses'、'hit_rate' 的统计字典
+        """
+        pool_requests = 0
+        pool_misses = 0
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    # 连接池在遍历期间被淘汰
+                    continue
+                pool_requests += pool.num_requests
+                pool_misses += pool.num_connections
+        pool_hits = max(pool_requests - pool_misses, 0)
+        with self._lock:
+            request_count = self._request_count
+        return {
+            'requests': request_count,
+            'pool_hits': pool_hits,
+            'pool_misses': pool_misses,
+            'hit_rate': pool_hits / pool_requests if pool_requests else 0.0,
+        }
+
+    def close(self):
+        """关闭会话并释放连接池中的所有连接。"""
+        self._session.close()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+无界面保活守护进程模块
+
+此模块实现一个不依赖Qt界面的常驻保活循环：持续检测网络连通性，断线时自动重新登录，
+并把当前状态写入JSON状态文件，供计划任务、监控脚本或其他程序查询。
+主要功能包括：
+- 自适应检测间隔：网络稳定时间隔逐渐增长到上限，离线或状态变化时立即收紧到最小值
+- 断线自动重新登录（复用 NetworkManager.keep_alive 流水线，重新登录失败后按抖动退避推迟）
+- 原子写入的状态文件（先写临时文件再替换，读取方不会读到半个文件），连通性状态变化时立即更新
+- 检测结果、状态迁移与登录记录写入历史数据库，可查询在线率与平均恢复时间
+- 监听系统网络变化事件（网卡启停、地址或默认路由变化），变化时立即检测，而不是等到下一次轮询
+- 监视配置文件，修改 MAX_RETRY、TEST_URL 等配置后立即生效并重新检测，无需重启守护进程
+- 可选的运行指标输出：本地HTTP端点（Prometheus 抓取）或文本文件（node_exporter textfile collector）
+- 空闲时阻塞等待，几乎不占用CPU
+
+依赖项：
+- src.core.NetworkManager: 网络检测与登录
+- src.core.PollScheduler: 自适应检测间隔
+- src.core.NetworkChangeListener: 系统网络变化监听
+- src.core.ConfigWatcher: 配置文件监视
+- src.core.Credentials: 配置变化通知
+- src.core.HistoryStore: 连通性历史记录
+- src.core.Metrics: 运行指标导出
+- src.core.Tracing: 自动重新登录的调用链导出
+- src.core.TaskScheduler: 获取默认的状态文件目录
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.KeepAliveDaemon import KeepAliveDaemon
+
+daemon = KeepAliveDaemon(interval=300, offline_interval=5)
+daemon.run_forever()  # 阻塞运行，直到调用 daemon.stop() 或收到 Ctrl+C
+```
+"""
+import json
+import os
+import threading
+import time
+
+from src.utils.logger import logger
+from src.core.ConfigWatcher import ConfigWatcher
+from src.core.Credentials import credentials
+from src.core.HistoryStore import HistoryStore
+from src.core.Metrics import metrics, MetricsServer
+from src.core.Tracing import tracer
+from src.core.NetworkChangeListener import NetworkChangeListener
+from src.core.NetworkManager import networkmanager
+from src.core.PollScheduler import AdaptivePollScheduler
+from src.core.TaskScheduler import TaskScheduler
+
+
+class KeepAliveDaemon:
+    """
+    无界面的保活守护进程。
+
+    属性:
+        interval (float): 网络稳定在线时的最大检测间隔(秒)
+        offline_interval (float): 网络离线、重新登录失败或状态变化后的检测间隔(秒)
+        scheduler (AdaptivePollScheduler): 自适应检测间隔调度器
+        listener (NetworkChangeListener): 系统网络变化监听器
+        config_watcher (ConfigWatcher): 配置文件监视器
+        status_file (str): 状态文件路径
+        history_file (str): 历史数据库路径，为空字符串时不记录历史
+        metrics_port (int): 指标HTTP端点端口，None 表示不启动
+        metrics_file (str): 指标文本文件路径，每次检测后更新，None 表示不输出
+        trace_file (str): 登录调用链文件路径（Chrome 追踪格式），每次自动重新登录后更新，None 表示不输出
+        status (dict): 当前状态，与状态文件内容一致
+    """
+    DEFAULT_INTERVAL = 300
+    DEFAULT_OFFLINE_INTERVAL = 5
+
+    def __init__(self, manager=None, interval=None, offline_interval=None, status_file=None,
+                 username=None, password=None, history_file=None, metrics_port=None, metrics_file=None,
+                 trace_file=None):
+        """
+        初始化守护进程。
+
+        参数:
+            manager (NetworkManager, optional): 网络管理器，默认为全局单例
+            interval (float, optional): 网络稳定在线时的最大检测间隔(秒)，在线期间间隔从 offline_interval 起逐次翻倍直到此值
+            offline_interval (float, optional): 网络离线或状态变化后的检测间隔(秒)
+            status_file (str, optional): 状态文件路径，默认为 任务文件夹/status/keep_alive.json
+            username (str, optional): 重新登录使用的用户名，默认为配置文件中的用户名
+            password (str, optional): 重新登录使用的密码，默认为配置文件中的密码
+            history_file (str, optional): 历史数据库路径，默认为 任务文件夹/status/history.db，传入空字符串则不记录
+            metrics_port (int, optional): 在 127.0.0.1 的此端口提供 /metrics 指标端点
+            metrics_file (str, optional): 每次检测后把指标写入此文本文件（建议扩展名 .prom）
+            trace_file (str, optional): 每次自动重新登录后把最近的登录调用链写入此文件
+        """
+        self.manager = manager or networkmanager
+        self.interval = interval or self.DEFAULT_INTERVAL
+        self.offline_interval = offline_interval or self.DEFAULT_OFFLINE_INTERVAL
+        self.scheduler = AdaptivePollScheduler(min_interval=self.offline_interval, max_interval=self.interval)
+        self.listener = NetworkChangeListener(self._on_network_change)
+        self.config_watcher = ConfigWatcher()
+        self.status_file = status_file or os.path.join(TaskScheduler().task_folder, 'status', 'keep_alive.json')
+        self.history_file = HistoryStore.default_path() if history_file is None else history_file
+        self.metrics_port = metrics_port
+        self.metrics_file = metrics_file
+        self.trace_file = trace_file
+        self.username = username
+        self.password = password
+        self._stop_event = threading.Event()
+        # 检测循环与状态迁移回调（其他线程）都会写状态文件，写入需串行，避免交错写出不完整的文件
+        self._status_lock = threading.Lock()
+        self.status = {
+            'pid': os.getpid(),
+            'started_at': time.time(),
+            'online': None,
+            'state': None,
+            'last_check': None,
+            'last_change': None,
+            'checks': 0,
+            'relogins': 0,
+            'relogin_failures': 0,
+            'relogins_deferred': 0,
+            'consecutive_failures': 0,
+            'backoff': {},
+            'poll': {},
+            'change_listener': None,
+            'network_changes': 0,
+            'config_reloads': 0,
+        }
+
+    def run_once(self):
+        """
+        执行一次保活检测并更新状态文件。
+
+        返回:
+            dict: NetworkManager.keep_alive 返回的状态字典
+        """
+        result = self.manager.keep_alive(username=self.username, password=self.password)
+        status = self.status
+        status['online'] = result['online']
+        status['state'] = result['state']
+        status['last_check'] = time.time()
+        status['checks'] += 1
+        if result['relogin_attempted']:
+            status['relogins'] += 1
+            if not result['relogin_success']:
+                status['relogin_failures'] += 1
+        if result.get('relogin_deferred'):
+            status['relogins_deferred'] += 1
+        status['backoff'] = self.manager.get_backoff_stats()
+        status['consecutive_failures'] = 0 if result['online'] else status['consecutive_failures'] + 1
+        self.scheduler.record(result['online'])
+        status['poll'] = self.scheduler.stats()
+        self._write_status()
+        if self.metrics_file:
+            try:
+                metrics.write_textfile(self.metrics_file)
+            except OSError as e:
+                logger.error(f"写入指标文件失败: {str(e)}")
+        if self.trace_file and result['relogin_attempted']:
+            try:
+                tracer.export(self.trace_file)
+            except OSError as e:
+                logger.error(f"写入调用链文件失败: {str(e)}")
+        return result
+
+    def run_forever(self):
+        """
+        阻塞运行保活循环，直到调用 stop() 或收到 KeyboardInterrupt。
+        """
+        logger.info(f"保活守护进程已启动，检测间隔 {self.offline_interval}~{self.interval} 秒，"
+                    f"状态文件: {self.status_file}")
+        # 状态迁移时立即更新状态文件并收紧检测间隔，不必等到本轮检测结束
+        unsubscribe_status = self.manager.connectivity.subscribe(self._on_transition)
+        unsubscribe_scheduler = self.manager.connectivity.subscribe(self.scheduler.on_transition)
+        self.status['change_listener'] = self.listener.start()
+        # 配置文件修改后 NetworkManager 会自行应用新的网络参数，这里只记录次数并立即重新检测
+        unsubscribe_config = credentials.subscribe(self._on_config_change)
+        self.config_watcher.start()
+        history = HistoryStore(self.history_file) if self.history_file else None
+        detach_history = history.attach(self.manager) if history else None
+        metrics_server = MetricsServer(metrics, port=self.metrics_port) if self.metrics_port else None
+        if metrics_server is not None:
+            metrics_server.start()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"保活检测异常: {str(e)}")
+                    self.scheduler.record(False)
+                # 使用事件等待代替 sleep，stop() 和网络变化通知可以立即唤醒
+                self.scheduler.wait()
+        except KeyboardInterrupt:
+            logger.info("收到中断信号，保活守护进程退出")
+        finally:
+            unsubscribe_status()
+            unsubscribe_scheduler()
+            unsubscribe_config()
+            self.listener.stop()
+            self.config_watcher.stop()
+            if history is not None:
+                detach_history()
+                history.close()
+            if metrics_server is not None:
+                metrics_server.stop()
+            self.status['online'] = None
+            self.status['state'] = None
+            self._write_status()
+
+    def _on_transition(self, transition):
+        """
+        连通性状态迁移的订阅者，记录迁移时间并立即写入状态文件。
+
+        参数:
+            transition (StateTransition): 状态迁移事件
+        """
+        self.status['state'] = transition.current.value
+        self.status['last_change'] = transition.timestamp
+        self._write_status()
+
+    def _on_network_change(self, reason):
+        """
+        系统网络变化事件的回调（在监听线程中执行）：清除认证参数缓存并立即唤醒检测循环。
+
+        参数:
+            reason (str): 变化原因说明
+        """
+        self.status['network_changes'] += 1
+        self.manager.invalidate_auth_cache(reason)
+        self.scheduler.notify_change(reason)
+
+    def _on_config_change(self, changes):
+        """
+        配置文件修改后的回调（在监视线程中执行）：记录次数并立即唤醒检测循环，用新配置检测一次。
+
+        参数:
+            changes (dict): 变化的配置项到新值的映射
+        """
+        self.status['config_reloads'] += 1
+        self.scheduler.notify_change("配置文件已修改")
+
+    def stop(self):
+        """请求守护进程在当前检测结束后退出。"""
+        self._stop_event.set()
+        self.scheduler.wake()
+
+    def _write_status(self):
+        """把当前状态原子地写入状态文件（线程安全），写入失败只记录日志。"""
+        try:
+            with self._status_lock:
+                os.makedirs(os.path.dirname(self.status_file), exist_ok=True)
+                temp_path = f"{self.status_file}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.status, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.status_file)
+        except OSError as e:
+            logger.error(f"写入状态文件失败: {str(e)}")
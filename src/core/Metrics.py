@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+运行指标模块
+
+此模块提供一个轻量的指标注册表（计数器、仪表、直方图），以 Prometheus 文本格式（兼容 OpenMetrics）导出，
+用于监控机房中每台机器的探测耗时、登录各阶段耗时、重试次数与异步任务队列情况。
+主要功能包括：
+- Counter / Gauge / Histogram，支持标签，记录一次观测只需一次加锁和一次二分查找，不影响保活检测
+- 采集回调：在导出时才读取的指标（如退避统计、连接池命中率）注册为回调，平时没有任何开销；
+  其他模块自行累计的总数通过 Counter.sync 导出为计数器
+- 可选的本地HTTP端点（GET /metrics），供 Prometheus 抓取
+- 可选的文本文件输出（原子替换），供 node_exporter 的 textfile collector 读取
+
+依赖项：
+- bisect, threading, time, os: 直方图分桶、线程安全与文件写入
+- http.server: 指标HTTP端点（仅启动端点时使用）
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.Metrics import metrics, MetricsServer
+
+LOGINS = metrics.counter('campus_logins_total', '登录次数', ['result'])
+LATENCY = metrics.histogram('campus_check_latency_seconds', '网络检测耗时')
+
+LOGINS.labels('success').inc()
+LATENCY.observe(0.035)
+
+server = MetricsServer(metrics, port=9810)
+server.start()                      # http://127.0.0.1:9810/metrics
+metrics.write_textfile("campus.prom")
+print(metrics.render())
+```
+"""
+import bisect
+import math
+import os
+import threading
+import time
+
+from src.utils.logger import logger
+
+
+# 默认直方图分桶上界(秒)，覆盖本地回环到慢速认证服务器的耗时
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    """按 Prometheus 文本格式输出数值"""
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class _Metric:
+    """
+    指标基类：按标签值保存子指标，没有标签时自身就是唯一的子指标。
+
+    属性:
+        name (str): 指标名称
+        documentation (str): 指标说明
+        labelnames (tuple): 标签名称
+    """
+    type_name = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        获取指定标签值的子指标，不存在时创建。
+
+        参数:
+            *values: 与 labelnames 顺序一致的标签值
+
+        返回:
+            子指标对象，可调用 inc/set/observe
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"指标 {self.name} 需要 {len(self.labelnames)} 个标签值，实际为 {len(values)} 个")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        """没有标签的指标直接在自身上记录"""
+        if self.labelnames:
+            raise ValueError(f"指标 {self.name} 带有标签，请先调用 labels()")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """
+        返回:
+            list: [(样本名称, 标签名称, 标签值, 数值), ...]
+        """
+        with self._lock:
+            children = list(self._children.items())
+        samples = []
+        for values, child in children:
+            samples.extend(child.samples(self.name, self.labelnames, values))
+        return samples
+
+
+class _ValueChild:
+    """计数器与仪表的子指标"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value):
+        with self._lock:
+            self._value = float(value)
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self, name, labelnames, values):
+        return [(name, labelnames, values, self._value)]
+
+
+class _CounterChild(_ValueChild):
+    """计数器的子指标，可按外部累计值推进"""
+
+    def __init__(self):
+        super().__init__()
+        self._source_total = 0.0
+
+    def sync(self, total):
+        """
+        按外部累计值（如连接池统计）推进计数器。外部统计被重置（如重建连接池后从 0 开始）时，
+        把新的累计值全部计入，计数器本身不会减少。
+
+        参数:
+            total (float): 外部统计的当前累计值
+        """
+        with self._lock:
+            delta = total - self._source_total if total >= self._source_total else total
+            self._source_total = total
+            self._value += delta
+
+
+class Counter(_Metric):
+    """只增不减的计数器，名称应以 _total 结尾"""
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        self._default().inc(amount)
+
+    def sync(self, total):
+        """按外部累计值推进计数器（见 _CounterChild.sync），用于采集回调"""
+        self._default().sync(total)
+
+
+class Gauge(_Metric):
+    """可增可减的仪表，表示当前值（如队列长度）"""
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._default().dec(amount)
+
+    def set(self, value):
+        self._default().set(value)
+
+
+class _HistogramChild:
+    """直方图的子指标：各分桶计数、观测总数与总和"""
+
+    def __init__(self, buckets):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def samples(self, name, labelnames, values):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        samples = []
+        cumulative = 0
+        bucket_labelnames = labelnames + ('le',)
+        for bound, count in zip(self._buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append((f"{name}_bucket", bucket_labelnames, values + (_format_value(float(bound)),), cumulative))
+        samples.append((f"{name}_count", labelnames, values, cumulative))
+        samples.append((f"{name}_sum", labelnames, values, total))
+        return samples
+
+
+class Histogram(_Metric):
+    """直方图，统计观测值的分布（如耗时）"""
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        """
+        返回一个计时上下文管理器，退出时记录耗时。
+
+        示例:
+            >>> with LATENCY.time():
+            >>>     do_something()
+        """
+        return _Timer(self._default())
+
+
+class _Timer:
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """
+    指标注册表（线程安全）。
+
+    属性:
+        collectors (list): 导出前调用的采集回调
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"指标 {name} 已以不同的类型或标签注册")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """注册（或获取已注册的）计数器"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """注册（或获取已注册的）仪表"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """注册（或获取已注册的）直方图"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, collector):
+        """
+        注册采集回调，每次导出前调用，用于更新只在导出时才需要读取的仪表。
+
+        参数:
+            collector (callable): 无参数的回调函数
+
+        返回:
+            callable: 调用即可移除该回调
+        """
+        with self._lock:
+            self.collectors.append(collector)
+
+        def remove():
+            with self._lock:
+                if collector in self.collectors:
+                    self.collectors.remove(collector)
+        return remove
+
+    def render(self, openmetrics=False):
+        """
+        按 Prometheus 文本格式导出全部指标。
+
+        参数:
+            openmetrics (bool): 为 True 时按 OpenMetrics 格式结尾（追加 "# EOF"）
+
+        返回:
+            str: 指标文本
+        """
+        with self._lock:
+            collectors = list(self.collectors)
+            registered = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"指标采集回调失败: {str(e)}")
+        lines = []
+        for metric in registered:
+            # OpenMetrics 中计数器的元数据名称不带 _total 后缀
+            family = metric.name[:-len('_total')] if openmetrics and metric.type_name == 'counter' \
+                and metric.name.endswith('_total') else metric.name
+            lines.append(f"# HELP {family} {metric.documentation}")
+            lines.append(f"# TYPE {family} {metric.type_name}")
+            for name, labelnames, values, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """
+        把指标原子地写入文本文件（先写临时文件再替换），供 node_exporter textfile collector 读取。
+
+        参数:
+            path (str): 输出文件路径，node_exporter 要求扩展名为 .prom
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+class MetricsServer:
+    """
+    在后台线程中提供 GET /metrics 的本地HTTP端点。
+
+    属性:
+        registry (MetricsRegistry): 导出的注册表
+        host (str): 监听地址，默认只监听本机
+        port (int): 监听端口，0 表示由系统分配
+    """
+
+    def __init__(self, registry=None, host='127.0.0.1', port=9810):
+        self.registry = registry or metrics
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        """
+        启动HTTP端点。
+
+        返回:
+            str: 指标地址，如 http://127.0.0.1:9810/metrics
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in (self.headers.get('Accept') or '')
+                payload = registry.render(openmetrics=openmetrics).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+                                 if openmetrics else 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+        logger.info(f"指标端点已启动: http://{self.host}:{self.port}/metrics")
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def stop(self):
+        """停止HTTP端点"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# 全局指标注册表，各模块在导入时注册自己的指标
+# 使用方式：from src.core.Metrics import metrics
+metrics = MetricsRegistry()
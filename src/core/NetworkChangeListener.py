@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+系统网络变化监听模块
+
+轮询式检测只能在下一次检测时才发现网线拔出、WiFi 切换等变化。此模块监听操作系统的网络变化事件，
+在网卡启停、地址变化或默认路由变化时立即回调，由调用方唤醒连通性检测：
+- Linux：订阅 netlink 路由套接字（NETLINK_ROUTE）的链路、地址与路由广播，事件到达即回调，延迟为毫秒级
+- 其他平台或 netlink 不可用时：每秒比较一次本机网络特征（默认路由的源地址与本机地址列表），
+  该比较只查询本机路由表，不发送任何数据包
+- 短时间内的一连串事件（如网卡启动时连续的链路、地址、路由消息）合并为一次回调
+
+依赖项：
+- socket, struct, threading, time: netlink 套接字、消息解析与后台线程
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.NetworkChangeListener import NetworkChangeListener
+
+listener = NetworkChangeListener(lambda reason: print("网络变化:", reason))
+listener.start()
+print(listener.backend)  # 'netlink' 或 'polling'
+...
+listener.stop()
+```
+"""
+import socket
+import struct
+import threading
+import time
+
+from src.utils.logger import logger
+
+
+# netlink 路由消息类型与多播组（linux/netlink.h、linux/rtnetlink.h）
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+RT_TABLE_MAIN = 254
+# 网卡标志中决定是否可用的位：IFF_UP、IFF_RUNNING、IFF_LOWER_UP
+LINK_STATE_FLAGS = 0x1 | 0x40 | 0x10000
+
+NLMSG_HEADER = struct.Struct('=IHHII')
+IFINFOMSG = struct.Struct('=BxHiII')
+
+# 查询默认路由源地址时"连接"的公网地址，UDP connect 只查路由表，不会发送数据包
+ROUTE_PROBE_ADDRESS = ('223.5.5.5', 53)
+
+
+class NetworkChangeListener:
+    """
+    系统网络变化监听器，在后台守护线程中运行。
+
+    属性:
+        callback (callable): 网络变化时调用，参数为变化原因说明(str)
+        backend (str): 实际使用的监听方式，'netlink' 或 'polling'，启动前为 None
+        settle (float): 合并连续事件的等待时间(秒)
+        poll_interval (float): 轮询方式的比较间隔(秒)
+        events (int): 已触发的回调次数
+    """
+
+    def __init__(self, callback, settle=0.2, poll_interval=1.0, backend=None):
+        """
+        参数:
+            callback (callable): 网络变化时调用，参数为变化原因说明(str)；在监听线程中执行，应尽快返回
+            settle (float): 合并连续事件的等待时间(秒)
+            poll_interval (float): 轮询方式的比较间隔(秒)
+            backend (str, optional): 强制使用 'netlink' 或 'polling'，默认优先 netlink
+        """
+        self.callback = callback
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.backend = None
+        self.events = 0
+        self._preferred_backend = backend
+        self._link_flags = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        启动监听线程，优先使用 netlink，不可用时退回轮询。
+
+        返回:
+            str: 实际使用的监听方式
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self.backend
+        self._stop_event.clear()
+        sock = None
+        if self._preferred_backend != 'polling':
+            sock = self._open_netlink()
+        if sock is not None:
+            self.backend = 'netlink'
+            target, args = self._run_netlink, (sock,)
+        else:
+            self.backend = 'polling'
+            target, args = self._run_polling, ()
+        self._thread = threading.Thread(target=target, args=args, name="NetworkChangeListener", daemon=True)
+        self._thread.start()
+        logger.debug(f"网络变化监听已启动，方式: {self.backend}")
+        return self.backend
+
+    def stop(self):
+        """停止监听线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _notify(self, reasons):
+        """合并后的事件回调，回调异常只记录日志"""
+        reason = '、'.join(dict.fromkeys(reasons))
+        self.events += 1
+        logger.debug(f"检测到系统网络变化: {reason}")
+        try:
+            self.callback(reason)
+        except Exception as e:
+            logger.error(f"处理网络变化事件失败: {str(e)}")
+
+    # ---------------- netlink ----------------
+
+    @staticmethod
+    def _open_netlink():
+        """
+        打开并订阅 netlink 路由套接字。
+
+        返回:
+            socket.socket or None: 非 Linux 或打开失败时返回 None
+        """
+        if not hasattr(socket, 'AF_NETLINK'):
+            return None
+        groups = RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, groups))
+            sock.settimeout(0.5)
+            # 请求一次网卡列表，记录各网卡当前的启停状态，之后的 NEWLINK 消息才能判断是否发生了变化
+            request = NLMSG_HEADER.pack(NLMSG_HEADER.size + 4, RTM_GETLINK, NLM_F_REQUEST | NLM_F_DUMP, 1, 0)
+            sock.send(request + struct.pack('=Bxxx', socket.AF_UNSPEC))
+            return sock
+        except OSError as e:
+            logger.debug(f"无法订阅 netlink 网络事件，改用轮询: {str(e)}")
+            return None
+
+    def _run_netlink(self, sock):
+        """netlink 监听循环：收到相关事件后再等待 settle 秒合并后续事件，然后回调一次"""
+        pending = []
+        deadline = None
+        try:
+            while not self._stop_event.is_set():
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # 连续事件期间合并时间已到，先回调再继续接收
+                        self._notify(pending)
+                        pending, deadline = [], None
+                        sock.settimeout(0.5)
+                    else:
+                        # 超时为 0 会把套接字变为非阻塞，recv 将抛出 BlockingIOError
+                        sock.settimeout(max(remaining, 0.01))
+                try:
+                    data = sock.recv(65536)
+                except (socket.timeout, BlockingIOError):
+                    data = b''
+                except OSError as e:
+                    logger.error(f"读取 netlink 网络事件失败: {str(e)}")
+                    break
+                pending.extend(self._parse_netlink(data))
+                if pending and deadline is None:
+                    deadline = time.monotonic() + self.settle
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._notify(pending)
+                    pending, deadline = [], None
+                    sock.settimeout(0.5)
+        finally:
+            sock.close()
+
+    def _parse_netlink(self, data):
+        """
+        解析一批 netlink 消息，只保留会影响连通性的变化。
+
+        参数:
+            data (bytes): recv 收到的数据
+
+        返回:
+            list: 变化原因说明列表
+        """
+        reasons = []
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length, msg_type, _, seq, _ = NLMSG_HEADER.unpack_from(data, offset)
+            if length < NLMSG_HEADER.size:
+                break
+            body = offset + NLMSG_HEADER.size
+            if msg_type in (RTM_NEWLINK, RTM_DELLINK) and body + IFINFOMSG.size <= len(data):
+                _, _, index, flags, _ = IFINFOMSG.unpack_from(data, body)
+                # 无线网卡会频繁发送不改变链路状态的 NEWLINK 消息，只在启停状态变化时回调；
+                # 启动时请求的网卡列表（seq 非 0）只用于记录初始状态
+                state = None if msg_type == RTM_DELLINK else flags & LINK_STATE_FLAGS
+                if self._link_flags.get(index) != state:
+                    if seq == 0:
+                        reasons.append('网卡已移除' if state is None else
+                                       ('网卡已连接' if state == LINK_STATE_FLAGS else '网卡已断开'))
+                    self._link_flags[index] = state
+            elif msg_type in (RTM_NEWADDR, RTM_DELADDR):
+                reasons.append('本机地址已变化')
+            elif msg_type in (RTM_NEWROUTE, RTM_DELROUTE) and body + 5 <= len(data):
+                dst_len, table = data[body + 1], data[body + 4]
+                if dst_len == 0 and table == RT_TABLE_MAIN:
+                    reasons.append('默认路由已变化')
+            offset += (length + 3) & ~3
+        return reasons
+
+    # ---------------- polling ----------------
+
+    @staticmethod
+    def network_signature():
+        """
+        本机网络特征：默认路由的源地址与本机地址列表，任一变化都说明网卡或网络发生了切换。
+
+        返回:
+            tuple: (默认路由源地址 or None, 本机地址元组)
+        """
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect(ROUTE_PROBE_ADDRESS)
+                route_ip = sock.getsockname()[0]
+        except OSError:
+            route_ip = None
+        try:
+            addresses = tuple(sorted({info[4][0] for info in socket.getaddrinfo(socket.gethostname(), None)}))
+        except OSError:
+            addresses = ()
+        return route_ip, addresses
+
+    def _run_polling(self):
+        """轮询监听循环：特征变化时回调"""
+        previous = self.network_signature()
+        while not self._stop_event.wait(self.poll_interval):
+            current = self.network_signature()
+            if current == previous:
+                continue
+            reasons = []
+            if current[0] != previous[0]:
+                reasons.append('默认路由已变化' if current[0] else '无默认路由')
+            if current[1] != previous[1]:
+                reasons.append('本机地址已变化')
+            previous = current
+            self._notify(reasons)
@@ -7,11 +7,25 @@
 主要功能包括：
 - 网络连接状态检查
 - 获取认证相关URL
-- 校园网账号登录（含重试机制）
+- 校园网账号登录（含重试机制），登录前互不依赖的网络步骤并发执行
 - 校园网账号登出（含重试机制）
+- 共享的长连接池，所有请求复用TCP/TLS连接
+- 认证参数（wlanuserip/mac）按本机IP缓存，重复登录/登出无需再次访问认证页面
+- 多探测器并发竞速的网络检查，一次往返即可判断在线状态
+- 认证服务器出错时抖动退避与熔断，避免大量客户端同时重试
+- 连通性状态机（在线/未登录/无链路/认证服务器不可达/登录中），状态变化时推送迁移事件
+- 检测、登录各阶段耗时与重试次数等运行指标（src.core.Metrics）
+- 登录流程按阶段与重试记录调用链（src.core.Tracing），可导出为 Chrome 追踪格式
+- 从多账号库中选出最健康的账号登录，失败时自动换用下一个账号
 
 依赖项：
 - requests: 用于HTTP请求
+- src.core.HttpSession: 连接池化HTTP会话
+- src.core.ConnectivityProbe: 连通性探测引擎
+- src.core.BackoffPolicy: 退避与熔断策略
+- src.core.ConnectivityState: 连通性状态机
+- src.core.Metrics: 运行指标
+- src.core.Tracing: 登录流程调用链追踪
 - src.utils.logger: 日志记录
 - src.core.Credentials: 凭证管理
 
@@ -33,15 +47,64 @@ disconnect_success = networkmanager.dislogin()
 
 # 使用指定账号登出
 disconnect_success = networkmanager.dislogin(username="user123")
+
+# 从多账号库（credentials.accounts）中选出最健康的账号登录，返回登录成功的用户名
+username = networkmanager.login_from_vault()
+
+# 切换到本地模拟认证服务器（如 src/tool/mock_portal.py）
+networkmanager.apply_config({'AUTH_SCHEME': 'http', 'AUTH_DOMAIN': '127.0.0.1:8080'})
+
+# 查看连接池复用情况
+pool_stats = networkmanager.get_pool_stats()
+
+# 查看最近一次登录各阶段的耗时
+print(networkmanager.last_login_timings)
+
+# 导出最近的登录调用链（各阶段、每次重试），可用 chrome://tracing 或 ui.perfetto.dev 打开
+from src.core.Tracing import tracer
+tracer.export("login_trace.json")
+
+# 查看各连通性探测器的耗时统计与每小时探测流量
+print(networkmanager.get_probe_stats())
+print(networkmanager.get_probe_traffic()["bytes_per_hour"])
+
+# 查看退避与熔断统计（被避免的请求数等）
+print(networkmanager.get_backoff_stats())
+
+# 订阅连通性状态迁移事件，只在状态变化时收到通知
+unsubscribe = networkmanager.connectivity.subscribe(lambda t: print(t.previous.label, "->", t.current.label))
 ```
 """
-from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, parse_qs
 import requests
+import socket
+import threading
 import time
 
 from src.utils.logger import logger
 # 导入配置
 from src.core.Credentials import credentials
+from src.core.HttpSession import PooledSession
+from src.core.BackoffPolicy import BackoffPolicy
+from src.core.ConnectivityState import ConnectivityState, ConnectivityStateMachine
+from src.core.ConnectivityProbe import ProbeEngine, HttpProbe, TcpConnectProbe, PortalRedirectProbe
+from src.core.Metrics import metrics
+from src.core.Tracing import tracer
+
+
+CHECKS = metrics.counter('campus_checks_total', '网络检测次数', ['state'])
+CHECK_LATENCY = metrics.histogram('campus_check_latency_seconds', '一次网络检测（各探测器竞速）的耗时(秒)')
+LOGINS = metrics.counter('campus_logins_total', '登录次数', ['result'])
+LOGIN_PHASE = metrics.histogram('campus_login_phase_seconds', '登录各阶段耗时(秒)', ['phase'],
+                                buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+LOGIN_RETRIES = metrics.counter('campus_login_retries_total', '登录重试次数（首次尝试之外的登录请求）')
+CONNECTIVITY_STATE = metrics.gauge('campus_connectivity_state', '当前连通性状态（当前状态为1，其余为0）', ['state'])
+AUTH_REQUESTS_AVOIDED = metrics.counter('campus_auth_requests_avoided_total', '因熔断而未发送的认证请求数')
+RELOGINS_DEFERRED = metrics.counter('campus_relogins_deferred_total', '因退避而推迟的自动重新登录次数')
+BREAKER_OPEN = metrics.gauge('campus_auth_breaker_open', '认证服务器熔断器是否处于熔断状态')
+POOL_REQUESTS = metrics.counter('campus_pool_requests_total', '共享连接池的请求数（hit为复用连接）', ['result'])
+PROBE_BYTES = metrics.counter('campus_probe_bytes_total', '连通性探测消耗的流量字节数')
 
 
 class NetworkManager:
@@ -55,8 +118,29 @@ class NetworkManager:
         USERNAME (str): 默认登录用户名
         PASSWORD (str): 默认登录密码
         MAX_RETRY (int): 操作失败时的最大重试次数
-        AUTH_DOMAIN (str): 认证域名
+        AUTH_DOMAIN (str): 认证域名（可带端口）
+        AUTH_SCHEME (str): 认证服务器使用的协议，"https" 或 "http"（本地模拟认证服务器使用）
         RETRY_INTERVAL (int): 重试间隔时间(秒)
+        AUTH_CACHE_TTL (float): 认证参数缓存的有效期(秒)
+        PROBE_204_URLS (list): 用于连通性探测的 HTTP 204 接口
+        PROBE_MODE (str): TEST_URL 的探测模式，"head" 或 "stream"
+        TCP_PROBE_ADDRESS (tuple): TCP直连探测的目标 (主机, 端口)
+        CONFIG_DEFAULTS (dict): 可通过 apply_config 更新的配置项及其默认值
+        RUNTIME_CONFIG_KEYS (frozenset): 修改后无需重建连接池和探测引擎的配置项
+        probe_engine (ProbeEngine): 连通性探测引擎
+        AUTH_POOL_SIZE (int): 认证服务器连接池大小
+        DEFAULT_POOL_SIZE (int): 其他主机连接池大小
+        session (PooledSession): 所有请求共享的连接池化会话
+        CONFIRM_INITIAL_INTERVAL (float): 登录后轮询结果的初始间隔(秒)
+        CONFIRM_MAX_INTERVAL (float): 登录后轮询结果的最大间隔(秒)
+        last_login_timings (dict): 最近一次登录各阶段的耗时统计
+        backoff (BackoffPolicy): 登录、登出与保活循环共享的退避与熔断策略
+        connectivity (ConnectivityStateMachine): 连通性状态机，可订阅状态迁移事件
+        RELOGIN_BACKOFF_CAP (float): 自动重新登录失败后最长推迟时间(秒)
+        BREAKER_THRESHOLD (int): 认证服务器连续出错多少次后熔断
+        BREAKER_RECOVERY (float): 熔断时长(秒)
+        LOGIN_PIPELINE_WORKERS (int): 登录前并发步骤（获取认证链接、检查账号状态、连通性预检测）的线程数
+        PROBE_HEDGE_DELAY (float): 登录前后的网络检测逐个发起探测时，等待前一个探测的时间(秒)
     
     使用方法：
     1. 获取全局单例：
@@ -102,6 +186,36 @@ class NetworkManager:
         >>>     print("自定义账号登出失败")
     """
     _instance = None  # 类级别私有变量，用于保存类的唯一实例
+    AUTH_POOL_SIZE = 8  # 登录重试与状态检查会并发访问认证服务器，连接池稍大
+    DEFAULT_POOL_SIZE = 4
+    CONFIRM_INITIAL_INTERVAL = 0.1  # 轮询登录结果的初始间隔(秒)
+    CONFIRM_MAX_INTERVAL = 0.8  # 轮询登录结果的最大间隔(秒)
+    DEFAULT_PROBE_204_URLS = [
+        'http://connect.rom.miui.com/generate_204',
+        'http://wifi.vivo.com.cn/generate_204',
+    ]
+    TCP_PROBE_ADDRESS = ('223.5.5.5', 53)  # 阿里公共DNS，使用IP避免DNS解析
+    RELOGIN_BACKOFF_CAP = 300  # 自动重新登录失败后最长推迟时间(秒)
+    BREAKER_THRESHOLD = 3  # 认证服务器连续出错多少次后熔断
+    BREAKER_RECOVERY = 30  # 熔断时长(秒)
+    LOGIN_PIPELINE_WORKERS = 4  # 登录前并发步骤的线程数（每次登录最多3个，留1个给并发的登录）
+    PROBE_HEDGE_DELAY = 0.3  # 登录前后的网络检测只在前一个探测无结论或较慢时才发起下一个
+    # 从配置文件读取的网络参数及其默认值（None 表示配置文件必须提供）
+    CONFIG_DEFAULTS = {
+        'TEST_URL': None,
+        'BASE_URL': None,
+        'USERNAME': None,
+        'PASSWORD': None,
+        'MAX_RETRY': None,
+        'AUTH_DOMAIN': None,
+        'AUTH_SCHEME': 'https',
+        'RETRY_INTERVAL': None,
+        'AUTH_CACHE_TTL': 300,
+        'PROBE_204_URLS': DEFAULT_PROBE_204_URLS,
+        'PROBE_MODE': 'head',
+    }
+    # 每次使用时才读取的配置项，修改后无需重建连接池和探测引擎
+    RUNTIME_CONFIG_KEYS = frozenset({'USERNAME', 'PASSWORD', 'MAX_RETRY', 'RETRY_INTERVAL', 'AUTH_CACHE_TTL'})
 
     def __new__(cls, *args, **kwargs):
         """
@@ -119,116 +233,492 @@ class NetworkManager:
         """
         初始化网络管理类，从配置文件中获取必要的网络参数。
         """
-        self.TEST_URL = credentials.get("TEST_URL")
-        self.BASE_URL = credentials.get("BASE_URL")
-        self.USERNAME = credentials.get("USERNAME")
-        self.PASSWORD = credentials.get("PASSWORD")
-        self.MAX_RETRY = credentials.get("MAX_RETRY")
-        self.AUTH_DOMAIN = credentials.get("AUTH_DOMAIN")
-        self.RETRY_INTERVAL = credentials.get("RETRY_INTERVAL")
-        
-        # # 添加网络状态跟踪变量，用于控制错误日志只在状态变化时显示
-        # self._last_network_status = None  # None: 未初始化, True: 网络在线, False: 网络离线
-        # 
-        # # 添加其他状态跟踪变量
-        # self._last_auth_params_status = None  # 记录最后一次获取认证参数的状态
-        # self._last_empty_credentials_status = None  # 记录最后一次空凭证检查的状态
-        # self._last_logout_fail_status = None  # 记录最后一次登出失败的状态
-        # self._last_get_auth_urls_status = None  # 记录最后一次获取认证链接的状态
+        # 认证参数缓存：(本机IP, 过期时间, wlanuserip, mac)，本机IP变化即视为网卡/网络已切换
+        self._auth_cache = None
+        self._auth_cache_lock = threading.Lock()
+        # 最近一次登录的各阶段耗时
+        self.last_login_timings = {}
+        # 登录前并发执行的网络步骤（获取认证链接、检查账号状态、连通性预检测）使用的线程池
+        self._login_pipeline = ThreadPoolExecutor(max_workers=self.LOGIN_PIPELINE_WORKERS,
+                                                  thread_name_prefix="LoginPipeline")
+        # 登录、登出与保活循环共享的退避与熔断策略
+        self.reset_backoff()
+
+        # 连通性状态机：检测结果只更新状态，状态变化时才通知订阅者（日志、界面、守护进程）
+        self.connectivity = ConnectivityStateMachine()
+        self.connectivity.subscribe(self._log_transition)
+        self._state_lock = threading.Lock()
+        self._logins_in_progress = 0
+        self._observed_state = (ConnectivityState.UNKNOWN, "")
+        # 每次检测、每次登录的订阅者（如历史记录），状态未变化时也会收到通知
+        self._check_subscribers = []
+        self._login_subscribers = []
+        self._subscribers_lock = threading.Lock()
+        # 运行指标：每次检测与登录记录到直方图，其余统计在导出指标时才读取
+        self.subscribe_checks(self._record_check_metrics)
+        self.subscribe_logins(self._record_login_metrics)
+        # 多账号库：每次登录的结果更新对应账号的健康状况（成功/失败次数、最近成功时间）
+        self.subscribe_logins(self._record_account_result)
+        metrics.add_collector(self._collect_metrics)
+
+        self.apply_config({key: credentials.get(key, default) for key, default in self.CONFIG_DEFAULTS.items()})
+        # 配置文件被外部修改并重新加载后（见 src.core.ConfigWatcher），立即应用变化的网络参数
+        credentials.subscribe(self._on_config_changed)
+
+    def apply_config(self, config):
+        """
+        更新网络参数，并重建依赖这些参数的连接池和探测引擎。
+
+        只有 CONFIG_DEFAULTS 中列出的配置项会被应用，其余键被忽略；未给出的配置项保持当前值。
+        认证参数缓存会被清除，因为认证地址可能已经改变。
+        只修改了 RUNTIME_CONFIG_KEYS 中的配置项（如账号、重试次数）时只更新属性，不重建连接池和探测引擎。
+
+        参数:
+            config (dict): 配置项名称到新值的映射，如 {'AUTH_DOMAIN': '127.0.0.1:8080', 'AUTH_SCHEME': 'http'}
+        """
+        keys = [key for key in self.CONFIG_DEFAULTS if key in config]
+        for key in keys:
+            setattr(self, key, config[key])
+        if getattr(self, 'session', None) is not None and self.RUNTIME_CONFIG_KEYS.issuperset(keys):
+            return
+        self.invalidate_auth_cache("网络配置已更新")
+
+        # 所有请求共享同一个连接池化会话，保活检测与登录重试无需重复握手
+        if getattr(self, 'session', None) is not None:
+            self.session.close()
+        self.session = PooledSession(
+            host_pool_sizes={f"{self.AUTH_SCHEME}://{self.AUTH_DOMAIN}": self.AUTH_POOL_SIZE},
+            default_pool_size=self.DEFAULT_POOL_SIZE,
+        )
+
+        # 连通性探测引擎，所有探测器共享上面的连接池
+        if getattr(self, 'probe_engine', None) is not None:
+            self.probe_engine.shutdown()
+        self.probe_engine = self._build_probe_engine()
+
+    def _on_config_changed(self, changes):
+        """
+        配置变化的订阅者：应用其中属于网络参数的配置项。
+
+        参数:
+            changes (dict): 变化的配置项到新值的映射
+        """
+        config = {}
+        for key, value in changes.items():
+            if key not in self.CONFIG_DEFAULTS:
+                continue
+            # 变化事件不携带密码明文，从凭证管理器读取
+            if key == 'PASSWORD':
+                value = credentials.get_credentials()[1]
+            # 配置项被删除时恢复默认值，必填的配置项被删除时保持当前值
+            if value is None:
+                value = self.CONFIG_DEFAULTS[key]
+            if value is not None:
+                config[key] = value
+        if config:
+            self.apply_config(config)
+            logger.info(f"已应用新的网络配置: {', '.join(key for key in config if key != 'PASSWORD')}")
 
-    def check_network(self):
+    def get_pool_stats(self):
+        """
+        获取共享连接池的统计信息。
+
+        返回:
+            dict: 包含 'requests'、'pool_hits'、'pool_misses'、'hit_rate' 的统计字典
+        """
+        return self.session.stats()
+
+    def reset_backoff(self):
+        """丢弃累计的退避与熔断状态，换用新的退避策略（如基准测试在场景之间互不影响）"""
+        self.backoff = BackoffPolicy(cap=self.RELOGIN_BACKOFF_CAP, failure_threshold=self.BREAKER_THRESHOLD,
+                                     recovery_timeout=self.BREAKER_RECOVERY)
+
+    def get_backoff_stats(self):
+        """
+        获取退避与熔断策略的统计信息。
+
+        返回:
+            dict: 包含 'state'、'requests'、'failures'、'avoided_requests'、'deferred_relogins' 等键的统计字典
+        """
+        return self.backoff.stats()
+
+    def _build_probe_engine(self):
+        """
+        根据当前配置构建连通性探测引擎。
+
+        默认探测器：
+        - PROBE_204_URLS 中的每个 HTTP 204 接口
+        - 对 TEST_URL 的 HEAD 或流式 GET 请求（由 PROBE_MODE 决定，均不下载页面内容）
+        - 到 TCP_PROBE_ADDRESS 的 TCP 直连（识别无链路/无路由）
+        - BASE_URL 的认证页重定向检查（识别认证网关是否可达）
+
+        返回:
+            ProbeEngine: 探测引擎实例
+        """
+        # 线程数为探测器数量的两倍，避免上一轮未结束的慢探测占满线程
+        engine = ProbeEngine(max_workers=2 * (len(self.PROBE_204_URLS) + 3))
+        probes = [
+            HttpProbe(f"http_204_{index}", self.session, url, self.AUTH_DOMAIN, traffic=engine.traffic)
+            for index, url in enumerate(self.PROBE_204_URLS)
+        ]
+        probes.append(HttpProbe("test_url", self.session, self.TEST_URL, self.AUTH_DOMAIN,
+                                mode=self.PROBE_MODE, expected_status=(200,), traffic=engine.traffic))
+        probes.append(TcpConnectProbe("tcp_connect", *self.TCP_PROBE_ADDRESS))
+        probes.append(PortalRedirectProbe("portal_redirect", self.session, self.BASE_URL, self.AUTH_DOMAIN,
+                                          traffic=engine.traffic))
+        for probe in probes:
+            engine.register(probe)
+        return engine
+
+    def get_probe_stats(self):
+        """
+        获取各连通性探测器的耗时与结论统计。
+
+        返回:
+            dict: 探测器名称到统计字典的映射
+        """
+        return self.probe_engine.stats()
+
+    def get_probe_traffic(self):
+        """
+        获取连通性探测（保活循环）消耗的流量统计。
+
+        返回:
+            dict: 包含 'requests'、'bytes_sent'、'bytes_received'、'bytes_total'、'elapsed'、'bytes_per_hour'
+        """
+        return self.probe_engine.traffic_stats()
+
+    def check_network(self, hedged=False):
         """
         检查网络连接状态，判断网络是否连接成功且不在认证页面。
 
+        所有探测器并发执行，以最先给出明确结论的探测结果为准。检测结果会归类为连通性状态并更新
+        connectivity 状态机，状态变化时才会输出日志、通知订阅者。
+
+        参数:
+            hedged (bool): 为 True 时按顺序逐个发起探测，得出结论后不再发起其余探测（见 ProbeEngine.check），
+                           登录前后的检测只关心是否在线，通常只需一个请求
+
         返回:
             bool: 若网络连接成功且不在认证页返回 True，否则返回 False。
         """
-        headers = {'User-Agent': 'Mozilla/5.0'}
+        check_start = time.perf_counter()
         try:
-            # 发送 GET 请求检测网络状态
-            response = requests.get(url=self.TEST_URL, headers=headers, timeout=self.RETRY_INTERVAL)
-            # 判断状态码是否为 200 且响应 URL 不包含认证域名
-            is_connected = response.status_code == 200 and self.AUTH_DOMAIN not in response.url
-            
-            # 跟踪网络状态变化，只在状态变化时输出日志
-            if not is_connected:
-                # if self._last_network_status is not False:
-                logger.warning("网络未连接或处于认证页面")
-                # self._last_network_status = False
-                return False
-            return True
-        except requests.exceptions.ConnectionError:
-            # 只在状态变化时记录错误
-            # if self._last_network_status is not False:
-            logger.error('网络连接异常: 无法连接到测试网站')
-            # self._last_network_status = False
-            return False
-        except requests.exceptions.Timeout:
-            # 只在状态变化时记录错误
-            # if self._last_network_status is not False:
-            logger.error(f'网络连接超时: 超过{self.RETRY_INTERVAL}秒未收到响应')
-            # self._last_network_status = False
-            return False
+            outcome = self.probe_engine.check(timeout=self.RETRY_INTERVAL,
+                                              hedge_delay=self.PROBE_HEDGE_DELAY if hedged else None)
         except Exception as e:
-            # 只在状态变化时记录错误
-            # if self._last_network_status is not False:
             logger.error(f'网络检测异常: {str(e)}')
-            # self._last_network_status = False
             return False
+        state, detail = self.classify_outcome(outcome)
+        self.report_connectivity(state, detail)
+        self._publish(self._check_subscribers, state, time.perf_counter() - check_start, detail)
+        return outcome.online
+
+    def classify_outcome(self, outcome):
+        """
+        把一次竞速探测的结果归类为连通性状态。
+
+        - 有探测器确认在线：ONLINE
+        - 没有任何探测目标响应（超时、网络不可达）：NO_LINK
+        - 认证页重定向探测确认认证网关不可达：PORTAL_DOWN
+        - 其他情况（被重定向到认证页、响应被劫持等）：CAPTIVE
+
+        参数:
+            outcome (ProbeOutcome): ProbeEngine.check 的返回值
 
-    def get_auth_urls(self):
+        返回:
+            tuple: (ConnectivityState, detail)
+        """
+        if outcome.online:
+            return ConnectivityState.ONLINE, f"{outcome.winner.name}: {outcome.winner.detail}"
+        if not any(result.reachable for result in outcome.results):
+            if outcome.conclusive:
+                return ConnectivityState.NO_LINK, f"{outcome.winner.name}: {outcome.winner.detail}"
+            return ConnectivityState.NO_LINK, f"超过{self.RETRY_INTERVAL}秒未收到任何响应"
+        portal = next((result for result in outcome.results if result.name == 'portal_redirect'), None)
+        if portal is not None and portal.reachable is False:
+            return ConnectivityState.PORTAL_DOWN, f"{portal.name}: {portal.detail}"
+        if outcome.conclusive:
+            return ConnectivityState.CAPTIVE, f"{outcome.winner.name}: {outcome.winner.detail}"
+        return ConnectivityState.CAPTIVE, "未能确认在线"
+
+    def report_connectivity(self, state, detail=""):
+        """
+        上报一次检测得到的连通性状态。
+
+        登录进行中时只有 ONLINE 会立即生效，其余状态先记录下来，登录结束后再应用，
+        避免登录过程中的检测（如强制下线后的检查）打断"登录中"状态。
+
+        参数:
+            state (ConnectivityState): 检测得到的状态
+            detail (str, optional): 状态说明
+        """
+        with self._state_lock:
+            self._observed_state = (state, detail)
+            if self._logins_in_progress and state != ConnectivityState.ONLINE:
+                return
+        self.connectivity.update(state, detail)
+
+    def _begin_login(self):
+        """进入登录流程，状态切换为 LOGGING_IN"""
+        with self._state_lock:
+            self._logins_in_progress += 1
+        self.connectivity.update(ConnectivityState.LOGGING_IN, "开始登录")
+
+    def _end_login(self):
+        """结束登录流程，登录失败时恢复为登录期间最后一次检测到的状态"""
+        with self._state_lock:
+            self._logins_in_progress -= 1
+            if self._logins_in_progress:
+                return
+            state, detail = self._observed_state
+        if self.connectivity.state == ConnectivityState.LOGGING_IN:
+            if state == ConnectivityState.ONLINE:
+                # 登录失败时不能沿用登录前的在线结论
+                state, detail = ConnectivityState.CAPTIVE, "登录失败"
+            self.connectivity.update(state, detail)
+
+    def subscribe_checks(self, callback):
+        """
+        订阅每一次网络检测的结果（与 connectivity.subscribe 不同，状态未变化时也会通知）。
+
+        参数:
+            callback (callable): 回调函数，参数为 (state: ConnectivityState, latency: float, detail: str)
+
+        返回:
+            callable: 调用即可取消订阅
+        """
+        return self._subscribe(self._check_subscribers, callback)
+
+    def subscribe_logins(self, callback):
+        """
+        订阅每一次登录的结果。
+
+        参数:
+            callback (callable): 回调函数，参数为 (username: str, success: bool, timings: dict)，
+                                 timings 与 last_login_timings 的格式相同
+
+        返回:
+            callable: 调用即可取消订阅
+        """
+        return self._subscribe(self._login_subscribers, callback)
+
+    def _subscribe(self, subscribers, callback):
+        with self._subscribers_lock:
+            subscribers.append(callback)
+
+        def unsubscribe():
+            with self._subscribers_lock:
+                if callback in subscribers:
+                    subscribers.remove(callback)
+        return unsubscribe
+
+    def _publish(self, subscribers, *args):
+        """依次调用订阅者，订阅者的异常只记录日志，不影响检测和登录流程"""
+        with self._subscribers_lock:
+            callbacks = list(subscribers)
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"网络事件订阅者处理失败: {str(e)}")
+
+    @staticmethod
+    def _record_check_metrics(state, latency, detail):
+        """检测订阅者：记录检测次数与耗时"""
+        CHECKS.labels(state.value).inc()
+        CHECK_LATENCY.observe(latency)
+
+    @staticmethod
+    def _record_login_metrics(username, success, timings):
+        """登录订阅者：记录登录结果、各阶段耗时与重试次数"""
+        LOGINS.labels('success' if success else 'failure').inc()
+        for phase in ('auth_urls', 'precheck', 'preprobe', 'submit', 'confirm', 'verify', 'total'):
+            LOGIN_PHASE.labels(phase).observe(timings.get(phase, 0.0))
+        if timings.get('attempts', 0) > 1:
+            LOGIN_RETRIES.inc(timings['attempts'] - 1)
+
+    def _collect_metrics(self):
+        """导出指标前读取状态机、退避、连接池与探测流量的当前统计"""
+        current = self.connectivity.state
+        for state in ConnectivityState:
+            CONNECTIVITY_STATE.labels(state.value).set(1 if state == current else 0)
+        backoff = self.backoff.stats()
+        # 累计值导出为计数器；重建连接池或探测引擎后统计从 0 开始，计数器仍保持递增
+        AUTH_REQUESTS_AVOIDED.sync(backoff['avoided_requests'])
+        RELOGINS_DEFERRED.sync(backoff['deferred_relogins'])
+        BREAKER_OPEN.set(1 if backoff['state'] == 'open' else 0)
+        pool = self.session.stats()
+        POOL_REQUESTS.labels('hit').sync(pool['pool_hits'])
+        POOL_REQUESTS.labels('miss').sync(pool['pool_misses'])
+        PROBE_BYTES.sync(self.probe_engine.traffic_stats()['bytes_total'])
+
+    @staticmethod
+    def _log_transition(transition):
+        """
+        连通性状态迁移的日志订阅者。
+
+        参数:
+            transition (StateTransition): 状态迁移事件
+        """
+        message = (f"网络状态: {transition.previous.label} → {transition.current.label}"
+                   f"（{transition.detail}，上一状态持续 {transition.duration:.1f} 秒）")
+        if transition.current in (ConnectivityState.ONLINE, ConnectivityState.LOGGING_IN):
+            logger.info(message)
+        else:
+            logger.warning(message)
+
+    def get_local_ip(self):
+        """
+        获取访问认证服务器时使用的本机IP地址，用于识别当前所在的网卡/网络。
+
+        通过对 BASE_URL 所在主机"连接"一个UDP套接字来让系统选择路由，该操作不会发送任何数据包。
+
+        返回:
+            str or None: 本机IP地址，无可用路由时返回 None
+        """
+        host = urlparse(self.BASE_URL).hostname or self.AUTH_DOMAIN
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect((host, 80))
+                return sock.getsockname()[0]
+        except OSError:
+            return None
+
+    def lookup_auth_cache(self):
+        """
+        查询认证参数缓存，命中时直接构造认证链接。
+
+        返回:
+            dict or None: 缓存有效时返回认证 URL 字典，否则返回 None
+        """
+        local_ip = self.get_local_ip()
+        with self._auth_cache_lock:
+            if self._auth_cache is None or local_ip is None:
+                return None
+            cached_local_ip, expires_at, ip, mac = self._auth_cache
+            if cached_local_ip != local_ip or time.monotonic() >= expires_at:
+                # 网卡/网络切换或缓存过期
+                self._auth_cache = None
+                return None
+        return self.build_auth_urls(ip, mac)
+
+    def store_auth_cache(self, ip, mac):
+        """
+        缓存从认证页面解析出的本机 IP 和 MAC 地址。
+
+        参数:
+            ip (str): 认证页面分配的本机 IP（wlanuserip）
+            mac (str): 本机 MAC 地址
+        """
+        local_ip = self.get_local_ip()
+        if local_ip is None or self.AUTH_CACHE_TTL <= 0:
+            return
+        with self._auth_cache_lock:
+            self._auth_cache = (local_ip, time.monotonic() + self.AUTH_CACHE_TTL, ip, mac)
+
+    def invalidate_auth_cache(self, reason=""):
+        """
+        清除认证参数缓存，下次获取认证链接时重新访问认证页面。
+
+        参数:
+            reason (str, optional): 清除原因，用于日志记录
+        """
+        with self._auth_cache_lock:
+            if self._auth_cache is None:
+                return
+            self._auth_cache = None
+        logger.debug(f"认证参数缓存已清除{f'：{reason}' if reason else ''}")
+
+    def get_auth_urls(self, use_cache=True):
         """
         获取认证相关的 URL，包括登录、登出和检查状态的 URL，其中包含本机的 IP 和 MAC 地址。
 
+        解析出的 IP 和 MAC 会按本机IP缓存 AUTH_CACHE_TTL 秒，缓存有效时不再访问认证页面。
+
+        参数:
+            use_cache (bool): 是否优先使用缓存的认证参数，默认为 True
+
         返回:
             dict or None: 包含 'login'、'disconnect'、'check' 等键的 URL 字典，若获取失败则返回 None。
         """
+        if use_cache:
+            auth_urls = self.lookup_auth_cache()
+            if auth_urls is not None:
+                return auth_urls
         try:
-            # 发送 GET 请求获取认证相关信息
-            response = requests.get(self.BASE_URL, timeout=self.RETRY_INTERVAL)
-            # 解析响应 URL
-            parsed_url = urlparse(response.url)
-            # 解析 URL 中的查询参数
-            query_params = parse_qs(parsed_url.query)
-            # 安全地获取参数值
-            ip = query_params.get('wlanuserip', [''])[0] if isinstance(query_params.get('wlanuserip'), list) else ''
-            mac = query_params.get('mac', [''])[0] if isinstance(query_params.get('mac'), list) else ''
+            # 发送 GET 请求获取认证相关信息；第一次重定向的目标通常已带有参数，无需再请求认证页
+            response = self.session.get(self.BASE_URL, timeout=self.RETRY_INTERVAL, allow_redirects=False)
+            response.close()
+            location = response.headers.get('Location', '')
+            ip, mac = self.parse_auth_params(location)
+            if (not ip or not mac) and location:
+                # 经过多次重定向才到认证页：跟随重定向后从最终 URL 中解析本机 IP 和 MAC 地址
+                response = self.session.get(urljoin(self.BASE_URL, location), timeout=self.RETRY_INTERVAL)
+                ip, mac = self.parse_auth_params(response.url)
             
             # 检查必要参数是否获取成功
             if not ip or not mac:
-                # 只在状态变化时记录错误
-                # if self._last_auth_params_status is not False:
                 logger.error("未能从认证页面获取到IP、mac参数")
-                # self._last_auth_params_status = False
                 return None
-            # 更新状态为成功
-            # self._last_auth_params_status = True
             
-            return {
-                'login': f'https://{self.AUTH_DOMAIN}/webauth.do?wlanacip=172.16.1.82&wlanuserip={ip}&mac={mac}',
-                'disconnect': f'https://{self.AUTH_DOMAIN}/webdisconn.do?wlanacip=172.16.1.82&wlanuserip={ip}&mac={mac}',
-                'check': f'https://{self.AUTH_DOMAIN}/getAuthResult.do',
-            } 
+            self.store_auth_cache(ip, mac)
+            return self.build_auth_urls(ip, mac)
         except requests.exceptions.Timeout:
-            # 只在状态变化时记录错误
-            # if self._last_get_auth_urls_status != "timeout":
             logger.error("获取认证链接超时，请确认网络已连接切处于校园网环境下")
-            # self._last_get_auth_urls_status = "timeout"
             return None
         except requests.exceptions.ConnectionError:
-            # 只在状态变化时记录错误
-            # if self._last_get_auth_urls_status != "connection_error":
             logger.error("获取认证链接连接失败，请确认当前处于校园网环境下")
-            # self._last_get_auth_urls_status = "connection_error"
             return None
         except Exception as e:
-            # 只在状态变化时记录错误
             error_msg = f"获取认证链接异常: {str(e)}"
-            # if self._last_get_auth_urls_status != error_msg:
             logger.error(error_msg)
-            # self._last_get_auth_urls_status = error_msg
             return None
 
+    @staticmethod
+    def parse_auth_params(url):
+        """
+        从认证页面的重定向 URL 中解析本机的 IP 和 MAC 地址。
+
+        参数:
+            url (str): 访问 BASE_URL 后被重定向到的 URL
+
+        返回:
+            tuple: (ip, mac)，缺失的参数为空字符串
+        """
+        # 解析 URL 中的查询参数
+        query_params = parse_qs(urlparse(url).query)
+        # 安全地获取参数值
+        ip = query_params.get('wlanuserip', [''])[0] if isinstance(query_params.get('wlanuserip'), list) else ''
+        mac = query_params.get('mac', [''])[0] if isinstance(query_params.get('mac'), list) else ''
+        return ip, mac
+
+    def build_auth_urls(self, ip, mac):
+        """
+        根据本机的 IP 和 MAC 地址构造登录、登出和检查状态的 URL。
+
+        参数:
+            ip (str): 认证页面分配的本机 IP（wlanuserip）
+            mac (str): 本机 MAC 地址
+
+        返回:
+            dict: 包含 'login'、'disconnect'、'check' 等键的 URL 字典
+        """
+        return {
+            'login': f'{self.AUTH_SCHEME}://{self.AUTH_DOMAIN}/webauth.do?wlanacip=172.16.1.82&wlanuserip={ip}&mac={mac}',
+            'disconnect': f'{self.AUTH_SCHEME}://{self.AUTH_DOMAIN}/webdisconn.do?wlanacip=172.16.1.82&wlanuserip={ip}&mac={mac}',
+            'check': self.get_check_url(),
+        }
+
+    def get_check_url(self):
+        """
+        获取检查登录状态的 URL，该 URL 与本机 IP、MAC 无关。
+
+        返回:
+            str: getAuthResult.do 的完整 URL
+        """
+        return f'{self.AUTH_SCHEME}://{self.AUTH_DOMAIN}/getAuthResult.do'
+
     def get_data(self, username=None, password=None):
         """
         获取登录、登出和检查状态请求的数据体。
@@ -279,89 +769,431 @@ class NetworkManager:
         }
         return data
 
-    def login(self, username=None, password=None):
+    def _wait_for_auth_result(self, check_url, check_data, session=None):
+        """
+        以指数递增的短间隔轮询 getAuthResult.do，一旦出现拨号成功标志立即返回。
+
+        轮询总时长不超过 RETRY_INTERVAL（即原先固定等待的时长），间隔从 CONFIRM_INITIAL_INTERVAL
+        开始翻倍，最大不超过 CONFIRM_MAX_INTERVAL。
+
+        参数:
+            check_url (str): 检查登录状态的 URL
+            check_data (dict): 检查登录状态的请求数据体
+            session (PooledSession, optional): 发送请求使用的会话，默认为共享会话
+
+        返回:
+            tuple: (check_response, polls)，最后一次检查的响应对象和轮询次数
+        """
+        session = session or self.session
+        deadline = time.perf_counter() + self.RETRY_INTERVAL
+        interval = self.CONFIRM_INITIAL_INTERVAL
+        polls = 0
+        while True:
+            with tracer.span("poll") as span:
+                check_response = session.post(url=check_url, data=check_data, timeout=self.RETRY_INTERVAL)
+                span.set(status=check_response.status_code)
+            polls += 1
+            if check_response.status_code != 200 or '运营商网络拨号成功' in check_response.text:
+                return check_response, polls
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return check_response, polls
+            with tracer.span("poll_wait"):
+                time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.CONFIRM_MAX_INTERVAL)
+
+    def login(self, username=None, password=None, preprobe=True):
         """
         执行登录操作，支持重试机制。若账号已在线，会先执行下线操作。
 
+        登录前互不依赖的网络步骤（获取认证链接、检查账号在线状态、连通性预检测）并发执行，
+        只需一次往返的时间；若本机已经在线且账号已拨号，直接返回成功而不再提交登录。
+        强制下线复用已获取的认证链接，不再重复访问认证页面。
+
+        每次调用的各阶段耗时（秒）会记录在 last_login_timings 中，包括：
+        'auth_urls'（获取认证链接）、'precheck'（检查账号在线状态，含强制下线）、'preprobe'（连通性预检测）、
+        'submit'（提交登录请求）、'confirm'（轮询登录结果）、'verify'（最终网络检查）、'total'，
+        以及 'attempts' 和 'polls' 计数。前三个阶段并发执行，各自记录自身的耗时。
+
         参数:
             username (str, optional): 登录用户名，默认为配置文件中的用户名。
             password (str, optional): 登录密码，默认为配置文件中的密码。
+            preprobe (bool): 是否与登录前步骤并发检测一次网络；调用方刚检测过网络（如 keep_alive）时应传 False
 
         返回:
             bool: 登录成功返回 True，登录失败返回 False。
         """
         username = self.USERNAME if username is None else username
         password = self.PASSWORD if password is None else password
+        timings = {'auth_urls': 0.0, 'precheck': 0.0, 'preprobe': 0.0, 'submit': 0.0, 'confirm': 0.0,
+                   'verify': 0.0, 'total': 0.0, 'attempts': 0, 'polls': 0}
+        self.last_login_timings = timings
+        login_start = time.perf_counter()
         
         # 验证用户名和密码
         if not username or not password:
-            # 只在状态变化时记录错误
-            # if self._last_empty_credentials_status is not False:
             logger.error("用户名或密码为空！")
-            # self._last_empty_credentials_status = False
             return False
-        # 更新状态为成功
-        # self._last_empty_credentials_status = True
-            
-        # 获取认证URLs
-        auth_urls = self.get_auth_urls()
+
+        # 每次登录记录一条调用链，各阶段与每次重试都是其中的区间，可通过 tracer 导出
+        with tracer.trace("login", username=username) as root:
+            self._begin_login()
+            success = False
+            try:
+                success = self._login(username, password, timings, login_start, preprobe)
+                return success
+            finally:
+                root.set(success=success, attempts=timings['attempts'])
+                self._end_login()
+                self._publish(self._login_subscribers, username, success, dict(timings))
+
+    def login_from_vault(self, max_accounts=None, preprobe=True):
+        """
+        从多账号库（credentials.accounts）中选出最健康的账号登录，失败时依次换用下一个账号。
+
+        账号按 AccountVault.pick_healthiest 的规则排序：只考虑未绑定 MAC 或绑定到本机 MAC 的账号，
+        连续失败进入冷却期的账号排在最后。每次登录的结果由登录订阅者记录到账号库中。
+        本机 MAC 只从认证参数缓存中读取，不为选择账号额外访问认证页面：缓存为空时第一个账号按 MAC 未知选择，
+        登录过程获取认证参数后，后续换用的账号即按本机 MAC 选择。
+
+        参数:
+            max_accounts (int, optional): 最多尝试的账号数量，默认尝试全部候选账号
+            preprobe (bool): 同 login()
+
+        返回:
+            str or None: 登录成功的用户名，账号库为空或全部账号登录失败时返回 None
+        """
+        accounts = credentials.accounts
+        if not len(accounts):
+            logger.warning("账号库中没有账号")
+            return None
+        mac = None
+        tried = []
+        while max_accounts is None or len(tried) < max_accounts:
+            mac = mac or self.get_host_mac(cached_only=True)
+            username = accounts.pick_healthiest(mac=mac, exclude=tried)
+            if username is None:
+                break
+            tried.append(username)
+            password = accounts.password(username)
+            if password is None:
+                # 密码无法解密（如密钥已更换），计为一次失败，避免下次仍优先选中
+                accounts.record_result(username, False)
+                continue
+            if self.login(username, password, preprobe=preprobe):
+                return username
+            # 第一次尝试已经检测过网络，换用账号时无需重复
+            preprobe = False
+        logger.error(f"账号库中的账号均登录失败，已尝试: {', '.join(tried) or '无'}")
+        return None
+
+    def get_host_mac(self, cached_only=False):
+        """
+        获取认证页面识别的本机 MAC 地址，优先使用认证参数缓存。
+
+        参数:
+            cached_only (bool): 为 True 时只查询认证参数缓存，缓存无效时不访问认证页面
+
+        返回:
+            str or None: MAC 地址，无法访问认证页面（或 cached_only 时缓存无效）时返回 None
+        """
+        auth_urls = self.lookup_auth_cache() if cached_only else self.get_auth_urls()
         if auth_urls is None:
-            return False
-        
-        # 获取登录 URL
-        login_url = auth_urls['login']
-        # 获取登录请求数据体
-        login_data = self.get_data(username, password)['login']
-        # 获取检查状态 URL
-        check_url = auth_urls['check']
-        # 获取检查状态请求数据体
-        check_data = self.get_data(username, password)['check']
-        
-        # 检查账号在线状态
+            return None
+        return self.parse_auth_params(auth_urls['login'])[1] or None
+
+    @staticmethod
+    def _record_account_result(username, success, timings):
+        """登录订阅者：把账号库中账号的登录结果记录为账号的健康状况"""
+        credentials.accounts.record_result(username, success)
+
+    def _timed_phase(self, name, timings, func, *args):
+        """
+        在区间 name 中执行 func 并把耗时记录到 timings[name]，供登录前的并发步骤使用。
+
+        参数:
+            name (str): 阶段名称
+            timings (dict): 各阶段耗时字典
+            func (callable): 要执行的函数
+            *args: 传给 func 的参数
+
+        返回:
+            func 的返回值
+        """
+        phase_start = time.perf_counter()
         try:
-            check_response = requests.get(url=check_url, data=check_data, timeout=self.RETRY_INTERVAL)
-            if 'errorMsg=' in check_response.text:
-                logger.info(f"{username}账号已在线，执行下线操作")
-                # 执行下线操作但不影响登录流程继续
-                if self.dislogin(username):
-                    logger.info(f"{username}账号已成功下线")
-                else:
-                    logger.warning(f"{username}账号下线失败，继续登录流程")
+            with tracer.span(name):
+                return func(*args)
+        finally:
+            timings[name] = time.perf_counter() - phase_start
+
+    def _precheck_account(self, check_url, check_data):
+        """
+        查询账号当前的拨号状态（getAuthResult.do），该请求与本机 IP、MAC 无关，可与获取认证链接并发执行。
+
+        参数:
+            check_url (str): 检查状态 URL
+            check_data (dict): 检查状态请求数据体
+
+        返回:
+            requests.Response or None: 查询失败时返回 None
+        """
+        try:
+            check_response = self.session.get(url=check_url, data=check_data, timeout=self.RETRY_INTERVAL)
+            span = tracer.current_span()
+            if span is not None:
+                span.set(status=check_response.status_code)
+            return check_response
         except Exception as e:
             logger.warning(f"检查账号在线状态时发生异常: {str(e)}，继续登录流程")
+            return None
+
+    def _login(self, username, password, timings, login_start, preprobe=True):
+        """
+        登录流程主体：并发获取认证链接、检查账号在线状态（与连通性预检测） → 提交登录并确认结果，
+        由 login 在"登录中"状态下调用。
+
+        参数:
+            username (str): 登录用户名
+            password (str): 登录密码
+            timings (dict): 各阶段耗时字典，就地累加
+            login_start (float): 登录开始时间（perf_counter）
+            preprobe (bool): 是否并发执行连通性预检测
+
+        返回:
+            bool: 登录成功返回 True，登录失败返回 False。
+        """
+        # 熔断中时连登录前的获取认证链接、账号状态检查与预检测也不发送，真正停止访问认证服务器
+        if self.backoff.blocked():
+            timings['total'] = time.perf_counter() - login_start
+            logger.warning('认证服务器连续出错，暂停发送登录请求')
+            return False
+
+        data = self.get_data(username, password)
+        # 获取登录请求数据体
+        login_data = data['login']
+        # 检查状态的 URL 与本机 IP、MAC 无关，可以在获取认证链接的同时查询账号状态
+        check_url = self.get_check_url()
+        check_data = data['check']
+
+        # 登录前的三个步骤互不依赖，并发执行
+        with tracer.span("discovery", preprobe=preprobe):
+            futures = {
+                'auth_urls': self._login_pipeline.submit(tracer.bind(self._timed_phase), 'auth_urls', timings,
+                                                          self.get_auth_urls),
+                'precheck': self._login_pipeline.submit(tracer.bind(self._timed_phase), 'precheck', timings,
+                                                         self._precheck_account, check_url, check_data),
+            }
+            if preprobe:
+                futures['preprobe'] = self._login_pipeline.submit(tracer.bind(self._timed_phase), 'preprobe',
+                                                                   timings, self.check_network, True)
+            results = {name: future.result() for name, future in futures.items()}
+        auth_urls = results['auth_urls']
+        check_response = results['precheck']
+
+        # 本机已在线且账号已拨号：无需登录（已在线时认证页面可能不再重定向，获取认证链接会失败）
+        if results.get('preprobe') and check_response is not None and '运营商网络拨号成功' in check_response.text:
+            timings['total'] = time.perf_counter() - login_start
+            logger.info(f'{username}账号已在线，无需登录')
+            logger.debug(f'登录各阶段耗时: {self._format_timings(timings)}')
+            return True
+        if auth_urls is None:
+            timings['total'] = time.perf_counter() - login_start
+            return False
+        # 获取登录 URL
+        login_url = auth_urls['login']
+
+        # 账号在其他设备在线时先强制下线，复用刚获取的认证链接；本机本就离线，无需再检测网络确认下线
+        if check_response is not None and 'errorMsg=' in check_response.text:
+            logger.info(f"{username}账号已在线，执行下线操作")
+            phase_start = time.perf_counter()
+            # 执行下线操作但不影响登录流程继续
+            with tracer.span("forced_logout") as logout_span:
+                logged_out = self.dislogin(username, auth_urls=auth_urls, verify=False)
+                logout_span.set(success=logged_out)
+            timings['precheck'] += time.perf_counter() - phase_start
+            if logged_out:
+                logger.info(f"{username}账号已成功下线")
+            else:
+                logger.warning(f"{username}账号下线失败，继续登录流程")
             
         logger.info(f'正在尝试登录校园网账号: {username}')
 
+        retry_delays = self.backoff.retry_delays()
         for attempt in range(1, self.MAX_RETRY + 1):
-            try:
-                # 发送登录请求
-                login_response = requests.post(url=login_url, data=login_data, timeout=self.RETRY_INTERVAL)
-                # 等待一段时间后检查登录状态
-                time.sleep(self.RETRY_INTERVAL)
-                check_response = requests.post(url=check_url, data=check_data, timeout=self.RETRY_INTERVAL)
-                
-                if check_response.status_code == 200:
-                    if '运营商网络拨号成功' in check_response.text and self.check_network():
-                        logger.info(f'登录成功: {username}')
-                        return True
-                else:
-                    logger.warning(f'第 {attempt} 次登录请求失败，状态码: {login_response.status_code}')
-            except requests.exceptions.Timeout:
-                logger.warning(f'第 {attempt} 次登录请求超时')
-            except requests.exceptions.ConnectionError:
-                logger.warning(f'第 {attempt} 次登录请求连接失败')
-            except Exception as e:
-                logger.warning(f'第 {attempt} 次登录过程中发生异常: {str(e)}')
-        else:
-            logger.warning('登录失败：请检查账号密码是否正确，或先手动下线已登录的账号')
-            return False
+            # 认证服务器熔断中时不再发送请求，避免与其他客户端一起压垮刚恢复的服务器
+            if not self.backoff.allow_request():
+                logger.warning('认证服务器连续出错，暂停发送登录请求')
+                break
+            timings['attempts'] = attempt
+            # 收到认证服务器的非 5xx 响应前按出错处理；每次放行的请求都在 finally 中记录结果，
+            # 否则熔断器半开状态的试探请求永远不会结束，之后的请求全部被拒绝
+            portal_error = True
+            with tracer.span("attempt", attempt=attempt) as attempt_span:
+                try:
+                    # 发送登录请求
+                    phase_start = time.perf_counter()
+                    with tracer.span("submit") as span:
+                        login_response = self.session.post(url=login_url, data=login_data,
+                                                           timeout=self.RETRY_INTERVAL)
+                        span.set(status=login_response.status_code)
+                    timings['submit'] += time.perf_counter() - phase_start
+                    # 轮询登录结果，拨号成功后立即返回而不是固定等待
+                    phase_start = time.perf_counter()
+                    with tracer.span("confirm") as span:
+                        check_response, polls = self._wait_for_auth_result(check_url, check_data)
+                        span.set(status=check_response.status_code, polls=polls)
+                    timings['confirm'] += time.perf_counter() - phase_start
+                    timings['polls'] += polls
+                    portal_error = check_response.status_code >= 500 or login_response.status_code >= 500
+
+                    if check_response.status_code == 200:
+                        if '运营商网络拨号成功' in check_response.text:
+                            phase_start = time.perf_counter()
+                            with tracer.span("verify") as span:
+                                is_connected = self.check_network(hedged=True)
+                                span.set(online=is_connected)
+                            timings['verify'] += time.perf_counter() - phase_start
+                            if is_connected:
+                                timings['total'] = time.perf_counter() - login_start
+                                attempt_span.set(result='success')
+                                logger.info(f'登录成功: {username}')
+                                logger.debug(f'登录各阶段耗时: {self._format_timings(timings)}')
+                                return True
+                        attempt_span.set(result='not_confirmed')
+                    else:
+                        attempt_span.set(result=f'http_{login_response.status_code}')
+                        logger.warning(f'第 {attempt} 次登录请求失败，状态码: {login_response.status_code}')
+                except requests.exceptions.Timeout:
+                    attempt_span.set(result='timeout')
+                    logger.warning(f'第 {attempt} 次登录请求超时')
+                except requests.exceptions.ConnectionError:
+                    attempt_span.set(result='connection_error')
+                    logger.warning(f'第 {attempt} 次登录请求连接失败')
+                except Exception as e:
+                    attempt_span.set(result='error', error=str(e))
+                    logger.warning(f'第 {attempt} 次登录过程中发生异常: {str(e)}')
+                finally:
+                    if portal_error:
+                        self.backoff.record_failure()
+                    else:
+                        self.backoff.record_success()
+            # 认证服务器出错时按抖动退避后再重试，拨号未确认（已等待过 RETRY_INTERVAL）则直接重试
+            if portal_error:
+                if attempt < self.MAX_RETRY:
+                    delay = retry_delays.next()
+                    with tracer.span("backoff_sleep", delay=round(delay, 3)):
+                        time.sleep(delay)
+
+        timings['total'] = time.perf_counter() - login_start
+        # 认证参数可能已失效（如IP被重新分配），下次登录重新获取
+        self.invalidate_auth_cache("登录失败")
+        logger.warning('登录失败：请检查账号密码是否正确，或先手动下线已登录的账号')
+        logger.debug(f'登录各阶段耗时: {self._format_timings(timings)}')
+        return False
 
-    def dislogin(self, username=None):
+    def login_host(self, ip, mac, username, password, session=None):
+        """
+        为指定 IP 和 MAC 的主机提交一次登录并等待拨号结果。
+
+        与 login 不同，此方法不检查账号在线状态、不重试，也不检查本机网络，
+        只负责构造请求并确认拨号结果，供批量登录（如 FleetOrchestrator）调用。
+        网络异常会直接抛出，由调用方决定是否重试。
+
+        参数:
+            ip (str): 主机的 IP（wlanuserip）
+            mac (str): 主机的 MAC 地址
+            username (str): 登录用户名
+            password (str): 登录密码
+            session (PooledSession, optional): 发送请求使用的会话，默认为共享会话
+
+        返回:
+            bool: 拨号成功返回 True，否则返回 False
+        """
+        session = session or self.session
+        auth_urls = self.build_auth_urls(ip, mac)
+        data = self.get_data(username, password)
+        session.post(url=auth_urls['login'], data=data['login'], timeout=self.RETRY_INTERVAL)
+        check_response, _ = self._wait_for_auth_result(auth_urls['check'], data['check'], session=session)
+        return check_response.status_code == 200 and '运营商网络拨号成功' in check_response.text
+
+    @staticmethod
+    def _format_timings(timings):
+        """
+        将阶段耗时字典格式化为便于阅读的日志文本。
+
+        参数:
+            timings (dict): login 记录的阶段耗时字典
+
+        返回:
+            str: 如 "auth_urls=0.052s, precheck=0.031s, ..., attempts=1, polls=2"
+        """
+        return ", ".join(
+            f"{name}={value:.3f}s" if isinstance(value, float) else f"{name}={value}"
+            for name, value in timings.items()
+        )
+
+    def keep_alive(self, username=None, password=None, relogin=True):
+        """
+        保活流水线：检测网络，离线时自动重新登录并确认结果。
+
+        重新登录失败后，下一次自动重新登录按 backoff 的去相关抖动延迟推迟（期间只检测网络），
+        避免大量客户端在同一次故障恢复时以相同节奏反复登录。
+
+        整个流程（检测 → 重新登录 → 确认）都在调用线程中完成，适合在后台线程或守护进程中调用，
+        调用方只需根据返回的状态字典更新界面或记录状态。
+
+        参数:
+            username (str, optional): 重新登录使用的用户名，默认为配置文件中的用户名。
+            password (str, optional): 重新登录使用的密码，默认为配置文件中的密码。
+            relogin (bool): 检测到离线时是否自动重新登录
+
+        返回:
+            dict: 包含以下键的状态字典
+                'was_online' (bool): 检测时网络是否在线
+                'relogin_attempted' (bool): 是否执行了重新登录
+                'relogin_deferred' (bool): 是否因上次重新登录失败后的退避而推迟了本次重新登录
+                'relogin_success' (bool or None): 重新登录是否成功，未执行时为 None
+                'online' (bool): 流程结束时网络是否在线
+                'state' (str): 流程结束时的连通性状态（ConnectivityState 的值）
+        """
+        was_online = self.check_network()
+        status = {
+            'was_online': was_online,
+            'relogin_attempted': False,
+            'relogin_deferred': False,
+            'relogin_success': None,
+            'online': was_online,
+            'state': self.connectivity.state.value,
+        }
+        if was_online:
+            self.backoff.reset_relogin()
+            return status
+        if not relogin:
+            return status
+        # 上次重新登录失败后处于退避期内，本次只检测不登录
+        if not self.backoff.allow_relogin():
+            status['relogin_deferred'] = True
+            return status
+
+        logger.info("检测到网络离线，正在自动重新登录")
+        status['relogin_attempted'] = True
+        # login 内部已经包含拨号结果确认和最终的网络检查
+        # 刚刚已检测过网络，登录时不再重复预检测
+        status['relogin_success'] = bool(self.login(username=username, password=password, preprobe=False))
+        status['online'] = status['relogin_success']
+        status['state'] = self.connectivity.state.value
+        self.backoff.record_relogin(status['relogin_success'])
+        return status
+
+    def dislogin(self, username=None, auth_urls=None, verify=True):
         """
         执行登出操作，支持重试机制。
 
         参数:
             username (str, optional): 登出的用户名，默认为配置文件中的用户名。
+            auth_urls (dict, optional): 已获取的认证链接（如 login 中强制下线时），默认重新获取
+            verify (bool): 是否检测网络以确认已下线；强制下线其他设备上的账号时本机本就离线，可传 False
 
         返回:
             bool: 登出成功返回 True，登出失败返回 False。
@@ -370,16 +1202,12 @@ class NetworkManager:
         
         # 验证用户名
         if not username:
-            # 只在状态变化时记录错误
-            # if self._last_empty_credentials_status is not False:
             logger.error("用户名为空，登出失败")
-            # self._last_empty_credentials_status = False
             return False
-        # 更新状态为成功
-        # self._last_empty_credentials_status = True
             
         # 获取认证URLs
-        auth_urls = self.get_auth_urls()
+        if auth_urls is None:
+            auth_urls = self.get_auth_urls()
         if auth_urls is None:
             logger.error("获取认证URLs失败，登出失败")
             return False
@@ -391,12 +1219,19 @@ class NetworkManager:
         
         logger.info(f'正在尝试登出校园网账号: {username}')
         
+        retry_delays = self.backoff.retry_delays()
         for attempt in range(1, self.MAX_RETRY + 1):
+            if not self.backoff.allow_request():
+                logger.warning('认证服务器连续出错，暂停发送登出请求')
+                break
+            # 与登录相同：收到非 5xx 响应前按出错处理，每次放行的请求都记录结果以结束熔断器的半开试探
+            portal_error = True
             try:
                 # 发送登出请求
-                dislogin_response = requests.post(url=disconnect_url, data=logout_data, timeout=self.RETRY_INTERVAL)
+                dislogin_response = self.session.post(url=disconnect_url, data=logout_data, timeout=self.RETRY_INTERVAL)
+                portal_error = dislogin_response.status_code >= 500
                 # 检查登出是否成功
-                if dislogin_response.status_code == 200 and not self.check_network():
+                if dislogin_response.status_code == 200 and not (verify and self.check_network()):
                     logger.info(f"{username}登出成功")
                     return True
                 else:
@@ -407,12 +1242,18 @@ class NetworkManager:
                 logger.warning(f'第 {attempt} 次登出请求连接失败')
             except Exception as e:
                 logger.warning(f'第 {attempt} 次登出过程中发生异常: {str(e)}')
+            finally:
+                if portal_error:
+                    self.backoff.record_failure()
+                else:
+                    self.backoff.record_success()
+            if portal_error:
+                if attempt < self.MAX_RETRY:
+                    time.sleep(retry_delays.next())
         
-        # 只在状态变化时记录错误
+        self.invalidate_auth_cache("登出失败")
         error_msg = f"{username}登出失败：请检查账号密码是否正确，或先手动下线已登录的账号"
-        # if self._last_logout_fail_status != error_msg:
         logger.error(error_msg)
-        # self._last_logout_fail_status = error_msg
         return False
 
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+自适应保活检测间隔模块
+
+固定间隔的保活检测在网络长时间稳定时产生大量没有意义的探测请求。此模块根据检测结果调整间隔：
+- 网络在线时间隔按倍数增长（如 5 秒 → 10 秒 → 20 秒 …），直到上限（默认 5 分钟）
+- 检测到离线、登录失败或连通性状态发生变化时，立即收紧到最小间隔
+- 收到操作系统的网络变化通知时，收紧间隔并唤醒正在等待的检测循环，立即检测一次
+- 统计当前间隔与最近一小时的探测频率
+
+依赖项：
+- collections, threading, time: 探测记录、线程安全与计时
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.PollScheduler import AdaptivePollScheduler
+from src.core.NetworkManager import networkmanager
+
+scheduler = AdaptivePollScheduler(min_interval=5, max_interval=300)
+unsubscribe = networkmanager.connectivity.subscribe(scheduler.on_transition)
+while True:
+    interval = scheduler.record(networkmanager.check_network())
+    scheduler.wait(interval)  # 可被 scheduler.notify_change() 提前唤醒
+```
+"""
+import threading
+import time
+from collections import deque
+
+from src.utils.logger import logger
+
+
+class AdaptivePollScheduler:
+    """
+    自适应检测间隔调度器（线程安全）。
+
+    属性:
+        min_interval (float): 最小检测间隔(秒)，离线或状态变化后使用
+        max_interval (float): 最大检测间隔(秒)，网络长时间稳定时使用
+        growth (float): 每次检测在线后间隔的增长倍数
+        interval (float): 当前检测间隔(秒)
+        checks (int): 累计检测次数
+        tightened (int): 累计收紧间隔的次数
+    """
+    DEFAULT_MIN_INTERVAL = 5.0
+    DEFAULT_MAX_INTERVAL = 300.0
+    DEFAULT_GROWTH = 2.0
+    RATE_WINDOW = 3600
+
+    def __init__(self, min_interval=None, max_interval=None, growth=None):
+        """
+        参数:
+            min_interval (float, optional): 最小检测间隔(秒)，默认 5 秒
+            max_interval (float, optional): 最大检测间隔(秒)，默认 300 秒
+            growth (float, optional): 在线时间隔的增长倍数，默认 2
+        """
+        self.min_interval = min_interval or self.DEFAULT_MIN_INTERVAL
+        self.max_interval = max(max_interval or self.DEFAULT_MAX_INTERVAL, self.min_interval)
+        self.growth = growth or self.DEFAULT_GROWTH
+        self.interval = self.min_interval
+        self.checks = 0
+        self.tightened = 0
+        self._check_times = deque()
+        self._started_at = time.monotonic()
+        self._wake_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def record(self, online):
+        """
+        记录一次检测结果并计算下一次检测间隔。
+
+        参数:
+            online (bool): 本次检测网络是否在线
+
+        返回:
+            float: 下一次检测前应等待的时间(秒)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.checks += 1
+            self._check_times.append(now)
+            while self._check_times and now - self._check_times[0] > self.RATE_WINDOW:
+                self._check_times.popleft()
+            if online:
+                self.interval = min(self.max_interval, self.interval * self.growth)
+            else:
+                self.interval = self.min_interval
+            return self.interval
+
+    def tighten(self, reason=""):
+        """
+        把检测间隔收紧到最小值。
+
+        参数:
+            reason (str, optional): 收紧原因，用于日志
+
+        返回:
+            bool: 间隔确实被收紧时返回 True，已经是最小间隔时返回 False
+        """
+        with self._lock:
+            if self.interval <= self.min_interval:
+                return False
+            self.interval = self.min_interval
+            self.tightened += 1
+        logger.debug(f"检测间隔收紧到 {self.min_interval:g} 秒{f'（{reason}）' if reason else ''}")
+        return True
+
+    def notify_change(self, reason="网络发生变化"):
+        """
+        外部网络变化通知（如操作系统的网络变化事件）：收紧间隔并唤醒 wait()，立即检测一次。
+
+        参数:
+            reason (str, optional): 变化原因，用于日志
+        """
+        self.tighten(reason)
+        self._wake_event.set()
+
+    def on_transition(self, transition):
+        """
+        连通性状态迁移的订阅者：任何状态变化都收紧检测间隔。
+
+        参数:
+            transition (StateTransition): 状态迁移事件
+        """
+        self.tighten(f"{transition.previous.label} → {transition.current.label}")
+
+    def wait(self, timeout=None):
+        """
+        等待到下一次检测，notify_change() 或 wake() 可以提前唤醒。
+
+        参数:
+            timeout (float, optional): 最长等待时间(秒)，默认为当前检测间隔
+
+        返回:
+            bool: 被提前唤醒返回 True，等待超时返回 False
+        """
+        woken = self._wake_event.wait(self.interval if timeout is None else timeout)
+        self._wake_event.clear()
+        return woken
+
+    def wake(self):
+        """唤醒正在 wait() 的线程，不改变检测间隔。"""
+        self._wake_event.set()
+
+    @property
+    def probes_per_hour(self):
+        """最近一小时内的检测次数（运行不足一小时时按已运行时长折算）"""
+        with self._lock:
+            now = time.monotonic()
+            recent = sum(1 for t in self._check_times if now - t <= self.RATE_WINDOW)
+            elapsed = min(self.RATE_WINDOW, max(now - self._started_at, self.min_interval))
+        return recent * 3600 / elapsed
+
+    def stats(self):
+        """
+        返回:
+            dict: 包含 'interval'、'min_interval'、'max_interval'、'checks'、'tightened'、'probes_per_hour' 的统计字典
+        """
+        probes_per_hour = self.probes_per_hour
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'min_interval': self.min_interval,
+                'max_interval': self.max_interval,
+                'checks': self.checks,
+                'tightened': self.tightened,
+                'probes_per_hour': probes_per_hour,
+            }
@@ -47,9 +47,9 @@ print(message)
 import os
 import subprocess
 import logging
+from datetime import datetime
 from pathlib import Path
 from src.utils.logger import logger
-from PySide6.QtCore import QTime
 
 if os.name == 'nt':
     try:
@@ -107,7 +107,7 @@ class TaskScheduler:
         file_name = os.path.basename(file_path)
         task_name = self.get_full_task_name(file_name)
         try:
-            time_str = QTime.currentTime().toString("HH:mm:ss")
+            time_str = datetime.now().strftime("%H:%M:%S")
             cmd = [
                 "schtasks", "/Create", 
                 "/TN", task_name,
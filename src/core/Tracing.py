@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+调用链追踪模块
+
+此模块为登录等多阶段流程记录嵌套的耗时区间（span），可以看出一次慢登录的时间具体花在哪个阶段、哪一次重试上。
+主要功能包括：
+- tracer.trace(name) 开始一条调用链，tracer.span(name) 在当前调用链中记录嵌套的子区间
+- tracer.bind(func) 让提交到线程池的并发步骤也记录到当前调用链中
+- 不在任何调用链中时 span() 不记录任何内容，保活检测等高频路径几乎没有开销
+- 在内存中保留最近若干条调用链
+- 导出为 JSON 或 Chrome 追踪格式（可用 chrome://tracing 或 https://ui.perfetto.dev 打开）
+
+依赖项：
+- json, os, threading, time, itertools, collections: 计时、线程局部的调用栈与导出
+- src.utils.logger: 日志记录
+
+使用示例：
+```python
+from src.core.Tracing import tracer
+
+with tracer.trace("login", username="user123"):
+    with tracer.span("auth_urls"):
+        ...
+    with tracer.span("attempt", attempt=1) as span:
+        ...
+        span.set(status=200)
+
+print(tracer.last_trace().to_dict())
+tracer.export("login_trace.json", chrome=True)
+```
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from src.utils.logger import logger
+
+
+class Span:
+    """
+    一个耗时区间。
+
+    属性:
+        name (str): 区间名称（阶段名称）
+        span_id (int): 区间编号
+        parent_id (int or None): 父区间编号，根区间为 None
+        start (float): 开始时间（time.time()，Unix 时间戳）
+        duration (float): 耗时(秒)，尚未结束时为 None
+        attributes (dict): 附加属性，如重试次数、状态码
+        thread (str): 记录该区间的线程名称
+        error (str): 区间内抛出的异常，没有异常时为空字符串
+    """
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'duration', 'attributes', 'thread', 'error', '_perf_start')
+
+    def __init__(self, name, span_id, parent_id, attributes):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.thread = threading.current_thread().name
+        self.error = ""
+        self.duration = None
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+
+    def set(self, **attributes):
+        """补充附加属性"""
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._perf_start
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'duration': self.duration,
+            'attributes': self.attributes,
+            'thread': self.thread,
+            'error': self.error,
+        }
+
+
+class _NoopSpan:
+    """不在调用链中时返回的空区间，所有操作都不做任何事"""
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    一条调用链：根区间及其全部子区间。
+
+    属性:
+        trace_id (int): 调用链编号
+        spans (list): 按开始顺序排列的区间，第一个为根区间
+    """
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans = []
+        # 子区间可能在多个线程中同时创建（见 Tracer.bind），编号用计数器分配
+        self._span_ids = itertools.count(1)
+
+    @property
+    def root(self):
+        return self.spans[0] if self.spans else None
+
+    def phase_totals(self):
+        """
+        按区间名称汇总耗时（同名区间累加，如多次重试的 submit）。
+
+        返回:
+            dict: 区间名称到总耗时(秒)的映射
+        """
+        totals = {}
+        for span in self.spans:
+            if span.duration is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def to_dict(self):
+        return {'trace_id': self.trace_id, 'spans': [span.to_dict() for span in self.spans]}
+
+    def to_chrome_events(self):
+        """
+        转换为 Chrome 追踪格式的完整事件（ph='X'），时间单位为微秒。
+
+        返回:
+            list: 事件字典列表
+        """
+        threads = {}
+        events = []
+        for span in self.spans:
+            if span.duration is None:
+                continue
+            args = dict(span.attributes)
+            if span.error:
+                args['error'] = span.error
+            events.append({
+                'name': span.name,
+                'cat': self.root.name,
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': self.trace_id,
+                'tid': threads.setdefault(span.thread, len(threads) + 1),
+                'args': args,
+            })
+        # 进程名称显示为调用链名称，便于在时间线上区分多次登录
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': self.trace_id,
+                       'args': {'name': f"{self.root.name} #{self.trace_id}"}})
+        return events
+
+
+class Tracer:
+    """
+    调用链记录器（线程安全，每个线程有独立的区间栈）。
+
+    属性:
+        max_traces (int): 在内存中保留的调用链数量
+    """
+    MAX_TRACES = 50
+
+    def __init__(self, max_traces=None):
+        self.max_traces = max_traces or self.MAX_TRACES
+        self._traces = deque(maxlen=self.max_traces)
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def trace(self, name, **attributes):
+        """
+        开始一条调用链（若当前线程已在调用链中，则作为其子区间记录）。
+
+        参数:
+            name (str): 根区间名称
+            **attributes: 根区间的附加属性
+
+        返回:
+            上下文管理器，进入时返回根区间 Span
+        """
+        if self._stack():
+            return self.span(name, **attributes)
+        trace = Trace(next(self._ids))
+        with self._lock:
+            self._traces.append(trace)
+        return _SpanContext(self, trace, name, attributes)
+
+    def span(self, name, **attributes):
+        """
+        在当前调用链中记录一个子区间，当前线程不在调用链中时不记录。
+
+        参数:
+            name (str): 区间名称
+            **attributes: 附加属性
+
+        返回:
+            上下文管理器，进入时返回 Span（不在调用链中时返回空区间）
+        """
+        stack = self._stack()
+        if not stack:
+            return _NOOP_SPAN
+        return _SpanContext(self, stack[-1][0], name, attributes)
+
+    def bind(self, func):
+        """
+        把当前线程的调用链上下文绑定到函数上，函数在其他线程（如线程池）中执行时，
+        其中记录的区间仍作为当前区间的子区间。当前线程不在调用链中时原样返回。
+
+        参数:
+            func (callable): 要在其他线程中执行的函数
+
+        返回:
+            callable: 绑定了调用链上下文的函数
+        """
+        stack = self._stack()
+        if not stack:
+            return func
+        context = stack[-1]
+
+        def bound(*args, **kwargs):
+            worker_stack = self._stack()
+            worker_stack.append(context)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                worker_stack.pop()
+        return bound
+
+    def current_span(self):
+        """
+        返回:
+            Span or None: 当前线程正在记录的最内层区间
+        """
+        stack = self._stack()
+        return stack[-1][1] if stack else None
+
+    def traces(self):
+        """
+        返回:
+            list: 内存中保留的调用链，按开始时间排序
+        """
+        with self._lock:
+            return list(self._traces)
+
+    def last_trace(self, name=None):
+        """
+        参数:
+            name (str, optional): 只查找指定名称的调用链
+
+        返回:
+            Trace or None: 最近一条已结束的调用链
+        """
+        for trace in reversed(self.traces()):
+            root = trace.root
+            if root is not None and root.duration is not None and (name is None or root.name == name):
+                return trace
+        return None
+
+    def export(self, path, chrome=True, traces=None):
+        """
+        把调用链写入文件（先写临时文件再替换）。
+
+        参数:
+            path (str): 输出文件路径
+            chrome (bool): True 时输出 Chrome 追踪格式，False 时输出 JSON 调用链列表
+            traces (list, optional): 要导出的调用链，默认为内存中的全部已结束调用链
+
+        返回:
+            int: 导出的调用链数量
+        """
+        traces = [trace for trace in (traces if traces is not None else self.traces())
+                  if trace.root is not None and trace.root.duration is not None]
+        if chrome:
+            payload = {'traceEvents': [event for trace in traces for event in trace.to_chrome_events()],
+                       'displayTimeUnit': 'ms'}
+        else:
+            payload = [trace.to_dict() for trace in traces]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        logger.debug(f"已导出 {len(traces)} 条调用链到 {path}")
+        return len(traces)
+
+    def clear(self):
+        """清除内存中的调用链"""
+        with self._lock:
+            self._traces.clear()
+
+
+class _SpanContext:
+    """记录一个区间的上下文管理器"""
+    __slots__ = ('_tracer', '_trace', '_name', '_attributes', '_span')
+
+    def __init__(self, tracer, trace, name, attributes):
+        self._tracer = tracer
+        self._trace = trace
+        self._name = name
+        self._attributes = attributes
+        self._span = None
+
+    def __enter__(self):
+        stack = self._tracer._stack()
+        parent_id = stack[-1][1].span_id if stack else None
+        span_id = next(self._trace._span_ids)
+        self._span = Span(self._name, span_id, parent_id, self._attributes)
+        self._trace.spans.append(self._span)
+        stack.append((self._trace, self._span))
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._span.finish()
+        if exc_type is not None:
+            self._span.error = f"{exc_type.__name__}: {exc_value}"
+        self._tracer._stack().pop()
+        return False
+
+
+# 全局调用链记录器
+# 使用方式：from src.core.Tracing import tracer
+tracer = Tracer()
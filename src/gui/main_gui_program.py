@@ -11,6 +11,7 @@
 依赖项:
 - PySide6: 用于构建GUI界面
 - AsyncTaskExecutor: 处理异步任务
+- AsyncLoopBridge, AsyncNetworkManager: 以协程方式执行登录、下线等网络操作
 - NetworkManager: 管理网络连接
 - TaskScheduler: 管理Windows计划任务
 - Credentials: 处理凭证存储
@@ -28,14 +29,23 @@ import os
 import shutil
 import subprocess
 import sys
+import time
 import webbrowser
 import tomllib
 import requests
-from PySide6.QtCore import Qt, QPoint, QTime, QEvent, QTimer, QMetaObject, Q_ARG
+from PySide6.QtCore import Qt, QObject, QPoint, QTime, QEvent, QTimer, QMetaObject, Q_ARG, Signal
 from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox, QFileDialog, QTableWidgetItem, QDialog, QDialogButtonBox
 
 from src.core.AsyncTaskExecutor import AsyncTaskExecutor
+from src.core.AsyncLoopBridge import AsyncLoopBridge
+from src.core.AsyncNetworkManager import asyncnetworkmanager
+from src.core.ConnectivityState import ConnectivityState
 from src.core.NetworkManager import networkmanager
+from src.core.PollScheduler import AdaptivePollScheduler
+from src.core.NetworkChangeListener import NetworkChangeListener
+from src.core.ConfigWatcher import ConfigWatcher
+from src.core.HistoryStore import HistoryStore
+from src.core.Metrics import metrics, MetricsServer
 from src.gui.main_ui import Ui_MainWindow
 from src.gui.PswdInput_ui import Ui_Dialog
 from src.utils.logger import logger, setup_logger
@@ -43,6 +53,85 @@ from src.core.TaskScheduler import TaskScheduler
 from src.core.Credentials import credentials
 
 
+class UiStallMonitor(QObject):
+    """
+    界面卡顿监测器，用于度量Qt事件循环是否被阻塞。
+
+    以固定间隔触发心跳定时器，实际触发间隔超出预期的部分即为事件循环被阻塞的时长。
+    超过阈值的阻塞会记录警告日志，便于确认耗时操作没有在主线程中执行。
+
+    属性:
+        HEARTBEAT_MS: 心跳间隔（毫秒）
+        STALL_THRESHOLD: 记为卡顿的阻塞时长阈值（秒）
+        max_stall: 观测到的最大阻塞时长（秒）
+        stall_count: 超过阈值的卡顿次数
+        total_stall: 超过阈值的卡顿累计时长（秒）
+    """
+    HEARTBEAT_MS = 100
+    STALL_THRESHOLD = 0.2
+
+    def __init__(self, parent=None):
+        """
+        初始化并启动卡顿监测。
+
+        参数:
+            parent (QObject, optional): 父对象
+        """
+        super().__init__(parent)
+        self.max_stall = 0.0
+        self.stall_count = 0
+        self.total_stall = 0.0
+        self._last_beat = time.perf_counter()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.HEARTBEAT_MS)
+        self._timer.timeout.connect(self._on_heartbeat)
+        self._timer.start()
+
+    def _on_heartbeat(self):
+        """心跳回调，计算本次事件循环的阻塞时长。"""
+        now = time.perf_counter()
+        stall = now - self._last_beat - self.HEARTBEAT_MS / 1000
+        self._last_beat = now
+        if stall > self.max_stall:
+            self.max_stall = stall
+        if stall > self.STALL_THRESHOLD:
+            self.stall_count += 1
+            self.total_stall += stall
+            logger.warning(f"界面事件循环阻塞 {stall * 1000:.0f} 毫秒")
+
+    def stats(self):
+        """
+        获取卡顿统计。
+
+        返回:
+            dict: 包含 'max_stall'、'stall_count'、'total_stall' 的统计字典
+        """
+        return {
+            'max_stall': self.max_stall,
+            'stall_count': self.stall_count,
+            'total_stall': self.total_stall,
+        }
+
+
+class ConnectivitySignal(QObject):
+    """
+    把连通性状态迁移事件转发到界面线程。
+
+    状态机的订阅者回调在执行检测的后台线程中调用，这里通过Qt信号（跨线程自动排队）
+    把 StateTransition 送回主线程处理。
+
+    系统网络变化事件与配置文件变化事件同样在后台线程中回调，也通过这里转发。
+
+    信号:
+        changed: 状态迁移信号，参数为 StateTransition
+        network_changed: 系统网络变化信号，参数为变化原因说明
+        config_changed: 配置文件变化信号，参数为 {配置项: 新值} 字典
+    """
+    changed = Signal(object)
+    network_changed = Signal(str)
+    config_changed = Signal(dict)
+
+
 class MainWindow(QMainWindow):
     """
     主窗口类，负责创建和管理 GUI 界面。
@@ -54,7 +143,15 @@ class MainWindow(QMainWindow):
         ui: UI界面实例
         task_manager: 任务调度管理器实例
         task_executor: 异步任务执行器实例
+        async_bridge: asyncio事件循环桥接器，执行登录、下线协程
         keep_alive_timer: 网络保活定时器
+        poll_scheduler: 保活检测的自适应间隔调度器
+        ui_stall_monitor: 界面卡顿监测器
+        connectivity_signal: 连通性状态迁移的界面线程转发器
+        network_change_listener: 系统网络变化监听器
+        config_watcher: 配置文件监视器
+        history: 连通性历史记录，打开失败时为 None
+        metrics_server: 运行指标HTTP端点，未启用时为 None
         dragging: 窗口拖动状态标志
         offset: 窗口拖动偏移量
     """
@@ -94,12 +191,47 @@ class MainWindow(QMainWindow):
         self.task_manager = TaskScheduler()
         self.task_executor = AsyncTaskExecutor()
         self.task_executor.finished.connect(self.handle_general_finished)
+        # 登录、下线通过协程接口执行，完成信号与任务执行器相同，共用同一个结果处理函数
+        self.async_bridge = AsyncLoopBridge()
+        self.async_bridge.finished.connect(self.handle_general_finished)
         
-        # 初始化保活功能相关变量
+        # 初始化保活功能相关变量，网络稳定时检测间隔从5秒逐渐放宽到5分钟，离线或状态变化时立即收紧
+        self.poll_scheduler = AdaptivePollScheduler()
         self.keep_alive_timer = QTimer(self)
-        self.keep_alive_timer.setInterval(5000)  # 5秒
+        self._apply_poll_interval()
         self.keep_alive_timer.timeout.connect(self._check_network_status_and_update_tabwiget)
         self.keep_alive_timer.start()
+
+        # 监测界面事件循环是否被阻塞
+        self.ui_stall_monitor = UiStallMonitor(self)
+
+        # 订阅连通性状态迁移，只在状态变化时更新网络状态显示
+        self.connectivity_signal = ConnectivitySignal(self)
+        self.connectivity_signal.changed.connect(self._on_connectivity_changed)
+        networkmanager.connectivity.subscribe(self.connectivity_signal.changed.emit)
+
+        # 监听系统网络变化（网卡启停、地址或默认路由变化），变化时立即检测，不必等待下一次定时检测
+        self.connectivity_signal.network_changed.connect(self._on_network_changed)
+        self.network_change_listener = NetworkChangeListener(self.connectivity_signal.network_changed.emit)
+        self.network_change_listener.start()
+
+        # 记录检测结果、状态迁移与登录历史，供统计在线率与平均恢复时间
+        try:
+            self.history = HistoryStore(HistoryStore.default_path())
+            self._detach_history = self.history.attach(networkmanager)
+        except Exception as e:
+            self.history = None
+            logger.warning(f"无法打开连通性历史记录: {str(e)}")
+
+        # 配置了 METRICS_PORT 时提供 /metrics 运行指标端点
+        self.metrics_server = None
+        self._start_metrics_server(credentials.get('METRICS_PORT', 0))
+
+        # 监视配置文件，被外部修改后只重新加载变化的配置项并更新界面，无需重启
+        self.connectivity_signal.config_changed.connect(self._on_config_changed)
+        self._unsubscribe_config = credentials.subscribe(self.connectivity_signal.config_changed.emit)
+        self.config_watcher = ConfigWatcher()
+        self.config_watcher.start()
         
         # 设置界面日志输出，连接到右侧的日志控件
         setup_logger(log_widget=self.ui.textBrowser_log)
@@ -165,6 +297,26 @@ class MainWindow(QMainWindow):
         # 连接保活按钮信号
         self.ui.pushButton_keeplogin.clicked.connect(self._toggle_keep_network_online)
         
+    def closeEvent(self, event):
+        """
+        关闭窗口时写入并关闭连通性历史记录，停止指标端点、配置文件监视与网络变化监听。
+
+        参数:
+            event: 关闭事件
+        """
+        self.network_change_listener.stop()
+        self.config_watcher.stop()
+        self.async_bridge.shutdown()
+        self._unsubscribe_config()
+        if self.history is not None:
+            self._detach_history()
+            self.history.close()
+            self.history = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        super().closeEvent(event)
+
     def eventFilter(self, obj, event):
         """
         事件过滤器，处理标题栏的鼠标事件以实现窗口拖动。
@@ -377,15 +529,104 @@ class MainWindow(QMainWindow):
         定期检查网络状态，更新UI显示，并在需要时自动尝试登录。
         
         功能:
-        - 检查网络连接状态
-        - 更新UI中的网络状态显示
-        - 在网络离线且保活功能开启时，自动尝试重新登录
+        - 在后台线程中执行保活流水线（检测网络 → 离线时重新登录 → 确认结果）
+        - 主线程只根据流水线返回的状态更新UI中的网络状态显示
         """
+        # 在主线程读取界面状态，后台线程不直接访问控件
+        current_time = QTime.currentTime()
+        # 检查保活按钮是否开启，如果开启则尝试登录,检查当前时间是否在00:00-7:00之间
+        relogin = self.ui.pushButton_keeplogin.isChecked() and (current_time.hour() <= 24 and current_time.hour() > 7)
+        username = self.ui.lineEdit_username.text().strip()
+        password = self.ui.lineEdit_password.text().strip()
+        # 上一次检测尚未结束时不再重复提交，避免断网期间探测任务堆积占满线程池
         self.task_executor.execute_task(
-            func=lambda: networkmanager.check_network(), 
-            op_type="keep_alive_check"
+            func=lambda: networkmanager.keep_alive(username=username, password=password, relogin=relogin), 
+            op_type="keep_alive_check",
+            single_flight=True
         )
 
+    def _on_connectivity_changed(self, transition):
+        """
+        连通性状态迁移的界面处理（主线程），更新网络状态显示。
+
+        参数:
+            transition (StateTransition): 状态迁移事件
+        """
+        if self.poll_scheduler.tighten(f"{transition.previous.label} → {transition.current.label}"):
+            self._apply_poll_interval()
+        if transition.current == ConnectivityState.ONLINE:
+            self.ui.stackedWidget_message_netstatus.setCurrentIndex(1)
+        elif transition.current == ConnectivityState.LOGGING_IN:
+            self.ui.label_black_message_2.setText("登录中...")
+            self.ui.stackedWidget_message_netstatus.setCurrentIndex(0)
+        else:
+            # 离线时显示具体原因：未登录、无网络连接或认证服务器不可达
+            self.ui.label_red_message_2.setText(transition.current.label)
+            self.ui.stackedWidget_message_netstatus.setCurrentIndex(2)
+
+    def _on_network_changed(self, reason):
+        """
+        系统网络变化的界面处理（主线程）：清除认证参数缓存，收紧检测间隔并立即检测一次。
+
+        参数:
+            reason (str): 变化原因说明
+        """
+        networkmanager.invalidate_auth_cache(reason)
+        self.poll_scheduler.tighten(reason)
+        self._apply_poll_interval()
+        self._check_network_status_and_update_tabwiget()
+
+    def _on_config_changed(self, changes):
+        """
+        配置文件被外部修改后的界面处理（主线程）：更新对应的控件与指标端点，网络参数变化时立即检测一次。
+        网络参数本身已由 NetworkManager 应用。
+
+        参数:
+            changes (dict): 变化的配置项到新值的映射
+        """
+        if 'UPDATE_ON_START' in changes:
+            # 只更新显示，不触发保存
+            self.ui.checkBox_update.blockSignals(True)
+            self.ui.checkBox_update.setChecked(bool(changes['UPDATE_ON_START']))
+            self.ui.checkBox_update.blockSignals(False)
+        # 用户正在编辑的输入框不被覆盖
+        if 'USERNAME' in changes and not self.ui.lineEdit_username.hasFocus():
+            self.ui.lineEdit_username.setText(changes['USERNAME'] or '')
+        if 'PASSWORD' in changes and not self.ui.lineEdit_password.hasFocus():
+            # 变化事件不携带密码明文，从凭证管理器读取
+            self.ui.lineEdit_password.setText(credentials.get_credentials()[1] or '')
+        if 'METRICS_PORT' in changes:
+            self._start_metrics_server(changes['METRICS_PORT'])
+        if any(key in networkmanager.CONFIG_DEFAULTS for key in changes):
+            self.poll_scheduler.tighten("配置文件已修改")
+            self._apply_poll_interval()
+            self._check_network_status_and_update_tabwiget()
+
+    def _start_metrics_server(self, port):
+        """
+        （重新）启动运行指标端点，port 为 0 或空时只停止已有端点。
+
+        参数:
+            port (int): 指标端点端口
+        """
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if not port:
+            return
+        try:
+            self.metrics_server = MetricsServer(metrics, port=port)
+            self.metrics_server.start()
+        except OSError as e:
+            self.metrics_server = None
+            logger.warning(f"无法启动指标端点: {str(e)}")
+
+    def _apply_poll_interval(self):
+        """
+        把调度器的当前检测间隔应用到保活定时器（定时器会从现在起重新计时）。
+        """
+        self.keep_alive_timer.setInterval(int(self.poll_scheduler.interval * 1000))
+
     def setup_log_context_menu(self):
         """
         设置日志控件的右键菜单，用于清空日志内容。
@@ -406,12 +647,14 @@ class MainWindow(QMainWindow):
         username = self.ui.lineEdit_username.text().strip()
         password = self.ui.lineEdit_password.text().strip()
         setup_logger(username=username)
-        if self.ui.checkBox.isChecked():
-            credentials.set('username', username)
-            credentials.set('password', password)
-        else:
-            credentials.set('username', '')
-            credentials.set('password', '')
+        # 用户名和密码一起写入，只写一次配置文件
+        with credentials.batch():
+            if self.ui.checkBox.isChecked():
+                credentials.set('username', username)
+                credentials.set('password', password)
+            else:
+                credentials.set('username', '')
+                credentials.set('password', '')
 
     def handle_general_finished(self, success, message, op_type="unknown", extra_data=None):
         """
@@ -568,31 +811,17 @@ class MainWindow(QMainWindow):
                     QMessageBox.critical(self, "错误", f"检查更新失败: {error_msg}")
             
             elif op_type == "keep_alive_check":
-                # 网络在线检测结果处理
-                current_time = QTime.currentTime()
+                # 保活流水线结果处理，登录等耗时操作已在后台线程完成，这里只更新界面
+                # 网络状态显示由 _on_connectivity_changed 在状态变化时更新，这里只记录重新登录结果
                 if success:
-                    if message:
-                        # 网络在线，显示成功状态
-                        self.ui.stackedWidget_message_netstatus.setCurrentIndex(1)
-                        # 检查是否需要记录网络在线日志：
-                        # 1. 如果是首次检测（_last_network_status不存在）
-                        # 2. 或者之前是离线状态（_last_network_status为False）
-                        if not hasattr(self, '_last_network_status') or not self._last_network_status:
-                            logger.info(f"网络在线")
-                        # 更新网络状态记录
-                        self._last_network_status = True
-                    else:
-                        # 网络离线，显示失败状态
-                        self.ui.stackedWidget_message_netstatus.setCurrentIndex(2)
-                        # 更新网络状态记录
-                        self._last_network_status = False
-                        # 检查保活按钮是否开启，如果开启则尝试登录,检查当前时间是否在00:00-7:00之间
-                        # if self.ui.pushButton_keeplogin.isChecked() :
-                        if self.ui.pushButton_keeplogin.isChecked() and (current_time.hour() <= 24 and current_time.hour() > 7):
-                            # 在后台线程执行登录尝试
-                            username = self.ui.lineEdit_username.text().strip()
-                            password = self.ui.lineEdit_password.text().strip()
-                            networkmanager.login(username=username, password=password)
+                    status = message if isinstance(message, dict) else {'online': bool(message)}
+                    if status.get('relogin_attempted'):
+                        logger.info(f"自动重新登录{'成功' if status.get('relogin_success') else '失败'}，"
+                                    f"界面最大阻塞 {self.ui_stall_monitor.max_stall * 1000:.0f} 毫秒")
+                # 根据检测结果调整下一次检测间隔
+                online = success and (message.get('online') if isinstance(message, dict) else bool(message))
+                self.poll_scheduler.record(bool(online))
+                self._apply_poll_interval()
        
         except Exception as e:
             logger.error(f"处理异步任务 {op_type} 结果失败: {e}")
@@ -605,7 +834,7 @@ class MainWindow(QMainWindow):
 
     def login(self):
         """
-        执行登录操作，异步调用NetworkManager进行校园网登录。
+        执行登录操作，通过协程接口（AsyncNetworkManager）非阻塞地进行校园网登录。
         
         功能:
         - 更新UI状态为"登录中"
@@ -620,16 +849,12 @@ class MainWindow(QMainWindow):
 
         username = self.ui.lineEdit_username.text().strip()
         password = self.ui.lineEdit_password.text().strip()
-        # 使用lambda函数绑定参数，直接传递已绑定参数的函数
-        self.task_executor.execute_task(
-            func=lambda: networkmanager.login(username, password), 
-            op_type="login"
-        )
+        self.async_bridge.submit(asyncnetworkmanager.login(username, password), "login")
         self.save_credentials()
 
     def dislogin(self):
         """
-        执行下线操作，异步调用NetworkManager进行校园网下线。
+        执行下线操作，通过协程接口（AsyncNetworkManager）非阻塞地进行校园网下线。
         
         功能:
         - 更新UI状态为"下线中"
@@ -643,11 +868,7 @@ class MainWindow(QMainWindow):
         self.ui.pushButton_dislogin.setEnabled(False)
 
         username = self.ui.lineEdit_username.text()
-        # 直接传递函数和参数
-        self.task_executor.execute_task(
-            func=lambda: networkmanager.dislogin(username), 
-            op_type="dislogin"
-        )
+        self.async_bridge.submit(asyncnetworkmanager.dislogin(username), "dislogin")
         self.save_credentials()
 
     def select_file(self):
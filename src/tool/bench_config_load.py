@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+配置文件加载基准测试工具
+
+在临时目录中生成内容相同的旧版 Python 格式配置文件（local_credentials.py）与 JSON 配置文件，
+分别统计三种加载方式的耗时：
+- exec: 旧版加载方式，importlib 编译并执行 .py 文件
+- ast: 迁移时使用的方式，只解析 .py 文件的语法树、不执行
+- json: 当前的加载方式，解析 JSON 配置文件
+
+依赖项:
+- src.core.Credentials: 默认配置与两种解析方式
+
+使用说明:
+1. 在项目根目录下激活虚拟环境
+2. 运行: python src/tool/bench_config_load.py --runs 2000
+3. 模拟包含大量配置项的文件: python src/tool/bench_config_load.py --extra-keys 500
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 设置项目根目录路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import src.utils.logger  # noqa: F401  日志模块会导入凭证管理器，需先于 Credentials 导入以避免循环导入
+from src.core.Credentials import CredentialManager, DEFAULT_CREDENTIALS
+
+
+def build_config(extra_keys=0):
+    """
+    构造测试用的配置字典。
+
+    参数:
+        extra_keys (int): 在默认配置之外追加的配置项数量
+
+    返回:
+        dict: 配置字典
+    """
+    config = dict(DEFAULT_CREDENTIALS)
+    config['ENCRYPTED_KEY'] = 'k' * 44
+    config['ENCRYPTED_PASSWORD'] = 'p' * 24
+    config['USERNAME'] = 'user123'
+    for index in range(extra_keys):
+        config[f'EXTRA_{index}'] = f'value_{index}'
+    return config
+
+
+def write_legacy_file(path, config):
+    """按旧版格式（带说明文档字符串的 Python 文件）写入配置"""
+    lines = ['"""\n系统配置说明：见 src/core/Credentials.py 中的 DEFAULT_CREDENTIALS\n"""\n', 'CREDENTIALS = {\n']
+    lines.extend(f"    {key!r}: {value!r},\n" for key, value in config.items())
+    lines.append('}\n')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def load_exec(path):
+    """旧版加载方式：编译并执行配置文件"""
+    spec = importlib.util.spec_from_file_location("local_credentials", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.CREDENTIALS
+
+
+def measure(loader, path, runs):
+    """
+    重复调用加载函数并统计耗时。
+
+    返回:
+        dict: 'mean_us'、'p50_us'、'min_us'（微秒）
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        loader(path)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {
+        'mean_us': statistics.mean(samples),
+        'p50_us': statistics.median(samples),
+        'min_us': min(samples),
+    }
+
+
+def main():
+    """解析命令行参数并输出各加载方式的耗时"""
+    parser = argparse.ArgumentParser(description="比较配置文件的各种加载方式")
+    parser.add_argument('--runs', type=int, default=1000, help="每种方式的加载次数，默认1000")
+    parser.add_argument('--extra-keys', type=int, default=0, help="在默认配置之外追加的配置项数量，默认0")
+    parser.add_argument('--json', help="把结果保存为JSON文件")
+    args = parser.parse_args()
+
+    config = build_config(args.extra_keys)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, 'local_credentials.py')
+        json_path = os.path.join(directory, 'local_credentials.json')
+        write_legacy_file(legacy_path, config)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write(CredentialManager._dump(config))
+
+        loaders = {
+            'exec': (load_exec, legacy_path),
+            'ast': (CredentialManager.parse_legacy_file, legacy_path),
+            'json': (CredentialManager.read_config_file, json_path),
+        }
+        for name, (loader, path) in loaders.items():
+            assert loader(path) == config, f"{name} 加载结果与原配置不一致"
+            results[name] = measure(loader, path, args.runs)
+            results[name]['bytes'] = os.path.getsize(path)
+
+    print(f"配置项: {len(config)}，每种方式加载 {args.runs} 次")
+    print(f"{'方式':<8}{'文件(字节)':>12}{'平均(us)':>12}{'p50(us)':>12}{'最快(us)':>12}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['bytes']:>12}{r['mean_us']:>12.1f}{r['p50_us']:>12.1f}{r['min_us']:>12.1f}")
+    print(f"json 相对 exec 加速: {results['exec']['p50_us'] / results['json']['p50_us']:.1f}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+凭证加解密基准测试工具
+
+模拟一个包含大量账号的名册，比较三种方式加密和解密全部密码的耗时：
+- per_call: 旧版方式，每次加解密都创建新的 AES 加密器
+- cached: 复用同一个加密器（CredentialCipher.encrypt/decrypt，首次解密不命中缓存）
+- bulk: 批量接口（CredentialCipher.encrypt_many/decrypt_many），所有数据只调用一次 AES
+另外测量对同一个错误密文反复解密的耗时（旧版每次都重新解码和解密，现在命中失败缓存）。
+
+依赖项:
+- Crypto (pycryptodome): AES 加密
+- src.core.Credentials: CredentialCipher
+
+使用说明:
+1. 在项目根目录下激活虚拟环境
+2. 运行: python src/tool/bench_crypto.py --entries 5000
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import pad, unpad
+
+# 设置项目根目录路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import src.utils.logger  # noqa: F401  日志模块会导入凭证管理器，需先于 Credentials 导入以避免循环导入
+from src.core.Credentials import CredentialCipher
+
+
+def encrypt_per_call(key, data):
+    """旧版加密：每次创建新的加密器"""
+    cipher = AES.new(key, AES.MODE_ECB)
+    return base64.b64encode(cipher.encrypt(pad(data.encode('utf-8'), AES.block_size))).decode()
+
+
+def decrypt_per_call(key, encrypted_data):
+    """旧版解密：每次创建新的加密器，失败时抛出 ValueError"""
+    cipher = AES.new(key, AES.MODE_ECB)
+    return unpad(cipher.decrypt(base64.b64decode(encrypted_data)), AES.block_size).decode('utf-8')
+
+
+def timed(func):
+    """执行 func 并返回 (结果, 耗时毫秒)"""
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    """解析命令行参数并输出各方式的耗时"""
+    parser = argparse.ArgumentParser(description="比较凭证加解密方式的耗时")
+    parser.add_argument('--entries', type=int, default=5000, help="名册中的账号数量，默认5000")
+    parser.add_argument('--bad-repeats', type=int, default=10000, help="重复解密错误密文的次数，默认10000")
+    parser.add_argument('--json', help="把结果保存为JSON文件")
+    args = parser.parse_args()
+
+    key = get_random_bytes(32)
+    passwords = [f"password-{index:06d}" for index in range(args.entries)]
+    results = {}
+
+    encrypted, results['encrypt_per_call_ms'] = timed(lambda: [encrypt_per_call(key, p) for p in passwords])
+    _, results['decrypt_per_call_ms'] = timed(lambda: [decrypt_per_call(key, e) for e in encrypted])
+
+    cipher = CredentialCipher(key)
+    _, results['encrypt_cached_ms'] = timed(lambda: [cipher.encrypt(p) for p in passwords])
+    plain, results['decrypt_cached_ms'] = timed(lambda: [cipher.decrypt(e) for e in encrypted])
+    assert plain == passwords
+
+    cipher = CredentialCipher(key)
+    bulk_encrypted, results['encrypt_bulk_ms'] = timed(lambda: cipher.encrypt_many(passwords))
+    assert bulk_encrypted == encrypted
+    plain, results['decrypt_bulk_ms'] = timed(lambda: cipher.decrypt_many(encrypted))
+    assert plain == passwords
+
+    # 用另一个密钥加密的密文，解密时填充错误
+    bad = encrypt_per_call(get_random_bytes(32), "password")
+
+    def repeat_bad_per_call():
+        for _ in range(args.bad_repeats):
+            try:
+                decrypt_per_call(key, bad)
+            except ValueError:
+                pass
+
+    def repeat_bad_cached():
+        for _ in range(args.bad_repeats):
+            try:
+                cipher.decrypt(bad)
+            except ValueError:
+                pass
+
+    _, results['bad_per_call_ms'] = timed(repeat_bad_per_call)
+    _, results['bad_cached_ms'] = timed(repeat_bad_cached)
+
+    print(f"账号数量: {args.entries}")
+    print(f"{'方式':<10}{'加密(ms)':>12}{'解密(ms)':>12}")
+    for name in ('per_call', 'cached', 'bulk'):
+        print(f"{name:<10}{results[f'encrypt_{name}_ms']:>12.2f}{results[f'decrypt_{name}_ms']:>12.2f}")
+    print(f"重复解密错误密文 {args.bad_repeats} 次: 旧版 {results['bad_per_call_ms']:.2f} ms，"
+          f"失败缓存 {results['bad_cached_ms']:.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+自动登录脚本冷启动基准测试工具
+
+此脚本在全新的Python子进程中反复导入自动登录脚本依赖的核心模块，统计冷启动导入耗时、
+已加载模块数量、进程峰值内存，并检查导入过程中是否加载了PySide6。
+使用 --with-qt 参数时会在导入前先加载 PySide6.QtCore，模拟核心模块依赖Qt时的启动开销，便于对比。
+
+依赖项:
+- 仅使用标准库，Windows下通过 ctypes 调用 psapi 获取峰值内存
+
+使用说明:
+1. 在项目根目录下激活虚拟环境
+2. 运行: python src/tool/bench_import.py --runs 10
+3. 对比: python src/tool/bench_import.py --runs 10 --with-qt
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# 默认测量的模块，即 AutoLoginScript 单次登录和守护模式会导入的模块
+DEFAULT_MODULES = ['src.core.NetworkManager', 'src.core.KeepAliveDaemon']
+
+# 在子进程中执行的测量代码，结果以一行JSON输出到标准输出
+CHILD_CODE = r'''
+import json, os, sys, time
+start = time.perf_counter()
+if {with_qt}:
+    import PySide6.QtCore
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+
+def peak_rss_mb():
+    if os.name == 'nt':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / 1024 / 1024
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以KB为单位
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+print(json.dumps({{
+    'import_time': elapsed,
+    'modules': len(sys.modules),
+    'pyside6_loaded': 'PySide6' in sys.modules,
+    'peak_rss_mb': peak_rss_mb(),
+}}))
+'''
+
+
+def run_child(project_root, modules, with_qt):
+    """
+    在全新的子进程中执行一次导入测量
+
+    参数:
+        project_root (Path): 项目根目录，会加入子进程的 PYTHONPATH
+        modules (list): 要导入的模块名列表
+        with_qt (bool): 是否在导入前先加载 PySide6.QtCore
+
+    返回:
+        tuple: (dict, float) - 子进程输出的测量结果，以及包含解释器启动在内的总耗时(秒)
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(project_root), env.get('PYTHONPATH')]))
+    code = CHILD_CODE.format(with_qt=with_qt, modules=modules)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', code], cwd=str(project_root), env=env,
+                               capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    # 模块导入时可能向标准输出打印日志，结果取最后一行
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result, wall
+
+
+def main():
+    """解析命令行参数，执行多轮测量并输出统计结果"""
+    parser = argparse.ArgumentParser(description="测量自动登录脚本核心模块的冷启动导入开销")
+    parser.add_argument('--runs', type=int, default=10, help="测量轮数，默认10")
+    parser.add_argument('--with-qt', action='store_true', help="导入前先加载 PySide6.QtCore，用于对比")
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES, help="要导入的模块")
+    args = parser.parse_args()
+
+    # 项目根目录（脚本位于 src/tool 目录下）
+    project_root = Path(__file__).parent.resolve().parent.parent
+
+    import_times, wall_times, rss = [], [], []
+    last = None
+    for _ in range(args.runs):
+        last, wall = run_child(project_root, args.modules, args.with_qt)
+        import_times.append(last['import_time'] * 1000)
+        wall_times.append(wall * 1000)
+        rss.append(last['peak_rss_mb'])
+
+    print(f"模块: {', '.join(args.modules)}{'（预先加载 PySide6.QtCore）' if args.with_qt else ''}")
+    print(f"轮数: {args.runs}")
+    print(f"导入耗时 中位数 {statistics.median(import_times):.1f} ms, 最小 {min(import_times):.1f} ms, "
+          f"最大 {max(import_times):.1f} ms")
+    print(f"进程总耗时（含解释器启动） 中位数 {statistics.median(wall_times):.1f} ms")
+    print(f"峰值内存 中位数 {statistics.median(rss):.1f} MB")
+    print(f"已加载模块数: {last['modules']}")
+    print(f"是否加载PySide6: {'是' if last['pyside6_loaded'] else '否'}")
+
+
+if __name__ == "__main__":
+    main()
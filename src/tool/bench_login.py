@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+登录/登出性能基准测试工具
+
+此脚本启动本地模拟认证服务器（mock_portal.py），把 NetworkManager 指向它，然后在多种故障场景下
+反复执行 login 和 dislogin，输出成功率、上线耗时的 p50/p95/p99、每次登录发出的请求数和重试次数，
+用于离线评估登录流程的性能改动。
+
+依赖项:
+- src.core.NetworkManager: 被测的网络管理器（每个场景开始前重置退避与熔断状态）
+- src.tool.mock_portal: 本地模拟认证服务器
+- src.core.Tracing: 登录调用链导出（仅 --trace）
+
+使用说明:
+1. 在项目根目录下激活虚拟环境
+2. 运行全部场景: python src/tool/bench_login.py --runs 20
+3. 只运行指定场景: python src/tool/bench_login.py --scenario baseline loss_5pct
+4. 保存结果便于对比: python src/tool/bench_login.py --json before.json
+5. 导出最近登录的调用链: python src/tool/bench_login.py --scenario loss_5pct --trace trace.json
+   （用 chrome://tracing 或 https://ui.perfetto.dev 打开，可看到每次重试各阶段的耗时）
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# 设置项目根目录路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.logger import logger
+from src.core.ConnectivityState import ConnectivityState
+from src.core.NetworkManager import networkmanager
+from src.tool.mock_portal import MockPortal
+
+# 场景名称 -> (模拟服务器故障参数, 登录前其他设备上在线的账号)
+SCENARIOS = {
+    'baseline': ({}, False),
+    'latency_50ms': ({'latency': 0.05, 'jitter': 0.02}, False),
+    'slow_dial': ({'dial_delay': 0.8}, False),
+    'already_online': ({}, True),
+    'errors_20pct': ({'error_rate': 0.2}, False),
+    'loss_5pct': ({'loss': 0.05}, False),
+    'dial_fail_30pct': ({'dial_fail_rate': 0.3}, False),
+}
+
+USERNAME = 'bench_user'
+PASSWORD = 'bench_pass'
+
+
+def percentile(values, pct):
+    """
+    计算百分位数（线性插值）
+
+    参数:
+        values (list): 样本
+        pct (float): 百分位，0-100
+
+    返回:
+        float: 百分位数，样本为空时返回 0.0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_scenario(portal, name, runs, cold):
+    """
+    在指定场景下反复执行登录和登出
+
+    参数:
+        portal (MockPortal): 模拟认证服务器
+        name (str): 场景名称
+        runs (int): 执行轮数
+        cold (bool): 是否在每轮前清除认证参数缓存
+
+    返回:
+        dict: 场景统计结果
+    """
+    faults, already_online = SCENARIOS[name]
+    base_faults = {'latency': 0.0, 'jitter': 0.0, 'loss': 0.0, 'error_rate': 0.0,
+                   'dial_delay': 0.3, 'dial_fail_rate': 0.0}
+    for key, value in {**base_faults, **faults}.items():
+        setattr(portal, key, value)
+    # 熔断器与连通性状态是单例上的累计状态，每个场景从头开始，避免上一个场景的熔断影响本场景的结果
+    networkmanager.reset_backoff()
+    networkmanager.connectivity.update(ConnectivityState.UNKNOWN, "基准测试场景开始")
+
+    login_times, login_requests, retries, logout_times, logout_requests = [], [], [], [], []
+    successes = 0
+    for _ in range(runs):
+        portal.reset(elsewhere=[USERNAME] if already_online else ())
+        if cold:
+            networkmanager.invalidate_auth_cache("基准测试")
+
+        before = portal.request_counts()['total']
+        start = time.perf_counter()
+        success = networkmanager.login(USERNAME, PASSWORD)
+        elapsed = time.perf_counter() - start
+        login_requests.append(portal.request_counts()['total'] - before)
+        retries.append(max(networkmanager.last_login_timings.get('attempts', 1) - 1, 0))
+        if not success:
+            continue
+        successes += 1
+        login_times.append(elapsed)
+
+        before = portal.request_counts()['total']
+        start = time.perf_counter()
+        if networkmanager.dislogin(USERNAME):
+            logout_times.append(time.perf_counter() - start)
+            logout_requests.append(portal.request_counts()['total'] - before)
+
+    return {
+        'scenario': name,
+        'runs': runs,
+        'success_rate': successes / runs if runs else 0.0,
+        'login_p50': percentile(login_times, 50),
+        'login_p95': percentile(login_times, 95),
+        'login_p99': percentile(login_times, 99),
+        'requests_per_login': statistics.mean(login_requests) if login_requests else 0.0,
+        'retries_per_login': statistics.mean(retries) if retries else 0.0,
+        'logout_p50': percentile(logout_times, 50),
+        'requests_per_logout': statistics.mean(logout_requests) if logout_requests else 0.0,
+        'breaker_state': networkmanager.backoff.breaker.state,
+        'breaker_opened': networkmanager.backoff.breaker.opened_count,
+    }
+
+
+def print_report(results):
+    """以表格形式输出统计结果"""
+    header = (f"{'场景':<16}{'成功率':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+              f"{'请求/登录':>10}{'重试/登录':>10}{'登出p50(ms)':>13}{'请求/登出':>10}{'熔断器(熔断次数)':>20}")
+    print(header)
+    for r in results:
+        print(f"{r['scenario']:<16}{r['success_rate']:>9.0%}{r['login_p50'] * 1000:>10.1f}"
+              f"{r['login_p95'] * 1000:>10.1f}{r['login_p99'] * 1000:>10.1f}{r['requests_per_login']:>12.1f}"
+              f"{r['retries_per_login']:>12.2f}{r['logout_p50'] * 1000:>14.1f}{r['requests_per_logout']:>12.1f}"
+              f"{r['breaker_state'] + '(' + str(r['breaker_opened']) + ')':>20}")
+
+
+def main():
+    """解析命令行参数，启动模拟认证服务器并执行各场景"""
+    parser = argparse.ArgumentParser(description="在本地模拟认证服务器上测量登录/登出性能")
+    parser.add_argument('--runs', type=int, default=20, help="每个场景的执行轮数，默认20")
+    parser.add_argument('--scenario', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="要运行的场景，默认全部")
+    parser.add_argument('--cold', action='store_true', help="每轮前清除认证参数缓存，测量首次登录")
+    parser.add_argument('--max-retry', type=int, default=4, help="NetworkManager.MAX_RETRY，默认4")
+    parser.add_argument('--retry-interval', type=float, default=1.5, help="NetworkManager.RETRY_INTERVAL，默认1.5")
+    parser.add_argument('--seed', type=int, default=0, help="故障注入的随机数种子")
+    parser.add_argument('--json', help="把结果保存为JSON文件")
+    parser.add_argument('--trace', help="把最近的登录调用链保存为 Chrome 追踪格式文件")
+    parser.add_argument('--verbose', action='store_true', help="输出 NetworkManager 的日志")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.disable("src")
+
+    # 丢包的请求挂起时间略大于客户端超时，模拟真实的请求超时
+    portal = MockPortal(seed=args.seed, stall=args.retry_interval + 0.5)
+    portal.start()
+    original = {key: getattr(networkmanager, key) for key in networkmanager.CONFIG_DEFAULTS}
+    networkmanager.apply_config({**portal.network_config(), 'MAX_RETRY': args.max_retry,
+                                 'RETRY_INTERVAL': args.retry_interval})
+    # TCP直连探测访问的是公网地址，与模拟服务器无关
+    networkmanager.probe_engine.unregister("tcp_connect")
+
+    try:
+        results = [run_scenario(portal, name, args.runs, args.cold) for name in args.scenario]
+    finally:
+        networkmanager.apply_config(original)
+        portal.stop()
+
+    print_report(results)
+    if args.trace:
+        from src.core.Tracing import tracer
+        print(f"已导出 {tracer.export(args.trace)} 条登录调用链到 {args.trace}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -89,8 +89,10 @@ def invoke_packaging():
         '--exclude-module=tkinter',        # 排除未使用的模块
         '--exclude-module=PIL',
         '--exclude-module=numpy',
+        '--exclude-module=PySide6',        # 核心模块不依赖Qt，自动登录程序无需打包Qt
         # 添加隐藏的导入以确保所有依赖都被包含在可执行文件中
         '--hidden-import=src.core.NetworkManager',
+        '--hidden-import=src.core.KeepAliveDaemon',
         '--hidden-import=src.utils.logger',
         '--hidden-import=requests',
         '--hidden-import=Crypto',
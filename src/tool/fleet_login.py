@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量登录命令行工具
+
+按名册对机房内的多台主机/多个账号执行批量登录，限制并发数与每秒登录数并加入随机抖动，
+避免断电恢复或认证服务器重启后所有机器同时登录压垮认证服务器。
+也可以使用 --mock 在本地模拟认证服务器上生成虚拟名册，对比不同调度参数的吞吐量与尾延迟。
+
+依赖项:
+- src.core.FleetOrchestrator: 批量登录调度
+- src.tool.mock_portal: 本地模拟认证服务器（仅 --mock 模式）
+
+使用说明:
+1. 按名册登录: python src/tool/fleet_login.py --roster roster.csv --concurrency 16 --rate 5 --jitter 2
+2. 模拟对比: python src/tool/fleet_login.py --mock 200 --capacity 32 --concurrency 200 --rate 0 --jitter 0
+            python src/tool/fleet_login.py --mock 200 --capacity 32 --concurrency 16 --rate 20 --jitter 2
+"""
+import argparse
+import json
+import os
+import sys
+
+# 设置项目根目录路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.logger import logger
+from src.core.NetworkManager import networkmanager
+from src.core.FleetOrchestrator import FleetOrchestrator, FleetMember, load_roster
+
+
+def main():
+    """解析命令行参数并执行批量登录"""
+    parser = argparse.ArgumentParser(description="批量登录校园网账号")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--roster', help="名册文件（CSV 或 JSON，字段 username,password,ip,mac[,name]）")
+    source.add_argument('--mock', type=int, metavar='N', help="在本地模拟认证服务器上模拟 N 台主机")
+    parser.add_argument('--concurrency', type=int, default=8, help="同时进行的登录数上限，默认8")
+    parser.add_argument('--rate', type=float, default=5.0, help="每秒最多发起的登录数，0为不限速，默认5")
+    parser.add_argument('--burst', type=float, default=None, help="允许的突发登录数，默认等于rate")
+    parser.add_argument('--jitter', type=float, default=1.0, help="每台主机开始前的随机延迟上限(秒)，默认1")
+    parser.add_argument('--max-retry', type=int, default=None, help="每台主机的最大尝试次数，默认为配置的MAX_RETRY")
+    parser.add_argument('--capacity', type=int, default=32, help="--mock 模式下模拟服务器的并发处理能力，默认32")
+    parser.add_argument('--latency', type=float, default=0.05, help="--mock 模式下模拟服务器的请求延迟(秒)")
+    parser.add_argument('--json', help="把汇总结果保存为JSON文件")
+    parser.add_argument('--verbose', action='store_true', help="输出每台主机的日志")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.disable("src")
+
+    portal = None
+    original = None
+    if args.mock:
+        from src.tool.mock_portal import MockPortal
+        portal = MockPortal(capacity=args.capacity, latency=args.latency, dial_delay=0.3, seed=0)
+        portal.start()
+        original = {key: getattr(networkmanager, key) for key in networkmanager.CONFIG_DEFAULTS}
+        networkmanager.apply_config(portal.network_config())
+        roster = [FleetMember(f"user{index:04d}", "pass", f"10.20.{index // 250}.{index % 250 + 1}",
+                             f"02:00:00:00:{index // 256:02x}:{index % 256:02x}") for index in range(args.mock)]
+    else:
+        roster = load_roster(args.roster)
+
+    try:
+        orchestrator = FleetOrchestrator(concurrency=args.concurrency, rate=args.rate, burst=args.burst,
+                                         jitter=args.jitter, max_retry=args.max_retry)
+        summary = orchestrator.run(roster).summary()
+    finally:
+        if portal is not None:
+            networkmanager.apply_config(original)
+            portal.stop()
+
+    print(f"成员数: {summary['members']}，成功: {summary['succeeded']}（{summary['success_rate']:.0%}）")
+    print(f"总耗时: {summary['duration']:.2f} 秒，吞吐量: {summary['throughput']:.2f} 次/秒，"
+          f"总尝试次数: {summary['attempts']}")
+    print(f"登录耗时 p50 {summary['p50']:.2f} 秒，p95 {summary['p95']:.2f} 秒，p99 {summary['p99']:.2f} 秒")
+    if portal is not None:
+        summary['portal_requests'] = portal.request_counts()['total']
+        summary['portal_rejected'] = portal.rejected
+        summary['portal_peak_inflight'] = portal.peak_inflight
+        print(f"模拟服务器: 共收到 {summary['portal_requests']} 个请求，其中 {portal.rejected} 个因过载被拒绝，"
+              f"峰值并发 {portal.peak_inflight}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
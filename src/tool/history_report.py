@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+连通性历史统计命令行工具
+
+读取保活守护进程或主程序记录的历史数据库，输出在线率、平均恢复时间（MTTR）、
+断网时长分布、登录成功率与耗时，以及检测次数与平均检测耗时。
+
+依赖项:
+- src.core.HistoryStore: 连通性历史记录
+
+使用说明:
+1. 最近7天统计: python src/tool/history_report.py --days 7
+2. 指定数据库并输出JSON: python src/tool/history_report.py --db C:\\ScheduledTasks\\status\\history.db --json report.json
+3. 清理90天前的记录: python src/tool/history_report.py --prune 90
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# 设置项目根目录路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.HistoryStore import HistoryStore
+
+
+def format_seconds(seconds):
+    """把秒数格式化为便于阅读的文本，如 "1小时5分"、"42.0秒" """
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}秒"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}小时{minutes}分" if hours else f"{minutes}分{seconds}秒"
+
+
+def main():
+    """解析命令行参数并输出统计报告"""
+    parser = argparse.ArgumentParser(description="校园网连通性历史统计")
+    parser.add_argument('--db', default=None, help="历史数据库路径，默认为 任务文件夹/status/history.db")
+    parser.add_argument('--days', type=float, default=7, help="统计最近多少天，默认7")
+    parser.add_argument('--prune', type=float, default=None, metavar='DAYS', help="删除指定天数之前的记录后退出")
+    parser.add_argument('--json', help="把统计结果保存为JSON文件")
+    args = parser.parse_args()
+
+    path = args.db or HistoryStore.default_path()
+    if not os.path.exists(path):
+        print(f"历史数据库不存在: {path}")
+        sys.exit(1)
+    history = HistoryStore(path)
+    try:
+        if args.prune is not None:
+            print(f"已删除 {history.prune(args.prune)} 条 {args.prune:g} 天前的记录")
+            return
+        summary = history.summary(days=args.days)
+        outages = history.outages(days=args.days)
+    finally:
+        history.close()
+
+    uptime = summary['uptime']
+    print(f"统计范围: 最近 {args.days:g} 天（{path}）")
+    print(f"在线率: {'-' if uptime is None else f'{uptime:.3%}'}，断网 {summary['outages']} 次，"
+          f"平均恢复时间: {format_seconds(summary['mttr'])}")
+    longest = max(outages, key=lambda outage: outage['duration'], default=None)
+    if longest is not None:
+        print(f"最长断网: {format_seconds(longest['duration'])}，"
+              f"开始于 {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(longest['start']))}")
+    print("断网时长分布: " + "，".join(f"{label} {count}次" for label, count in summary['outage_histogram']))
+    logins = summary['logins']
+    if logins['logins']:
+        print(f"登录 {logins['logins']} 次，成功率 {logins['success_rate']:.0%}，"
+              f"平均耗时 {format_seconds(logins['mean_total'])}，最长 {format_seconds(logins['max_total'])}")
+    for state, stats in summary['probes'].items():
+        print(f"检测[{state}]: {stats['checks']} 次，平均耗时 {stats['mean_latency'] * 1000:.0f} 毫秒")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+本地模拟校园网认证服务器
+
+此脚本在本机启动一个模拟 auth.gxstnu.edu.cn 行为的HTTP服务器，用于在没有校园网环境时
+调试和评估 NetworkManager 的登录、登出与网络检测性能。
+模拟的接口包括：
+- BASE_URL：重定向到认证页，URL 中带 wlanuserip 和 mac 参数
+- /webauth.do：提交登录，经过 dial_delay 秒后"拨号"成功
+- /webdisconn.do：登出
+- /getAuthResult.do：已拨号返回"运营商网络拨号成功"，账号在其他设备在线时返回 errorMsg=
+- /generate_204、/test：连通性探测接口，在线时分别返回 204 和 200，离线时重定向到认证页
+
+可注入的故障：固定延迟与随机抖动、丢包（请求挂起后断开连接，客户端表现为超时）、
+按比例返回 502、拨号失败，以及并发请求超过处理能力时返回 503（模拟批量登录时认证服务器过载）。
+每个账号的拨号状态独立记录，可同时模拟多台机器/多个账号登录。
+
+依赖项:
+- 仅使用标准库
+
+使用说明:
+1. 启动服务器: python src/tool/mock_portal.py --port 8080 --latency 0.05 --loss 0.05
+2. 在配置文件中设置 AUTH_SCHEME='http'、AUTH_DOMAIN='127.0.0.1:8080'、BASE_URL='http://127.0.0.1:8080/'，
+   TEST_URL 与 PROBE_204_URLS 分别指向 /test 和 /generate_204
+3. 或在代码中使用:
+```python
+from src.tool.mock_portal import MockPortal
+from src.core.NetworkManager import networkmanager
+
+portal = MockPortal(latency=0.02)
+portal.start()
+networkmanager.apply_config(portal.network_config())
+networkmanager.login("user", "pass")
+print(portal.request_counts())
+portal.stop()
+```
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class MockPortal:
+    """
+    模拟认证服务器，所有状态与故障参数都可以在运行期间修改。
+
+    属性:
+        client_ip (str): 认证页分配给本机的 wlanuserip
+        client_mac (str): 本机 MAC 地址
+        latency (float): 每个请求的固定延迟(秒)
+        jitter (float): 每个请求额外的随机延迟上限(秒)
+        loss (float): 丢包概率，丢包的请求挂起 stall 秒后断开连接
+        stall (float): 丢包请求挂起的时间(秒)，应大于客户端超时时间
+        error_rate (float): 返回 502 的概率
+        dial_delay (float): 提交登录后到拨号成功的时间(秒)
+        dial_fail_rate (float): 提交登录后拨号失败（永远不会成功）的概率
+        capacity (int): 同时处理的请求数上限，超过时返回 503，0 表示不限制
+        peak_inflight (int): 同时处理的请求数峰值
+        rejected (int): 因超过处理能力返回 503 的请求数
+        online_users (set): 已拨号成功的账号，任一账号在线时连通性探测接口视为在线
+        elsewhere (set): 在其他设备上在线的账号，检查状态时返回 errorMsg=
+    """
+    SUCCESS_TEXT = '运营商网络拨号成功'
+
+    def __init__(self, host='127.0.0.1', port=0, client_ip='10.20.30.40', client_mac='aa:bb:cc:dd:ee:ff',
+                 latency=0.0, jitter=0.0, loss=0.0, stall=10.0, error_rate=0.0, dial_delay=0.0,
+                 dial_fail_rate=0.0, capacity=0, seed=None):
+        """
+        参数:
+            host (str): 监听地址
+            port (int): 监听端口，0 表示由系统分配
+            client_ip (str): 模拟分配给本机的 IP
+            client_mac (str): 模拟的本机 MAC 地址
+            latency, jitter, loss, stall, error_rate, dial_delay, dial_fail_rate, capacity: 故障参数，见类属性说明
+            seed (int, optional): 随机数种子，便于复现故障序列
+        """
+        self.host = host
+        self.port = port
+        self.client_ip = client_ip
+        self.client_mac = client_mac
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.stall = stall
+        self.error_rate = error_rate
+        self.dial_delay = dial_delay
+        self.dial_fail_rate = dial_fail_rate
+        self.capacity = capacity
+        self.random = random.Random(seed)
+        self.online_users = set()
+        self.elsewhere = set()
+        self._dials = {}  # 账号 -> 拨号完成时间
+        self._inflight = 0
+        self.peak_inflight = 0
+        self.rejected = 0
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def auth_domain(self):
+        """认证域名（含端口），对应 NetworkManager.AUTH_DOMAIN"""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def base_url(self):
+        """对应 NetworkManager.BASE_URL"""
+        return f"http://{self.auth_domain}/"
+
+    def network_config(self):
+        """
+        生成让 NetworkManager 指向本服务器的配置。
+
+        返回:
+            dict: 可直接传给 NetworkManager.apply_config 的配置字典
+        """
+        return {
+            'AUTH_SCHEME': 'http',
+            'AUTH_DOMAIN': self.auth_domain,
+            'BASE_URL': self.base_url,
+            'TEST_URL': f"http://{self.auth_domain}/test",
+            'PROBE_204_URLS': [f"http://{self.auth_domain}/generate_204"],
+        }
+
+    def start(self):
+        """
+        在后台线程中启动服务器。
+
+        返回:
+            str: 服务器的基础 URL
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockPortal", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """停止服务器"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset(self, online_users=(), elsewhere=()):
+        """
+        重置账号在线状态。
+
+        参数:
+            online_users (iterable): 已拨号成功的账号
+            elsewhere (iterable): 在其他设备上在线的账号
+        """
+        with self._lock:
+            self.online_users = set(online_users)
+            self.elsewhere = set(elsewhere)
+            self._dials.clear()
+            self.peak_inflight = 0
+            self.rejected = 0
+
+    def request_counts(self):
+        """
+        返回各接口收到的请求数。
+
+        返回:
+            dict: 路径到请求数的映射，另含 'total' 键
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        counts['total'] = sum(counts.values())
+        return counts
+
+    def _count(self, path):
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def _complete_dials(self):
+        """把已到达 dial_delay 的拨号标记为在线（需持有锁）"""
+        now = time.monotonic()
+        for user, ready_at in list(self._dials.items()):
+            if now >= ready_at:
+                self.online_users.add(user)
+                del self._dials[user]
+
+    def _enter(self):
+        """登记一个正在处理的请求，超过处理能力时返回 False"""
+        with self._lock:
+            if self.capacity and self._inflight >= self.capacity:
+                self.rejected += 1
+                return False
+            self._inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self._inflight)
+            return True
+
+    def _leave(self):
+        with self._lock:
+            self._inflight -= 1
+
+    def _portal_location(self):
+        return (f"http://{self.auth_domain}/portal.do?wlanuserip={self.client_ip}"
+                f"&wlanacip=172.16.1.82&mac={self.client_mac}")
+
+    def _make_handler(self):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                # 基准测试时不输出访问日志
+                pass
+
+            def do_GET(self):
+                self._dispatch(send_body=True)
+
+            def do_POST(self):
+                self._dispatch(send_body=True)
+
+            def do_HEAD(self):
+                self._dispatch(send_body=False)
+
+            def _reply(self, status, body='', location=None, send_body=True):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                if location:
+                    self.send_header('Location', location)
+                self.end_headers()
+                if send_body and payload:
+                    self.wfile.write(payload)
+
+            def _dispatch(self, send_body):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode('utf-8')) if length else {}
+                user = form.get('userId', [''])[0]
+                path = urlparse(self.path).path
+                portal._count(path)
+
+                if not portal._enter():
+                    self._reply(503, 'Service Unavailable', send_body=send_body)
+                    return
+                try:
+                    self._handle(path, user, send_body)
+                finally:
+                    portal._leave()
+
+            def _handle(self, path, user, send_body):
+                # 故障注入
+                delay = portal.latency + (portal.random.uniform(0, portal.jitter) if portal.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+                if portal.loss and portal.random.random() < portal.loss:
+                    time.sleep(portal.stall)
+                    self.close_connection = True
+                    return
+                if portal.error_rate and portal.random.random() < portal.error_rate:
+                    self._reply(502, 'Bad Gateway', send_body=send_body)
+                    return
+
+                with portal._lock:
+                    portal._complete_dials()
+                    online = bool(portal.online_users)
+                    if path == '/webauth.do':
+                        portal.elsewhere.discard(user)
+                        if portal.random.random() >= portal.dial_fail_rate:
+                            portal._dials[user] = time.monotonic() + portal.dial_delay
+                        body, status, location = '<html>认证中</html>', 200, None
+                    elif path == '/webdisconn.do':
+                        portal.online_users.discard(user)
+                        portal.elsewhere.discard(user)
+                        body, status, location = '<html>已下线</html>', 200, None
+                    elif path == '/getAuthResult.do':
+                        if user in portal.online_users:
+                            body = f'<script>{portal.SUCCESS_TEXT}</script>'
+                        elif user in portal.elsewhere:
+                            body = '<script>location.href="portal.do?errorMsg=账号已在线"</script>'
+                        else:
+                            body = '<script>等待认证</script>'
+                        status, location = 200, None
+                    elif path == '/generate_204':
+                        body, status = '', 204 if online else 302
+                        location = None if online else portal._portal_location()
+                    elif path == '/test':
+                        body, status = '<html>ok</html>', 200 if online else 302
+                        location = None if online else portal._portal_location()
+                    elif path == '/portal.do':
+                        body, status, location = '<html>校园网认证</html>', 200, None
+                    else:
+                        # BASE_URL：无论是否在线都重定向到认证页
+                        body, status, location = '', 302, portal._portal_location()
+                self._reply(status, body, location, send_body)
+
+        return Handler
+
+
+def main():
+    """解析命令行参数并前台运行模拟认证服务器"""
+    parser = argparse.ArgumentParser(description="本地模拟校园网认证服务器")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址")
+    parser.add_argument('--port', type=int, default=8080, help="监听端口")
+    parser.add_argument('--latency', type=float, default=0.0, help="每个请求的固定延迟(秒)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="每个请求的随机延迟上限(秒)")
+    parser.add_argument('--loss', type=float, default=0.0, help="丢包概率")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="返回502的概率")
+    parser.add_argument('--dial-delay', type=float, default=0.3, help="提交登录到拨号成功的时间(秒)")
+    parser.add_argument('--dial-fail-rate', type=float, default=0.0, help="拨号失败的概率")
+    parser.add_argument('--capacity', type=int, default=0, help="同时处理的请求数上限，超过返回503，0为不限制")
+    args = parser.parse_args()
+
+    portal = MockPortal(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, loss=args.loss,
+                        error_rate=args.error_rate, dial_delay=args.dial_delay, dial_fail_rate=args.dial_fail_rate,
+                        capacity=args.capacity)
+    print(f"模拟认证服务器已启动: {portal.start()}（Ctrl+C 退出）")
+    for key, value in portal.network_config().items():
+        print(f"    '{key}': {value!r},")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        portal.stop()
+
+
+if __name__ == "__main__":
+    main()
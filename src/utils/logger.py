@@ -4,10 +4,12 @@
 日志管理模块
 提供日志配置、输出和界面显示功能
 使用loguru库实现灵活的日志管理系统
+
+注意：本模块会被无界面的自动登录脚本导入，PySide6 只在真正创建界面日志接收器时才导入，
+避免命令行程序启动时加载整个Qt库
 """
 import sys
 import os
-from PySide6.QtCore import QMetaObject, Qt, Q_ARG
 from loguru import logger
 from src.core.Credentials import credentials
 from src.core.TaskScheduler import TaskScheduler
@@ -60,6 +62,11 @@ class QTextBrowserSink:
         Args:
             text_browser (QTextBrowser): Qt的文本浏览器控件，用于显示日志
         """
+        # 延迟导入Qt，只有界面程序会走到这里
+        from PySide6.QtCore import QMetaObject, Qt, Q_ARG
+        self._invoke_method = QMetaObject.invokeMethod
+        self._queued_connection = Qt.QueuedConnection
+        self._q_arg = Q_ARG
         self.text_browser = text_browser
         self.text_browser.setAcceptRichText(True)  # 确保文本浏览器支持HTML
     
@@ -95,11 +102,11 @@ class QTextBrowserSink:
                 html_message = message
             
             # 确保在主线程更新UI
-            QMetaObject.invokeMethod(
+            self._invoke_method(
                 self.text_browser,
                 "append",
-                Qt.QueuedConnection,
-                Q_ARG(str, html_message)
+                self._queued_connection,
+                self._q_arg(str, html_message)
             )
         except Exception:
             # 如果界面更新失败，静默忽略
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+连通性历史记录的断网统计测试
+
+运行: python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.utils.logger  # noqa: F401  日志模块会导入凭证管理器，需先于 Credentials 导入以避免循环导入
+from src.core.ConnectivityState import ConnectivityState, StateTransition
+from src.core.HistoryStore import HistoryStore
+
+ONLINE = ConnectivityState.ONLINE
+CAPTIVE = ConnectivityState.CAPTIVE
+LOGGING_IN = ConnectivityState.LOGGING_IN
+UNKNOWN = ConnectivityState.UNKNOWN
+
+
+def make_store(states):
+    """按 [(时间戳, 状态), ...] 依次记录状态迁移"""
+    store = HistoryStore(':memory:')
+    previous, since = UNKNOWN, 0.0
+    for timestamp, state in states:
+        store.record_transition(StateTransition(previous, state, timestamp, timestamp - since, ""))
+        previous, since = state, timestamp
+    return store
+
+
+def test_relogin_without_going_offline_is_not_an_outage():
+    store = make_store([(100.0, ONLINE), (200.0, LOGGING_IN), (203.0, ONLINE)])
+    assert store.outages(start=0.0, end=300.0) == []
+    assert store.mttr(start=0.0, end=300.0) is None
+
+
+def test_outage_spans_offline_and_following_relogin():
+    store = make_store([(100.0, ONLINE), (200.0, CAPTIVE), (210.0, LOGGING_IN), (215.0, ONLINE)])
+    outages = store.outages(start=0.0, end=300.0)
+    assert len(outages) == 1
+    assert outages[0]['start'] == 200.0
+    assert outages[0]['duration'] == 15.0
+    assert outages[0]['resolved']
+    assert outages[0]['states'] == [CAPTIVE.value, LOGGING_IN.value]
+    assert store.mttr(start=0.0, end=300.0) == 15.0
+
+
+def test_failed_relogin_starts_outage_when_offline():
+    store = make_store([(100.0, ONLINE), (200.0, LOGGING_IN), (204.0, CAPTIVE), (230.0, ONLINE)])
+    outages = store.outages(start=0.0, end=300.0)
+    assert [(outage['start'], outage['duration']) for outage in outages] == [(204.0, 26.0)]